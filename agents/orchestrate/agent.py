@@ -6,7 +6,6 @@ from google.genai import types
 from google.adk.agents import BaseAgent
 from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset, SseServerParams
 import logging 
-import nest_asyncio # Import nest_asyncio
 import atexit
 
 
@@ -1,12 +1,15 @@
 import sys
 import asyncio
 import functools
-import json
 import uuid
+import weakref
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional, Callable
 
-
+import httpx
+import orjson
+from httpx_sse import aconnect_sse
 from google.genai import types
 import base64
 
@@ -19,9 +22,14 @@ from remote.remote_agent_connection import (
     RemoteAgentConnections,
     TaskUpdateCallback
 )
-from common.client import A2ACardResolver
+from common.client import A2ACardResolver, A2AClient
 from common.types import (
+    A2AClientHTTPError,
+    A2AClientJSONError,
     AgentCard,
+    JSONRPCRequest,
+    SendTaskStreamingRequest,
+    SendTaskStreamingResponse,
     Message,
     TaskState,
     Task,
@@ -33,60 +41,20 @@ from common.types import (
 )
 
 
-class HostAgent:
-  """The orchestrate agent.
-
-  This is the agent responsible for choosing which remote agents to send
-  tasks to and coordinate their work.
-  """
-
-  def __init__(
-      self,
-      remote_agent_addresses: List[str],
-      task_callback: TaskUpdateCallback | None = None
-  ):
-    self.task_callback = task_callback
-    self.remote_agent_connections: dict[str, RemoteAgentConnections] = {}
-    self.cards: dict[str, AgentCard] = {}
-    for address in remote_agent_addresses:
-      card_resolver = A2ACardResolver(address)
-      card = card_resolver.get_agent_card()
-      remote_connection = RemoteAgentConnections(card)
-      self.remote_agent_connections[card.name] = remote_connection
-      self.cards[card.name] = card
-    agent_info = []
-    for ra in self.list_remote_agents():
-      agent_info.append(json.dumps(ra))
-    self.agents = '\n'.join(agent_info)
-
-  def register_agent_card(self, card: AgentCard):
-    remote_connection = RemoteAgentConnections(card)
-    self.remote_agent_connections[card.name] = remote_connection
-    self.cards[card.name] = card
-    agent_info = []
-    for ra in self.list_remote_agents():
-      agent_info.append(json.dumps(ra))
-    self.agents = '\n'.join(agent_info)
+# Task states after which the remote agent will not continue the session.
+_TERMINAL_STATES = frozenset((
+    TaskState.COMPLETED,
+    TaskState.CANCELED,
+    TaskState.FAILED,
+    TaskState.UNKNOWN,
+))
 
-  def create_agent(self) -> Agent:
-    return Agent(
-        model="gemini-2.0-flash",
-        name="orchestrate_agent",
-        instruction=self.root_instruction,
-        before_model_callback=self.before_model_callback,
-        description=(
-            "This agent orchestrates the decomposition of the user request into"
-            " tasks that can be performed by the child agents."
-        ),
-        tools=[
-            self.list_remote_agents,
-            self.send_task,
-        ],
-    )
+# Output modes the orchestrator accepts from every remote agent.
+_ACCEPTED_OUTPUT_MODES = ("text", "text/plain", "image/png")
 
-  def root_instruction(self, context: ReadonlyContext) -> str:
-    current_agent = self.check_state(context)
-    return f"""
+# Static parts of the orchestrator instruction, split around the remote agent
+# list and the active agent so each turn only concatenates three strings.
+_ROOT_INSTRUCTION_HEAD = """
 
     You are an expert AI Orchestrator. Your primary responsibility is to intelligently interpret user requests, plan the necessary sequence of actions if multiple steps are involved, and delegate them to the most appropriate specialized remote agents. You do not perform the tasks yourself but manage their assignment, sequence, and can monitor their status.
 
@@ -116,6 +84,7 @@ class HostAgent:
             *   Once the prerequisite task is done, gather any necessary output from it.
             *   Then, use `create_task` for the next agent in the sequence, providing it with the user's original relevant intent and any necessary data obtained from the previous agent's task.
         *   **For Ongoing Interactions with an Active Agent (within a single step):** If the user is providing follow-up information related to a task *currently assigned* to a specific agent, use the `update_task` tool.
+        *   **For Independent Sub-Tasks:** If two or more tasks do not depend on each other's output, use `send_tasks` with a list of `{"agent_name": ..., "message": ...}` objects to dispatch them concurrently instead of one `send_task` call at a time.
         *   **Monitoring:** Use `check_pending_task_states` to check the status of any delegated tasks, especially when managing sequences or if the user asks for an update.
 
     **Communication with User:**
@@ -131,11 +100,213 @@ class HostAgent:
     *   Ensure all information required by the chosen remote agent is included in the `create_task` or `update_task` call, including outputs from previous agents if it's a sequential task.
     *   Focus on the most recent parts of the conversation for immediate context, but maintain awareness of the overall goal, especially for multi-step requests.
 
-    Agents:
-    {self.agents}
+    Agents (JSON array of name/description objects):
+    """
+_ROOT_INSTRUCTION_MID = """
+
+    Current agent: """
+_ROOT_INSTRUCTION_TAIL = """
+    """
+
+
+def _resolve_card(address: str) -> Optional[AgentCard]:
+  """Fetches the agent card at address, or returns None if it is unreachable."""
+  try:
+    return A2ACardResolver(address).get_agent_card()
+  except Exception as e:
+    print(f"Error resolving agent card at {address}: {e}", file=sys.stderr)
+    return None
+
+
+def _dumps(obj) -> str:
+  """Serializes obj with orjson, decoded once so prompts stay plain str."""
+  return orjson.dumps(obj).decode()
+
+
+# Keeps pending close tasks referenced until they finish.
+_closing_clients: set[asyncio.Task] = set()
+
+
+def _close_dead_client(client: httpx.AsyncClient,
+                       loop: asyncio.AbstractEventLoop):
+  """Closes, on loop, a pool whose own event loop has already been closed."""
+
+  async def _aclose():
+    try:
+      await client.aclose()
+    except Exception as e:
+      print(f"Warning: could not close stale HTTP pool: {e}", file=sys.stderr)
+
+  task = loop.create_task(_aclose())
+  _closing_clients.add(task)
+  task.add_done_callback(_closing_clients.discard)
+
+
+class _PooledA2AClient(A2AClient):
+  """A2AClient that sends every request through a shared httpx.AsyncClient.
+
+  The stock client opens a new connection (and TLS handshake) per call; this
+  one reuses the keep-alive pool owned by the HostAgent.
+  """
+
+  def __init__(self, agent_card: AgentCard,
+               http_client: Callable[[], httpx.AsyncClient]):
+    super().__init__(agent_card)
+    self._http_client = http_client
+
+  async def send_task_streaming(self, payload: dict):
+    request = SendTaskStreamingRequest(params=payload)
+    try:
+      async with aconnect_sse(
+          self._http_client(), "POST", self.url, json=request.model_dump(),
+          timeout=None) as event_source:
+        async for sse in event_source.aiter_sse():
+          yield SendTaskStreamingResponse(**orjson.loads(sse.data))
+    except orjson.JSONDecodeError as e:
+      raise A2AClientJSONError(str(e)) from e
+    except httpx.RequestError as e:
+      raise A2AClientHTTPError(400, str(e)) from e
+
+  async def _send_request(self, request: JSONRPCRequest) -> dict:
+    try:
+      # Image generation could take time, adding timeout
+      response = await self._http_client().post(
+          self.url, json=request.model_dump(), timeout=30)
+      response.raise_for_status()
+      return orjson.loads(response.content)
+    except httpx.HTTPStatusError as e:
+      raise A2AClientHTTPError(e.response.status_code, str(e)) from e
+    except orjson.JSONDecodeError as e:
+      raise A2AClientJSONError(str(e)) from e
+
+
+class HostAgent:
+  """The orchestrate agent.
+
+  This is the agent responsible for choosing which remote agents to send
+  tasks to and coordinate their work.
+  """
+
+  __slots__ = (
+      "task_callback",
+      "remote_agent_connections",
+      "cards",
+      "agents",
+      "_http",
+      "_http_lock",
+      "_remote_agents_cache",
+      "_instruction_prefix",
+  )
+
+  def __init__(
+      self,
+      remote_agent_addresses: List[str],
+      task_callback: TaskUpdateCallback | None = None
+  ):
+    self.task_callback = task_callback
+    self.remote_agent_connections: dict[str, RemoteAgentConnections] = {}
+    self.cards: dict[str, AgentCard] = {}
+    # One pool per event loop; entries go away with their loop.
+    self._http: weakref.WeakKeyDictionary[
+        asyncio.AbstractEventLoop, httpx.AsyncClient] = (
+            weakref.WeakKeyDictionary())
+    self._http_lock = threading.Lock()
+    self._remote_agents_cache: list[dict] | None = None
+    if remote_agent_addresses:
+      # Card lookups are blocking round-trips; overlap them so startup costs
+      # roughly one RTT instead of one per agent.
+      with ThreadPoolExecutor(
+          max_workers=len(remote_agent_addresses)) as executor:
+        cards = list(executor.map(_resolve_card, remote_agent_addresses))
+      for card in cards:
+        if card is not None:
+          self._add_connection(card)
+    self._refresh_agents()
+
+  def register_agent_card(self, card: AgentCard):
+    if card.name in self.cards:
+      # Replacing a card changes an existing entry, so rebuild from scratch.
+      self._add_connection(card)
+      self._refresh_agents()
+      return
+    self._add_connection(card)
+    entry = {"name": card.name, "description": card.description}
+    if self._remote_agents_cache is not None:
+      self._remote_agents_cache.append(entry)
+    encoded = _dumps(entry)
+    if self.agents == "[]":
+      self.agents = f"[{encoded}]"
+    else:
+      self.agents = f"{self.agents[:-1]},{encoded}]"
+    self._instruction_prefix = (
+        _ROOT_INSTRUCTION_HEAD + self.agents + _ROOT_INSTRUCTION_MID)
+
+  def _add_connection(self, card: AgentCard):
+    remote_connection = RemoteAgentConnections(card)
+    remote_connection.agent_client = _PooledA2AClient(card, self._http_client)
+    self.remote_agent_connections[card.name] = remote_connection
+    self.cards[card.name] = card
+
+  def _http_client(self) -> httpx.AsyncClient:
+    """Returns the keep-alive client for the running event loop.
 
-    Current agent: {current_agent['active_agent']}
+    An AsyncClient is bound to the loop it was first used on, and the agent
+    runtime may drive queries from several loops (possibly at once, on
+    different threads), so each loop gets its own pool. Pools whose loop has
+    been closed are closed when the next new pool is opened.
     """
+    loop = asyncio.get_running_loop()
+    client = self._http.get(loop)
+    if client is not None:
+      return client
+    with self._http_lock:
+      client = self._http.get(loop)
+      if client is None:
+        for other_loop, other in list(self._http.items()):
+          if other_loop.is_closed():
+            del self._http[other_loop]
+            _close_dead_client(other, loop)
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_keepalive_connections=32, keepalive_expiry=60.0))
+        self._http[loop] = client
+    return client
+
+  async def aclose(self):
+    """Closes the HTTP connection pool of the running event loop."""
+    with self._http_lock:
+      client = self._http.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+      await client.aclose()
+
+  def _refresh_agents(self):
+    """Rebuilds the agent list and the instruction prefix that embeds it."""
+    self._remote_agents_cache = None
+    self.agents = _dumps(self.list_remote_agents())
+    self._instruction_prefix = (
+        _ROOT_INSTRUCTION_HEAD + self.agents + _ROOT_INSTRUCTION_MID)
+
+  def create_agent(self) -> Agent:
+    return Agent(
+        model="gemini-2.0-flash",
+        name="orchestrate_agent",
+        instruction=self.root_instruction,
+        before_model_callback=self.before_model_callback,
+        description=(
+            "This agent orchestrates the decomposition of the user request into"
+            " tasks that can be performed by the child agents."
+        ),
+        tools=[
+            self.list_remote_agents,
+            self.send_task,
+            self.send_tasks,
+        ],
+    )
+
+  def root_instruction(self, context: ReadonlyContext) -> str:
+    current_agent = self.check_state(context)
+    return (f"{self._instruction_prefix}{current_agent['active_agent']}"
+            f"{_ROOT_INSTRUCTION_TAIL}")
 
   
   def check_state(self, context: ReadonlyContext):
@@ -151,7 +322,7 @@ class HostAgent:
     state = callback_context.state
     if 'session_active' not in state or not state['session_active']:
       if 'session_id' not in state:
-        state['session_id'] = str(uuid.uuid4())
+        state['session_id'] = uuid.uuid4().hex
       state['session_active'] = True
 
   def list_remote_agents(self):
@@ -159,12 +330,12 @@ class HostAgent:
     if not self.remote_agent_connections:
       return []
 
-    remote_agent_info = []
-    for card in self.cards.values():
-      remote_agent_info.append(
+    if self._remote_agents_cache is None:
+      self._remote_agents_cache = [
           {"name": card.name, "description": card.description}
-      )
-    return remote_agent_info
+          for card in self.cards.values()
+      ]
+    return self._remote_agents_cache
 
   async def send_task(
       self,
@@ -187,25 +358,110 @@ class HostAgent:
       raise ValueError(f"Agent {agent_name} not found")
     state = tool_context.state
     state['agent'] = agent_name
-    card = self.cards[agent_name]
-    client = self.remote_agent_connections[agent_name]
-    if not client:
-      raise ValueError(f"Client not available for {agent_name}")
     if 'task_id' in state:
       taskId = state['task_id']
     else:
-      taskId = str(uuid.uuid4())
+      taskId = uuid.uuid4().hex
+    task = await self._send(agent_name, message, state, taskId)
+
+    # Check if a valid task with status was returned before accessing attributes
+    if task and task.status:
+      # Assume completion unless a state returns that isn't complete
+      state['session_active'] = task.status.state not in _TERMINAL_STATES
+      if task.status.state == TaskState.INPUT_REQUIRED:
+        # Force user input back
+        tool_context.actions.skip_summarization = True
+        tool_context.actions.escalate = True
+    else:
+      # Decide how to proceed: maybe assume session is inactive or raise a more specific error
+      state['session_active'] = False
+    return self._task_response(agent_name, task, tool_context)
+
+  async def send_tasks(
+      self,
+      tasks: list[dict],
+      tool_context: ToolContext):
+    """Sends several independent tasks to remote agents concurrently.
+
+    Use this instead of repeated send_task calls when no task needs the
+    output of another.
+
+    Args:
+      tasks: A list of objects, each with an "agent_name" and a "message".
+      tool_context: The tool context this method runs in.
+
+    Returns:
+      One entry per task, in the same order: the task's response parts, or
+      an error string if that task failed.
+    """
+    state = tool_context.state
+
+    async def send_one(t):
+      # Entries come from the model, so a malformed one fails only its slot.
+      if (not isinstance(t, dict) or not isinstance(t.get("agent_name"), str)
+          or not isinstance(t.get("message"), str)):
+        raise ValueError(
+            'each task needs a string "agent_name" and "message"')
+      if t["agent_name"] not in self.remote_agent_connections:
+        raise ValueError(f"Agent {t['agent_name']} not found")
+      return await self._send(t["agent_name"], t["message"], state,
+                              uuid.uuid4().hex, uuid.uuid4().hex)
+
+    # Each task gets its own task and message id; the shared session state is
+    # only read while they run and updated once from the combined outcome.
+    outcomes = await asyncio.gather(
+        *(send_one(t) for t in tasks),
+        return_exceptions=True,
+    )
+
+    active = [
+        (t["agent_name"], task) for t, task in zip(tasks, outcomes)
+        if isinstance(task, Task) and task.status
+        and task.status.state not in _TERMINAL_STATES
+    ]
+    state['session_active'] = bool(active)
+    if active:
+      state['agent'] = active[0][0]
+    if any(task.status.state == TaskState.INPUT_REQUIRED for _, task in active):
+      tool_context.actions.skip_summarization = True
+      tool_context.actions.escalate = True
+
+    results = []
+    for t, task in zip(tasks, outcomes):
+      if isinstance(task, Exception):
+        results.append(f"Error: {task}")
+        continue
+      try:
+        results.append(self._task_response(t["agent_name"], task, tool_context))
+      except ValueError as e:
+        results.append(f"Error: {e}")
+    return results
+
+  async def _send(
+      self,
+      agent_name: str,
+      message: str,
+      state,
+      taskId: str,
+      messageId: str = "") -> Task | None:
+    """Sends one task to agent_name and returns the resulting Task.
+
+    Only reads session_id and input_message_metadata from state, so several
+    calls can run at once on the same session.
+    """
+    client = self.remote_agent_connections[agent_name]
+    if not client:
+      raise ValueError(f"Client not available for {agent_name}")
     sessionId = state['session_id']
-    task: Task
-    messageId = ""
     metadata = {}
     if 'input_message_metadata' in state:
-      metadata.update(**state['input_message_metadata'])
-      if 'message_id' in state['input_message_metadata']:
+      metadata.update(state['input_message_metadata'])
+      if not messageId and 'message_id' in state['input_message_metadata']:
         messageId = state['input_message_metadata']['message_id']
     if not messageId:
-      messageId = str(uuid.uuid4())
-    metadata.update(**{'conversation_id': sessionId, 'message_id': messageId})
+      messageId = uuid.uuid4().hex
+    metadata['conversation_id'] = sessionId
+    metadata['message_id'] = messageId
     request: TaskSendParams = TaskSendParams(
         id=taskId,
         sessionId=sessionId,
@@ -214,27 +470,17 @@ class HostAgent:
             parts=[TextPart(text=message)],
             metadata=metadata,
         ),
-        acceptedOutputModes=["text", "text/plain", "image/png"],
+        acceptedOutputModes=_ACCEPTED_OUTPUT_MODES,
         # pushNotification=None,
         metadata={'conversation_id': sessionId},
     )
-    task = await client.send_task(request, self.task_callback)
-
+    return await client.send_task(request, self.task_callback)
 
-    # Check if a valid task with status was returned before accessing attributes
+  def _task_response(self, agent_name: str, task: Task | None,
+                     tool_context: ToolContext):
+    """Converts a finished task into response parts, raising if it failed."""
     if task and task.status:
-      # Assume completion unless a state returns that isn't complete
-      state['session_active'] = task.status.state not in [
-          TaskState.COMPLETED,
-          TaskState.CANCELED,
-          TaskState.FAILED,
-          TaskState.UNKNOWN,
-      ]
-      if task.status.state == TaskState.INPUT_REQUIRED:
-        # Force user input back
-        tool_context.actions.skip_summarization = True
-        tool_context.actions.escalate = True
-      elif task.status.state == TaskState.CANCELED:
+      if task.status.state == TaskState.CANCELED:
         # Open question, should we return some info for cancellation instead
         raise ValueError(f"Agent {agent_name} task {task.id} is cancelled")
       elif task.status.state == TaskState.FAILED:
@@ -243,8 +489,6 @@ class HostAgent:
     else:
       # Handle the case where task or task.status is None (e.g., log a warning or raise an error)
       print(f"Warning: Received invalid task object or status from {agent_name}. Task: {task}", file=sys.stderr)
-      # Decide how to proceed: maybe assume session is inactive or raise a more specific error
-      state['session_active'] = False
       # Depending on requirements, you might want to raise an error here instead of just returning []
 
     response = []
@@ -259,27 +503,46 @@ class HostAgent:
     return response
 
 def convert_parts(parts: list[Part], tool_context: ToolContext):
-  rval = []
-  for p in parts:
-    rval.append(convert_part(p, tool_context))
-  return rval
+  return [
+      _PART_DISPATCH.get(p.type, _conv_unknown)(p, tool_context)
+      for p in parts
+  ]
 
 def convert_part(part: Part, tool_context: ToolContext):
-  if part.type == "text":
-    return part.text
-  elif part.type == "data":
-    return part.data
-  elif part.type == "file":
-    # Repackage A2A FilePart to google.genai Blob
-    # Currently not considering plain text as files    
-    file_id = part.file.name
-    file_bytes = base64.b64decode(part.file.bytes)    
+  return _PART_DISPATCH.get(part.type, _conv_unknown)(part, tool_context)
+
+def _conv_text(part: Part, tool_context: ToolContext):
+  return part.text
+
+def _conv_data(part: Part, tool_context: ToolContext):
+  return part.data
+
+def _conv_file(part: Part, tool_context: ToolContext):
+  # Repackage A2A FilePart to google.genai Blob
+  # Currently not considering plain text as files
+  file_id = part.file.name
+  if part.file.uri:
+    # Referenced files are passed through without fetching or copying them.
+    file_part = types.Part(
+      file_data=types.FileData(
+        mime_type=part.file.mimeType,
+        file_uri=part.file.uri))
+  else:
+    file_bytes = base64.b64decode(part.file.bytes)
     file_part = types.Part(
       inline_data=types.Blob(
         mime_type=part.file.mimeType,
         data=file_bytes))
-    tool_context.save_artifact(file_id, file_part)
-    tool_context.actions.skip_summarization = True
-    tool_context.actions.escalate = True
-    return DataPart(data = {"artifact-file-id": file_id})
-  return f"Unknown type: {p.type}"
+  tool_context.save_artifact(file_id, file_part)
+  tool_context.actions.skip_summarization = True
+  tool_context.actions.escalate = True
+  return DataPart(data = {"artifact-file-id": file_id})
+
+def _conv_unknown(part: Part, tool_context: ToolContext):
+  return f"Unknown type: {part.type}"
+
+_PART_DISPATCH = {
+    "text": _conv_text,
+    "data": _conv_data,
+    "file": _conv_file,
+}
@@ -1,7 +1,7 @@
 import datetime
 from zoneinfo import ZoneInfo
 from google.adk.agents import LoopAgent, LlmAgent, BaseAgent
-from social.instavibe import get_person_posts,get_person_friends,get_person_id_by_name,get_person_attended_events
+from social.instavibe import get_person_posts,get_person_friends,get_person_id_by_name,get_person_ids_by_names,get_person_attended_events,get_person_bundle
 from google.adk.agents.invocation_context import InvocationContext
 from google.adk.events import Event, EventActions
 from typing import AsyncGenerator
@@ -33,7 +33,7 @@ profile_agent = LlmAgent(
     instruction=(
         "You are a helpful agent who can answer user questions about this person's social profile."
     ),
-    tools=[get_person_posts,get_person_friends,get_person_id_by_name,get_person_attended_events],
+    tools=[get_person_bundle,get_person_posts,get_person_friends,get_person_id_by_name,get_person_ids_by_names,get_person_attended_events],
 )
 
 summary_agent = LlmAgent(
@@ -1,62 +1,119 @@
 # spanner_data_fetchers.py
 
 import os
+import logging
 from dotenv import load_dotenv
 import traceback
-from datetime import datetime, timezone
-import json # For example usage printing
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
 
+from cachetools import TTLCache
 from google.cloud import spanner
 from google.cloud.spanner_v1 import param_types
 from google.api_core import exceptions
 
 load_dotenv()
+log = logging.getLogger(__name__)
+# Query tracing is logged at DEBUG; set LOG_LEVEL=DEBUG to see it.
+# Unknown values fall back to INFO rather than failing at import.
+_log_level = logging.getLevelName(os.environ.get("LOG_LEVEL", "INFO").upper())
+log.setLevel(_log_level if isinstance(_log_level, int) else logging.INFO)
+
 # --- Spanner Configuration ---
 INSTANCE_ID = os.environ.get("SPANNER_INSTANCE_ID", "instavibe-graph-instance")
 DATABASE_ID = os.environ.get("SPANNER_DATABASE_ID", "graphdb")
 PROJECT_ID = os.environ.get("GOOGLE_CLOUD_PROJECT")
+# Sessions kept open for concurrent tool calls; each query checks one out.
+SPANNER_POOL_SIZE = int(os.environ.get("SPANNER_POOL_SIZE", "10"))
 
 if not PROJECT_ID:
     print("Warning: GOOGLE_CLOUD_PROJECT environment variable not set.")
 
 # --- Spanner Client Initialization ---
+# The client, session pool and existence check are set up on first use
+# rather than at import, so agent start-up does not wait on Spanner.
 db_instance = None
 spanner_client = None
-try:
-    if PROJECT_ID:
-        spanner_client = spanner.Client(project=PROJECT_ID)
-        instance = spanner_client.instance(INSTANCE_ID)
-        database = instance.database(DATABASE_ID)
-        print(f"Attempting to connect to Spanner: {instance.name}/databases/{database.name}")
-
-        if not database.exists():
-             print(f"Error: Database '{database.name}' does not exist in instance '{instance.name}'.")
-             db_instance = None
-        else:
+_db_initialized = False
+_db_lock = threading.Lock()
+
+
+def _connect():
+    """Creates the Spanner client and returns the database, or None."""
+    global spanner_client
+    try:
+        if PROJECT_ID:
+            spanner_client = spanner.Client(project=PROJECT_ID)
+            instance = spanner_client.instance(INSTANCE_ID)
+            database = instance.database(
+                DATABASE_ID, pool=spanner.FixedSizePool(size=SPANNER_POOL_SIZE)
+            )
+            print(f"Attempting to connect to Spanner: {instance.name}/databases/{database.name}")
+
+            if not database.exists():
+                 print(f"Error: Database '{database.name}' does not exist in instance '{instance.name}'.")
+                 return None
             print("Spanner database connection check successful.")
-            db_instance = database
-    else:
-        print("Skipping Spanner client initialization due to missing GOOGLE_CLOUD_PROJECT.")
+            return database
+        else:
+            print("Skipping Spanner client initialization due to missing GOOGLE_CLOUD_PROJECT.")
+
+    except exceptions.NotFound:
+        print(f"Error: Spanner instance '{INSTANCE_ID}' not found in project '{PROJECT_ID}'.")
+    except Exception as e:
+        print(f"An unexpected error occurred during Spanner initialization: {e}")
+    return None
+
+
+def get_database():
+    """Returns the Spanner database, connecting on the first call."""
+    global db_instance, _db_initialized
+    if not _db_initialized:
+        with _db_lock:
+            if not _db_initialized:
+                db_instance = _connect()
+                _db_initialized = True
+    return db_instance
+
+# --- Lookup Caches ---
+# Names and friend lists are re-requested on nearly every agent turn for the
+# same users. Only successful lookups are cached.
+_CACHE_TTL_SECONDS = int(os.environ.get("SOCIAL_CACHE_TTL", "300"))
+_name_cache = TTLCache(maxsize=1024, ttl=_CACHE_TTL_SECONDS)
+_friends_cache = TTLCache(maxsize=1024, ttl=_CACHE_TTL_SECONDS)
+_cache_lock = threading.RLock()
+
+
+def clear_caches():
+    """Drops all cached name and friend lookups."""
+    with _cache_lock:
+        _name_cache.clear()
+        _friends_cache.clear()
+
+
+def invalidate_friends(person_id: str):
+    """Drops the cached friend list for person_id after a Friendship write."""
+    with _cache_lock:
+        _friends_cache.pop(person_id, None)
+
+
+def _iso_positions(field_names, iso_fields):
+    """Returns the column indexes whose values should be ISO-formatted."""
+    return [i for i, name in enumerate(field_names) if name in iso_fields]
 
-except exceptions.NotFound:
-    print(f"Error: Spanner instance '{INSTANCE_ID}' not found in project '{PROJECT_ID}'.")
-    db_instance = None
-except Exception as e:
-    print(f"An unexpected error occurred during Spanner initialization: {e}")
-    db_instance = None
 
 def run_sql_query(sql, params=None, param_types=None, expected_fields=None):
     """
     Executes a standard SQL query against the Spanner database.
     Returns: list[dict] or None on error.
     """
-    if not db_instance:
+    if not get_database():
         print("Error: Database connection is not available.")
         return None
 
     results_list = []
-    print(f"--- Executing SQL Query ---")
-    # print(f"SQL: {sql}")
+    log.debug("Executing SQL query: %s params=%s", sql, params)
 
     try:
         with db_instance.snapshot() as snapshot:
@@ -88,18 +145,18 @@ def run_sql_query(sql, params=None, param_types=None, expected_fields=None):
     return results_list
 
 
-def run_graph_query( graph_sql, params=None, param_types=None, expected_fields=None):
+def run_graph_query( graph_sql, params=None, param_types=None, expected_fields=None, iso_fields=()):
     """
     Executes a Spanner Graph Query (GQL).
+    Timestamp/date columns named in iso_fields are returned as ISO strings.
     Returns: list[dict] or None on error.
     """
-    if not db_instance:
+    if not get_database():
         print("Error: Database connection is not available.")
         return None
 
     results_list = []
-    print(f"--- Executing Graph Query ---")
-    # print(f"GQL: {graph_sql}") # Uncomment for verbose query logging
+    log.debug("Executing graph query: %s params=%s", graph_sql, params)
 
     try:
         with db_instance.snapshot() as snapshot:
@@ -113,11 +170,15 @@ def run_graph_query( graph_sql, params=None, param_types=None, expected_fields=N
             if not field_names:
                  print("Error: expected_fields must be provided to run_graph_query.")
                  return None
+            iso_positions = _iso_positions(field_names, iso_fields)
 
             for row in results:
                 if len(field_names) != len(row):
                      print(f"Warning: Mismatch between field names ({len(field_names)}) and row values ({len(row)}). Skipping row: {row}")
                      continue
+                for i in iso_positions:
+                    if row[i] is not None:
+                        row[i] = row[i].isoformat()
                 results_list.append(dict(zip(field_names, row)))
 
     except (exceptions.NotFound, exceptions.PermissionDenied, exceptions.InvalidArgument) as spanner_err:
@@ -131,6 +192,35 @@ def run_graph_query( graph_sql, params=None, param_types=None, expected_fields=N
     return results_list
 
 
+def iter_query(sql, params=None, param_types=None, expected_fields=None, iso_fields=()) -> Iterator[dict]:
+    """
+    Executes a SQL or Graph query and yields each row as a dict while the
+    result set streams in. Unlike run_sql_query/run_graph_query, errors are
+    raised rather than reported as None. Columns named in iso_fields are
+    returned as ISO strings.
+    """
+    if not get_database():
+        raise RuntimeError("Database connection is not available.")
+    if not expected_fields:
+        raise ValueError("expected_fields must be provided to iter_query.")
+
+    with db_instance.snapshot() as snapshot:
+        results = snapshot.execute_sql(
+            sql,
+            params=params,
+            param_types=param_types
+        )
+        iso_positions = _iso_positions(expected_fields, iso_fields)
+        for row in results:
+            if len(expected_fields) != len(row):
+                print(f"Warning: Mismatch between field names ({len(expected_fields)}) and row values ({len(row)}). Skipping row: {row}")
+                continue
+            for i in iso_positions:
+                if row[i] is not None:
+                    row[i] = row[i].isoformat()
+            yield dict(zip(expected_fields, row))
+
+
 def get_person_attended_events(person_id: str)-> list[dict]:
     """
     Fetches events attended by a specific person using Graph Query.
@@ -138,7 +228,7 @@ def get_person_attended_events(person_id: str)-> list[dict]:
        person_id (str): The ID of the person whose posts to fetch.
     Returns: list[dict] or None.
     """
-    if not db_instance: return None
+    if not get_database(): return None
 
     graph_sql = """
         Graph SocialGraph
@@ -151,16 +241,8 @@ def get_person_attended_events(person_id: str)-> list[dict]:
     param_types_map = {"person_id": param_types.STRING}
     fields = ["event_id", "name", "event_date", "attendance_time"]
 
-    results = run_graph_query( graph_sql, params=params, param_types=param_types_map, expected_fields=fields)
-
-    if results is None: return None
-
-    for event in results:
-        if isinstance(event.get('event_date'), datetime):
-            event['event_date'] = event['event_date'].isoformat()
-        if isinstance(event.get('attendance_time'), datetime):
-            event['attendance_time'] = event['attendance_time'].isoformat()
-    return results
+    return run_graph_query( graph_sql, params=params, param_types=param_types_map, expected_fields=fields,
+                            iso_fields=("event_date", "attendance_time"))
 
 def get_person_id_by_name( name: str) -> str:
     """
@@ -173,30 +255,96 @@ def get_person_id_by_name( name: str) -> str:
         str or None: The person_id if found, otherwise None.
                      Returns the ID of the *first* match if names are duplicated.
     """
-    if not db_instance: return None
+    if not get_database(): return None
+
+    ids = get_person_ids_by_names([name])
+    return ids.get(name) if ids else None # None if not found or on error
+
+
+def get_person_ids_by_names(names: list[str]) -> dict[str, str]:
+    """
+    Fetches the person_id for several names in a single SQL query.
+
+    Args:
+       names (list[str]): The names of the people to search for.
+
+    Returns:
+        dict[str, str] or None: Maps each name that was found to its person_id
+                                (the *first* match if names are duplicated).
+                                Names that were not found are omitted.
+                                None if the query fails.
+    """
+    if not get_database(): return None
+
+    ids = {}
+    missing = []
+    with _cache_lock:
+        for name in names:
+            cached_id = _name_cache.get(name)
+            if cached_id is not None:
+                ids[name] = cached_id
+            else:
+                missing.append(name)
+    if not missing:
+        return ids
 
     sql = """
-        SELECT person_id
+        SELECT name, person_id
         FROM Person
-        WHERE name = @name
-        LIMIT 1 -- Return only the first match in case of duplicate names
+        WHERE name IN UNNEST(@names)
     """
-    params = {"name": name}
-    param_types_map = {"name": param_types.STRING}
-    fields = ["person_id"]
+    params = {"names": missing}
+    param_types_map = {"names": param_types.Array(param_types.STRING)}
+    fields = ["name", "person_id"]
 
     # Use the standard SQL query helper
     results = run_sql_query( sql, params=params, param_types=param_types_map, expected_fields=fields)
+    if results is None:
+        return None
 
-    if results: # Check if the list is not empty
-        return results[0].get('person_id') # Return the ID from the first dictionary
-    else:
-        return None # Name not found
+    found = {}
+    for row in results:
+        found.setdefault(row["name"], row["person_id"]) # Keep the first match per name
+    with _cache_lock:
+        _name_cache.update(found)
+    ids.update(found)
+    return ids
+
+
+# Posts come straight off the PostByAuthor(author_id, post_timestamp DESC)
+# index, which stores text and sentiment (see instavibe/setup.py). The author's
+# name is the same for every row, so it is looked up once by an uncorrelated
+# subquery instead of joined per post.
+_PERSON_POSTS_SQL = """
+    SELECT post_id, author_id, text, sentiment, post_timestamp,
+           (SELECT name FROM Person WHERE person_id = @person_id) AS author_name
+    FROM Post
+    WHERE author_id = @person_id
+    ORDER BY post_timestamp DESC
+"""
+_PERSON_POSTS_FIELDS = ["post_id", "author_id", "text", "sentiment", "post_timestamp", "author_name"]
+
+
+def iter_person_posts(person_id: str) -> Iterator[dict]:
+    """
+    Streams posts written by a specific person, newest first.
+
+    Rows are converted (ISO date strings) and yielded as Spanner streams
+    them, so a prolific author's posts are never held in memory at once.
+    Spanner errors propagate to the caller.
+
+    Args:
+        person_id (str): The ID of the person whose posts to fetch.
+    """
+    params = {"person_id": person_id}
+    param_types_map = {"person_id": param_types.STRING}
+    yield from iter_query(_PERSON_POSTS_SQL, params=params, param_types=param_types_map, expected_fields=_PERSON_POSTS_FIELDS,
+                          iso_fields=("post_timestamp",))
 
 
 def get_person_posts( person_id: str)-> list[dict]:
     """
-    Fetches posts written by a specific person using Graph Query.
+    Fetches posts written by a specific person using SQL.
 
     Args:
         person_id (str): The ID of the person whose posts to fetch.
@@ -206,58 +354,80 @@ def get_person_posts( person_id: str)-> list[dict]:
         list[dict] or None: List of post dictionaries with ISO date strings,
                            or None if an error occurs.
     """
-    if not db_instance: return None
+    if not get_database(): return None
 
-    # Graph Query: Find the specific Person node, follow 'Wrote' edge to Post nodes
-    graph_sql = """
-        Graph SocialGraph
-        MATCH (author:Person)-[w:Wrote]->(post:Post)
-        WHERE author.person_id = @person_id
-        RETURN post.post_id, post.author_id, post.text, post.sentiment, post.post_timestamp, author.name AS author_name
-        ORDER BY post.post_timestamp DESC
-    """
-    # Parameters now include person_id and limit
-    params = {
-        "person_id": person_id
-    }
-    param_types_map = {
-        "person_id": param_types.STRING
-    }
-    # Fields returned remain the same
-    fields = ["post_id", "author_id", "text", "sentiment", "post_timestamp", "author_name"]
-
-    results = run_graph_query(graph_sql, params=params, param_types=param_types_map, expected_fields=fields)
-
-    if results is None:
+    try:
+        return list(iter_person_posts(person_id))
+    except (exceptions.NotFound, exceptions.PermissionDenied, exceptions.InvalidArgument) as spanner_err:
+        print(f"Spanner SQL Query Error ({type(spanner_err).__name__}): {spanner_err}")
+        return None
+    except Exception as e:
+        print(f"An unexpected error occurred during SQL query execution or processing: {e}")
+        traceback.print_exc()
         return None
-
-    # Convert datetime objects to ISO format strings
-    for post in results:
-        if isinstance(post.get('post_timestamp'), datetime):
-            post['post_timestamp'] = post['post_timestamp'].isoformat()
-
-    return results
 
 
 def get_person_friends( person_id: str)-> list[dict]:
     """
-    Fetches friends for a specific person using Graph Query.
+    Fetches friends for a specific person using SQL.
     Args:
         person_id (str): The ID of the person whose posts to fetch.
     Returns: list[dict] or None.
     """
-    if not db_instance: return None
+    if not get_database(): return None
 
-    graph_sql = """
-        Graph SocialGraph
-        MATCH (p:Person {person_id: @person_id})-[f:Friendship]-(friend:Person)
-        RETURN DISTINCT friend.person_id, friend.name
+    with _cache_lock:
+        cached_friends = _friends_cache.get(person_id)
+    if cached_friends is not None:
+        return cached_friends
+
+    # Each leg is a key-prefix seek (the primary key and FriendshipByPersonB).
+    # IN is a semi-join, so a pair stored in both directions still yields the
+    # friend once without a DISTINCT sort.
+    sql = """
+        SELECT friend.person_id, friend.name
+        FROM Person AS friend
+        WHERE friend.person_id IN (
+            SELECT person_id_b FROM Friendship WHERE person_id_a = @person_id
+            UNION ALL
+            SELECT person_id_a FROM Friendship WHERE person_id_b = @person_id
+        )
         ORDER BY friend.name
     """
     params = {"person_id": person_id}
     param_types_map = {"person_id": param_types.STRING}
     fields = ["person_id", "name"]
 
-    results = run_graph_query( graph_sql, params=params, param_types=param_types_map, expected_fields=fields)
+    results = run_sql_query( sql, params=params, param_types=param_types_map, expected_fields=fields)
+
+    if results is not None:
+        with _cache_lock:
+            _friends_cache[person_id] = results
+    return results
+
+
+def get_person_bundle(person_id: str) -> dict:
+    """
+    Fetches a person's attended events, posts and friends in one call.
+    The three queries run concurrently, so this costs about one round trip
+    instead of three.
 
-    return results
\ No newline at end of file
+    Args:
+        person_id (str): The ID of the person whose profile data to fetch.
+
+    Returns:
+        dict: {"events": ..., "posts": ..., "friends": ...}, where each value
+              is the result of the matching get_person_* function, or None
+              if that lookup failed.
+    """
+    if not get_database(): return None
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        events = executor.submit(get_person_attended_events, person_id)
+        posts = executor.submit(get_person_posts, person_id)
+        friends = executor.submit(get_person_friends, person_id)
+        return {
+            "events": events.result(),
+            "posts": posts.result(),
+            "friends": friends.result(),
+        }
@@ -15,11 +15,11 @@ def get_all_people_for_ally_page():
     try:
         # Import here to avoid circular dependencies at module load time
         # and ensure app.py's db and run_query are initialized.
-        from app import db as main_app_db, run_query as main_app_run_query
+        from app import get_db as main_app_get_db, run_query as main_app_run_query
         # param_types might be needed if run_query is called with params
         # from google.cloud.spanner_v1 import param_types as main_app_param_types
 
-        if not main_app_db:
+        if not main_app_get_db():
             print("Error in ally_routes.get_all_people_for_ally_page: main_app_db is not available from app.py.")
             return [] # Return empty list if db connection failed
 
@@ -33,7 +33,7 @@ def get_all_people_for_ally_page():
         people = main_app_run_query(sql, expected_fields=fields)
         return people
     except ImportError:
-        print("ERROR in ally_routes.get_all_people_for_ally_page: Could not import db or run_query from app.py. Check app.py structure and execution.")
+        print("ERROR in ally_routes.get_all_people_for_ally_page: Could not import get_db or run_query from app.py. Check app.py structure and execution.")
         return [] # Fallback to empty list
     except Exception as e:
         print(f"Error fetching people in ally_routes.get_all_people_for_ally_page: {e}")
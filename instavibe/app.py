@@ -1,21 +1,93 @@
 import os
+import logging
 from datetime import datetime, timezone
 from dotenv import load_dotenv
-from flask import Flask, render_template, abort, flash, request, jsonify
+from flask import Flask, render_template, stream_template, abort, flash, g, get_flashed_messages, request, jsonify, copy_current_request_context
+from flask.json.provider import JSONProvider
+from werkzeug.exceptions import HTTPException
+from flask_caching import Cache
+from flask_compress import Compress
 from google.cloud import spanner
 from google.cloud.spanner_v1 import param_types
 from google.api_core import exceptions
+import fastjsonschema
 import humanize 
+import itertools
+import orjson
 import uuid
-import traceback
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dateutil import parser 
 from ally_routes import ally_bp 
 
 
+class OrjsonProvider(JSONProvider):
+    """
+    Flask JSON provider backed by orjson.
+
+    Used by jsonify() and the Jinja |tojson filter. Datetimes (naive ones are
+    treated as UTC) are written as RFC 3339 strings, so rows fetched from
+    Spanner can be serialized without converting timestamps by hand. Spanner
+    returns TIMESTAMPs as DatetimeWithNanoseconds, a datetime subclass orjson
+    does not serialize itself, so those go through _default.
+    """
+    option = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+
+    @staticmethod
+    def _default(obj):
+        if isinstance(obj, datetime):
+            if obj.tzinfo is None:
+                obj = obj.replace(tzinfo=timezone.utc)
+            return obj.isoformat()
+        # Spanner NUMERIC columns come back as Decimal; JSON has no such type.
+        if hasattr(obj, "as_integer_ratio"):
+            return float(obj)
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self._default, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self._default, option=self.option),
+            mimetype="application/json",
+        )
+
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+# Query tracing is logged at DEBUG; set LOG_LEVEL=DEBUG to see it.
+# Unknown values fall back to INFO rather than failing at import.
+_log_level = logging.getLevelName(os.environ.get("LOG_LEVEL", "INFO").upper())
+app.logger.setLevel(_log_level if isinstance(_log_level, int) else logging.INFO)
 app.secret_key = os.environ.get("FLASK_SECRET_KEY", "a_default_secret_key_for_dev") 
 app.register_blueprint(ally_bp)
 
+# Homepage data changes only when a post or event is added, so it is memoised
+# briefly and dropped explicitly by the write endpoints. SimpleCache is
+# per-process; set CACHE_TYPE (e.g. RedisCache) to share it across workers.
+HOMEPAGE_CACHE_TIMEOUT = int(os.environ.get("HOMEPAGE_CACHE_TIMEOUT", "30"))
+cache = Cache(app, config={
+    "CACHE_TYPE": os.environ.get("CACHE_TYPE", "SimpleCache"),
+    "CACHE_DEFAULT_TIMEOUT": HOMEPAGE_CACHE_TIMEOUT,
+})
+
+# JSON and rendered feeds repeat the same keys/markup row after row, so they
+# compress well. Streamed responses are left alone: Flask-Compress buffers the
+# whole body to compress it, which would undo the homepage's streaming.
+app.config.update(
+    COMPRESS_ALGORITHM=["br", "gzip"],
+    COMPRESS_MIN_SIZE=1024,
+    COMPRESS_LEVEL=4,
+    COMPRESS_BR_LEVEL=4,
+    COMPRESS_STREAMS=False,
+)
+Compress(app)
+
 load_dotenv()
 # --- Spanner Configuration ---
 INSTANCE_ID = "instavibe-graph-instance" # Replace if different
@@ -25,35 +97,59 @@ APP_HOST = os.environ.get("APP_HOST", "0.0.0.0")
 APP_PORT = os.environ.get("APP_PORT","8080")
 GOOGLE_MAPS_API_KEY = os.environ.get("GOOGLE_MAPS_API_KEY")
 GOOGLE_MAPS_MAP_KEY = os.environ.get('GOOGLE_MAPS_MAP_ID')
+# Threads that can hold a Spanner session at once: gunicorn's request threads
+# (WEB_THREADS, set in the Dockerfile) plus the page-query executor below.
+WEB_THREADS = int(os.environ.get("WEB_THREADS", "16"))
+PAGE_QUERY_WORKERS = int(os.environ.get("PAGE_QUERY_WORKERS", "8"))
+# Sessions kept open for concurrent requests; each query checks one out. The
+# default covers every thread above so checkouts never wait on the pool.
+SPANNER_POOL_SIZE = int(os.environ.get("SPANNER_POOL_SIZE", WEB_THREADS + PAGE_QUERY_WORKERS))
 
 
 if not PROJECT_ID:
     raise ValueError("GOOGLE_CLOUD_PROJECT environment variable not set.")
 
 # --- Spanner Client Initialization ---
+# The client, session pool and existence check are created on first use in
+# each process rather than at import, so worker start-up does not wait on
+# Spanner and forked workers (e.g. gunicorn --preload) never share a channel.
 db = None
-try:
-    spanner_client = spanner.Client(project=PROJECT_ID)
-    instance = spanner_client.instance(INSTANCE_ID)
-    database = instance.database(DATABASE_ID)
-    print(f"Attempting to connect to Spanner: {instance.name}/databases/{database.name}")
-
-    # Ensure database exists - crucial check
-    if not database.exists():
-         print(f"Error: Database '{database.name}' does not exist in instance '{instance.name}'.")
-         print("Please create the database and the required tables/schema.")
-         # You might want to exit or handle this more gracefully depending on deployment
-         # For now, we'll let it fail later if db is None
-    else:
+spanner_client = None
+_db_initialized = False
+_db_lock = threading.Lock()
+
+def _connect():
+    """Creates the Spanner client and returns the database, or None."""
+    global spanner_client
+    try:
+        spanner_client = spanner.Client(project=PROJECT_ID)
+        instance = spanner_client.instance(INSTANCE_ID)
+        database = instance.database(DATABASE_ID, pool=spanner.FixedSizePool(size=SPANNER_POOL_SIZE))
+        print(f"Attempting to connect to Spanner: {instance.name}/databases/{database.name}")
+
+        # Ensure database exists - crucial check
+        if not database.exists():
+             print(f"Error: Database '{database.name}' does not exist in instance '{instance.name}'.")
+             print("Please create the database and the required tables/schema.")
+             return None
         print("Database connection check successful (database exists).")
-        db = database # Assign database object if it exists
+        return database
 
-except exceptions.NotFound:
-    print(f"Error: Spanner instance '{INSTANCE_ID}' not found in project '{PROJECT_ID}'.")
-    # Handle error appropriately - exit, default behavior, etc.
-except Exception as e:
-    print(f"An unexpected error occurred during Spanner initialization: {e}")
-    # Handle error
+    except exceptions.NotFound:
+        print(f"Error: Spanner instance '{INSTANCE_ID}' not found in project '{PROJECT_ID}'.")
+    except Exception as e:
+        print(f"An unexpected error occurred during Spanner initialization: {e}")
+    return None
+
+def get_db():
+    """Returns the Spanner database, connecting on the first call in this process."""
+    global db, _db_initialized
+    if not _db_initialized:
+        with _db_lock:
+            if not _db_initialized:
+                db = _connect()
+                _db_initialized = True
+    return db
 
 def run_query(sql, params=None, param_types=None, expected_fields=None): # Add expected_fields
     """
@@ -70,16 +166,13 @@ def run_query(sql, params=None, param_types=None, expected_fields=None): # Add e
                                                 they appear in the SELECT statement.
                                                 Required if results.fields fails.
     """
+    db = get_db()
     if not db:
         print("Error: Database connection is not available.")
         raise ConnectionError("Spanner database connection not initialized.")
 
     results_list = []
-    print(f"--- Executing SQL ---")
-    print(f"SQL: {sql}")
-    if params:
-        print(f"Params: {params}")
-    print("----------------------")
+    app.logger.debug("Executing SQL: %s params=%s", sql, params)
 
     try:
         with db.snapshot() as snapshot:
@@ -106,20 +199,21 @@ def run_query(sql, params=None, param_types=None, expected_fields=None): # Add e
                      raise ValueError("Could not determine field names for query results.") from e
 
 
-            print(f"Using field names: {field_names}")
+            app.logger.debug("Using field names: %s", field_names)
             # --- MODIFICATION END ---
 
-            for row in results:
-                # Now zip the known field names with the row values (which are lists)
-                if len(field_names) != len(row):
-                     print(f"Warning: Mismatch between number of field names ({len(field_names)}) and row values ({len(row)})")
-                     print(f"Fields: {field_names}")
-                     print(f"Row: {row}")
-                     # Skip this row or handle error appropriately
-                     continue # Skip malformed row for now
-                results_list.append(dict(zip(field_names, row)))
+            rows = list(results)
+            # Every row of a result set has the same width, so the field count
+            # is checked once rather than for each row.
+            if rows and len(field_names) != len(rows[0]):
+                 print(f"Warning: Mismatch between number of field names ({len(field_names)}) and row values ({len(rows[0])})")
+                 print(f"Fields: {field_names}")
+                 print(f"Row: {rows[0]}")
+                 rows = [] # Skip malformed rows
+            # Now zip the known field names with the row values (which are lists)
+            results_list = [dict(zip(field_names, row)) for row in rows]
 
-            print(f"Query successful, fetched {len(results_list)} rows.")
+            app.logger.debug("Query successful, fetched %d rows.", len(results_list))
 
     except (exceptions.NotFound, exceptions.PermissionDenied, exceptions.InvalidArgument) as spanner_err:
         print(f"Spanner Error ({type(spanner_err).__name__}): {spanner_err}")
@@ -129,29 +223,76 @@ def run_query(sql, params=None, param_types=None, expected_fields=None): # Add e
          print(f"Query Processing Error: {e}")
          flash("Internal error processing query results.", "danger")
          return []
-    except Exception as e:
-        print(f"An unexpected error occurred during query execution or processing: {e}")
-        traceback.print_exc()
-        flash(f"An unexpected server error occurred while fetching data.", "danger")
-        raise e
 
     return results_list
 
+def iter_query(sql, params=None, param_types=None, expected_fields=None):
+    """
+    Executes a SQL query and yields each row as a dict while the result set
+    streams in from Spanner, so large results are never held in memory at once.
+
+    Unlike run_query, errors are raised to the caller rather than flashed, and
+    expected_fields is required.
+    """
+    db = get_db()
+    if not db:
+        raise ConnectionError("Spanner database connection not initialized.")
+    if not expected_fields:
+        raise ValueError("expected_fields must be provided to iter_query.")
+
+    with db.snapshot() as snapshot:
+        results = snapshot.execute_sql(
+            sql,
+            params=params,
+            param_types=param_types
+        )
+        for row in results:
+            yield dict(zip(expected_fields, row))
+
 # --- HOW TO CALL IT ---
 
-def get_all_posts_with_author_db():
-    """Fetch all posts and join with author information from Spanner."""
-    sql = """
-        SELECT
-            p.post_id, p.author_id, p.text, p.sentiment, p.post_timestamp,
-            author.name as author_name
-        FROM Post AS p
-        JOIN Person AS author ON p.author_id = author.person_id
-        ORDER BY p.post_timestamp DESC
+# Homepage feed size. Older posts are reached by keyset pagination on
+# (post_timestamp, post_id), which the PostByTimestamp index serves in order.
+POSTS_PAGE_SIZE = int(os.environ.get("POSTS_PAGE_SIZE", "50"))
+
+_POSTS_PAGE_SQL = """
+    SELECT
+        p.post_id, p.author_id, p.text, p.sentiment, p.post_timestamp,
+        author.name as author_name
+    FROM Post AS p
+    JOIN Person AS author ON p.author_id = author.person_id
+    {where}
+    ORDER BY p.post_timestamp DESC, p.post_id DESC
+    LIMIT @limit
+"""
+_POSTS_AFTER_FILTER = """WHERE p.post_timestamp < @after_ts
+       OR (p.post_timestamp = @after_ts AND p.post_id < @after_id)"""
+# Define the fields exactly as they appear in the SELECT statement
+_POST_FIELDS = ["post_id", "author_id", "text", "sentiment", "post_timestamp", "author_name"]
+
+def _posts_page_query(limit, after_timestamp, after_post_id):
+    """Builds the SQL, params and param types for one page of the posts feed."""
+    params = {"limit": limit}
+    param_types_map = {"limit": param_types.INT64}
+    if after_timestamp is None or after_post_id is None:
+        return _POSTS_PAGE_SQL.format(where=""), params, param_types_map
+    params.update(after_ts=after_timestamp, after_id=after_post_id)
+    param_types_map.update(after_ts=param_types.TIMESTAMP, after_id=param_types.STRING)
+    return _POSTS_PAGE_SQL.format(where=_POSTS_AFTER_FILTER), params, param_types_map
+
+@cache.memoize(timeout=HOMEPAGE_CACHE_TIMEOUT)
+def get_all_posts_with_author_db(limit=POSTS_PAGE_SIZE, after_timestamp=None, after_post_id=None):
     """
-    # Define the fields exactly as they appear in the SELECT statement
-    fields = ["post_id", "author_id", "text", "sentiment", "post_timestamp", "author_name"]
-    return run_query(sql, expected_fields=fields) # Pass the list here
+    Fetch a page of posts, newest first, joined with author information.
+    Pass the post_timestamp and post_id of the last post seen to get the next page.
+    Query errors are raised rather than flashed so a failed load is never cached.
+    """
+    return list(iter_all_posts_with_author_db(limit, after_timestamp, after_post_id))
+
+def iter_all_posts_with_author_db(limit=POSTS_PAGE_SIZE, after_timestamp=None, after_post_id=None):
+    """Stream a page of posts with author information, one dict per row."""
+    sql, params, param_types_map = _posts_page_query(limit, after_timestamp, after_post_id)
+    return iter_query(sql, params=params, param_types=param_types_map, expected_fields=_POST_FIELDS)
 
 def get_person_db(person_id):
     """Fetch a single person's details from Spanner."""
@@ -184,14 +325,17 @@ def get_posts_by_person_db(person_id):
 
 def get_friends_db(person_id):
     """Fetch friends of a specific person from Spanner."""
+    # Each leg is a key-prefix seek (the primary key and FriendshipByPersonB).
+    # IN is a semi-join, so a pair stored in both directions still yields the
+    # friend once without a DISTINCT sort.
     sql = """
-        SELECT DISTINCT
-            friend.person_id, friend.name
-        FROM Friendship AS f
-        JOIN Person AS friend ON
-            (f.person_id_a = @person_id AND f.person_id_b = friend.person_id) OR
-            (f.person_id_b = @person_id AND f.person_id_a = friend.person_id)
-        WHERE f.person_id_a = @person_id OR f.person_id_b = @person_id
+        SELECT friend.person_id, friend.name
+        FROM Person AS friend
+        WHERE friend.person_id IN (
+            SELECT person_id_b FROM Friendship WHERE person_id_a = @person_id
+            UNION ALL
+            SELECT person_id_a FROM Friendship WHERE person_id_b = @person_id
+        )
         ORDER BY friend.name
     """
     params = {"person_id": person_id}
@@ -200,98 +344,90 @@ def get_friends_db(person_id):
     return run_query(sql, params=params, param_types=param_types_map, expected_fields=fields)
 
 
-def get_all_events_with_attendees_db():
-    """Fetch all events and their attendees from Spanner."""
-    # Get all events first
-    event_sql = """
-        SELECT event_id, name, event_date
-        FROM Event
-        ORDER BY event_date DESC
-        LIMIT 50
-    """
-    event_fields = ["event_id", "name", "event_date"]
-    events = run_query(event_sql, expected_fields=event_fields)
-    if not events:
-        return []
+def _struct_rows(values, fields):
+    """Turns an ARRAY<STRUCT> column (a list of value lists) into a list of dicts."""
+    return [dict(zip(fields, value)) for value in values or []]
 
-    events_with_attendees = {event['event_id']: {'details': event, 'attendees': []} for event in events}
-    event_ids = list(events_with_attendees.keys())
 
-    # Fetch attendees
-    attendee_sql = """
+@cache.memoize(timeout=HOMEPAGE_CACHE_TIMEOUT)
+def get_all_events_with_attendees_db():
+    """
+    Fetch all events and their attendees from Spanner.
+    Query errors are raised rather than flashed so a failed load is never cached.
+    """
+    # Attendees are aggregated per event in the same statement, so the whole
+    # panel is loaded in one round trip instead of an event query plus an
+    # attendee query stitched together in Python.
+    event_sql = """
         SELECT
-            a.event_id,
-            p.person_id, p.name
-        FROM Attendance AS a
-        JOIN Person AS p ON a.person_id = p.person_id
-        WHERE a.event_id IN UNNEST(@event_ids)
-        ORDER BY a.event_id, p.name
+            e.event_id, e.name, e.event_date,
+            ARRAY(
+                SELECT AS STRUCT p.person_id, p.name
+                FROM Attendance AS a
+                JOIN Person AS p ON a.person_id = p.person_id
+                WHERE a.event_id = e.event_id
+                ORDER BY p.name
+            ) AS attendees
+        FROM Event AS e
+        ORDER BY e.event_date DESC
+        LIMIT 50
     """
-    params = {"event_ids": event_ids}
-    param_types_map = {"event_ids": param_types.Array(param_types.STRING)}
-    attendee_fields = ["event_id", "person_id", "name"]
-    all_attendees = run_query(attendee_sql, params=params, param_types=param_types_map, expected_fields=attendee_fields)
-
-    for attendee in all_attendees:
-        event_id = attendee['event_id']
-        if event_id in events_with_attendees:
-            # No change needed here, attendee is already a dict
-            events_with_attendees[event_id]['attendees'].append(attendee)
+    event_fields = ["event_id", "name", "event_date", "attendees"]
+    events = iter_query(event_sql, expected_fields=event_fields)
 
-    return [events_with_attendees[event['event_id']] for event in events]
+    attendee_fields = ["person_id", "name"]
+    events_with_attendees = []
+    for event in events:
+        attendees = _struct_rows(event.pop("attendees"), attendee_fields)
+        for attendee in attendees:
+            attendee["event_id"] = event["event_id"]
+        events_with_attendees.append({'details': event, 'attendees': attendees})
+    return events_with_attendees
 
 def get_event_details_with_locations_attendees_db(event_id):
     """
     Fetch full details for a single event, including its description,
     locations, and attendees.
     """
+    db = get_db()
     if not db:
         raise ConnectionError("Spanner database connection not initialized.")
 
-    event_details = {}
-
-    # 1. Fetch Event basic details (including new description)
+    # Event, locations and attendees are fetched in a single statement; the
+    # two lists come back as ARRAY<STRUCT> columns on the event row.
     event_sql = """
-        SELECT event_id, name, description, event_date
-        FROM Event
-        WHERE event_id = @event_id
+        SELECT
+            e.event_id, e.name, e.description, e.event_date,
+            ARRAY(
+                SELECT AS STRUCT l.location_id, l.name, l.description, l.latitude, l.longitude, l.address
+                FROM Location AS l
+                JOIN EventLocation AS el ON l.location_id = el.location_id
+                WHERE el.event_id = e.event_id
+                ORDER BY l.name
+            ) AS locations,
+            ARRAY(
+                SELECT AS STRUCT p.person_id, p.name
+                FROM Person AS p
+                JOIN Attendance AS a ON p.person_id = a.person_id
+                WHERE a.event_id = e.event_id
+                ORDER BY p.name
+            ) AS attendees
+        FROM Event AS e
+        WHERE e.event_id = @event_id
     """
     params = {"event_id": event_id}
     param_types_map = {"event_id": param_types.STRING}
-    event_fields = ["event_id", "name", "description", "event_date"]
+    event_fields = ["event_id", "name", "description", "event_date", "locations", "attendees"]
     event_result = run_query(event_sql, params=params, param_types=param_types_map, expected_fields=event_fields)
 
     if not event_result:
         return None # Event not found
     event_details = event_result[0]
 
-    # 2. Fetch Event Locations
-    locations_sql = """
-        SELECT l.location_id, l.name, l.description, l.latitude, l.longitude, l.address
-        FROM Location AS l
-        JOIN EventLocation AS el ON l.location_id = el.location_id
-        WHERE el.event_id = @event_id
-        ORDER BY l.name
-    """
-    # Params and param_types_map are the same as for event_sql
     location_fields = ["location_id", "name", "description", "latitude", "longitude", "address"]
-    event_details["locations"] = run_query(locations_sql, params=params, param_types=param_types_map, expected_fields=location_fields)
-
-    # 3. Fetch Event Attendees
-    attendees_sql = """
-        SELECT p.person_id, p.name
-        FROM Person AS p
-        JOIN Attendance AS a ON p.person_id = a.person_id
-        WHERE a.event_id = @event_id
-        ORDER BY p.name
-    """
-    # Params and param_types_map are the same
     attendee_fields = ["person_id", "name"]
-    event_details["attendees"] = run_query(attendees_sql, params=params, param_types=param_types_map, expected_fields=attendee_fields)
-
-    # Convert datetimes to ISO format if they are not already strings
-    if isinstance(event_details.get('event_date'), datetime):
-        event_details['event_date'] = event_details['event_date'].isoformat()
+    event_details["locations"] = _struct_rows(event_details["locations"], location_fields)
+    event_details["attendees"] = _struct_rows(event_details["attendees"], attendee_fields)
 
     # Ensure locations have float for lat/lon if they are Decimal or other numeric types
     for loc in event_details.get("locations", []):
@@ -301,6 +437,15 @@ def get_event_details_with_locations_attendees_db(event_id):
 
 
 # --- Custom Jinja Filter ---
+_UTC = timezone.utc
+
+def _request_now_utc():
+    """Current UTC time, computed once per request and shared by every filter call."""
+    now = g.get("_now_utc")
+    if now is None:
+        now = g._now_utc = datetime.now(_UTC)
+    return now
+
 @app.template_filter('humanize_datetime')
 def _jinja2_filter_humanize_datetime(value, default="just now"):
     """
@@ -309,9 +454,11 @@ def _jinja2_filter_humanize_datetime(value, default="just now"):
     """
     if not value:
         return default
-   
-    dt_object = None
-    if isinstance(value, str):
+
+    # Fast path: values from Spanner are already datetimes, so skip parsing.
+    if isinstance(value, datetime):
+        dt_object = value
+    elif isinstance(value, str):
         try:
             # Attempt to parse ISO 8601 format.
             # .replace('Z', '+00:00') handles UTC 'Z' suffix for fromisoformat.
@@ -323,53 +470,99 @@ def _jinja2_filter_humanize_datetime(value, default="just now"):
             except (parser.ParserError, TypeError, ValueError) as e:
                 app.logger.warning(f"Could not parse date string '{value}' in humanize_datetime: {e}")
                 return str(value) # Return original string if unparseable
-    elif isinstance(value, datetime):
-        dt_object = value
     else:
         # If not a string or datetime, return its string representation
         return str(value)
 
-    if dt_object is None: # Should have been handled, but as a safeguard
-        app.logger.warning(f"Date value '{value}' resulted in None dt_object in humanize_datetime.")
-        return str(value)
-
-    now = datetime.now(timezone.utc)
     # Use dt_object for all datetime operations from here
-    if dt_object.tzinfo is None or dt_object.tzinfo.utcoffset(dt_object) is None:
-        # If dt_object is naive, assume it's UTC
-        dt_object = dt_object.replace(tzinfo=timezone.utc)
-    else:
-        # Convert aware dates to UTC
-        dt_object = dt_object.astimezone(timezone.utc)
+    tzinfo = dt_object.tzinfo
+    if tzinfo is not _UTC:
+        if tzinfo is None or tzinfo.utcoffset(dt_object) is None:
+            # If dt_object is naive, assume it's UTC
+            dt_object = dt_object.replace(tzinfo=_UTC)
+        else:
+            # Convert aware dates to UTC
+            dt_object = dt_object.astimezone(_UTC)
 
     try:
-        return humanize.naturaltime(now - dt_object)
+        return humanize.naturaltime(_request_now_utc() - dt_object)
     except TypeError:
         # Fallback or handle error if date calculation fails
         return dt_object.strftime("%Y-%m-%d %H:%M")
 
 
-def get_person_by_name_db(name):
-    """Fetch a person's ID by their name from Spanner."""
+# Person names are treated as stable keys, so resolved IDs are memoised for the
+# life of the process. Only hits are stored: a name that is not found yet may
+# be inserted later (e.g. by setup.py) and must be looked up again.
+_PERSON_ID_CACHE_MAX = 10000
+_person_id_cache = {}
+_person_id_cache_lock = threading.Lock()
+
+
+def invalidate_person_cache(name=None):
+    """Drops a cached name -> person_id mapping (or all of them if name is None)."""
+    with _person_id_cache_lock:
+        if name is None:
+            _person_id_cache.clear()
+        else:
+            _person_id_cache.pop(name, None)
+
+
+def _cache_person_ids(mapping):
+    with _person_id_cache_lock:
+        if len(_person_id_cache) + len(mapping) > _PERSON_ID_CACHE_MAX:
+            _person_id_cache.clear()
+        _person_id_cache.update(mapping)
+
+
+_PERSON_IDS_BY_NAMES_SQL = "SELECT name, person_id FROM Person WHERE name IN UNNEST(@names)"
+
+def get_person_ids_by_names_db(names):
+    """
+    Resolve several person names to IDs with a single Spanner query.
+
+    Cached names are served from memory; the rest are fetched together with
+    IN UNNEST. Returns a dict of name -> person_id containing only the names
+    that were found (the first match wins if a name is duplicated).
+    """
+    db = get_db()
     if not db:
         print("Error: Database connection is not available.")
         raise ConnectionError("Spanner database connection not initialized.")
 
-    sql = "SELECT person_id FROM Person WHERE name = @name LIMIT 1"
-    params = {"name": name}
-    param_types_map = {"name": param_types.STRING}
-    fields = ["person_id"] # Expected field from the SELECT
-    try:
-        results = run_query(sql, params=params, param_types=param_types_map, expected_fields=fields)
-        return results[0]['person_id'] if results else None
-    except Exception as e:
-        print(f"Error fetching person by name '{name}': {e}")
-        # Optionally re-raise or return None based on desired error handling
-        raise e # Re-raise to be caught by the API endpoint handler
+    found = {}
+    missing = []
+    with _person_id_cache_lock:
+        for name in dict.fromkeys(names):
+            person_id = _person_id_cache.get(name)
+            if person_id is None:
+                missing.append(name)
+            else:
+                found[name] = person_id
+    if not missing:
+        return found
+
+    params = {"names": missing}
+    param_types_map = {"names": param_types.Array(param_types.STRING)}
+    fields = ["name", "person_id"]
+    results = run_query(_PERSON_IDS_BY_NAMES_SQL, params=params, param_types=param_types_map, expected_fields=fields)
+
+    fetched = {}
+    for row in results:
+        fetched.setdefault(row["name"], row["person_id"])
+    _cache_person_ids(fetched)
+    found.update(fetched)
+    return found
+
+
+def get_person_by_name_db(name):
+    """Fetch a person's ID by their name from Spanner."""
+    return get_person_ids_by_names_db([name]).get(name)
 
 # --- Helper function to insert a post ---
 def add_post_db(post_id, author_id, text, sentiment=None):
     """Inserts a new post into the Spanner database."""
+    db = get_db()
     if not db:
         print("Error: Database connection is not available for insert.")
         raise ConnectionError("Spanner database connection not initialized.")
@@ -387,11 +580,10 @@ def add_post_db(post_id, author_id, text, sentiment=None):
                 spanner.COMMIT_TIMESTAMP   # Use commit time for create_time
             )]
         )
-        print(f"Transaction attempting to insert post_id: {post_id}")
 
     try:
         db.run_in_transaction(_insert_post)
-        print(f"Successfully inserted post_id: {post_id}")
+        app.logger.debug("Successfully inserted post_id: %s", post_id)
         return True
     except Exception as e:
         print(f"Error inserting post (id: {post_id}): {e}")
@@ -399,6 +591,50 @@ def add_post_db(post_id, author_id, text, sentiment=None):
         # traceback.print_exc()
         return False # Indicate failure
 
+def _write_full_event(transaction, event_id, event_name, description, event_date, locations_data, attendee_ids):
+    """Buffers the Event, Location, EventLocation and Attendance mutations on a transaction."""
+    # Insert into Event table (Simplified Schema)
+    transaction.insert(
+        table="Event",
+        columns=[
+            "event_id", "name", "description", "event_date", "create_time"
+        ],
+        values=[(
+            event_id, event_name, description, event_date,
+            spanner.COMMIT_TIMESTAMP
+        )]
+    )
+
+    # Insert Locations and EventLocation links, one multi-row mutation per table.
+    # IDs are generated up front so both tables can be written in a single call.
+    location_ids = [str(uuid.uuid4()) for _ in locations_data]
+    if location_ids:
+        transaction.insert(
+            table="Location",
+            columns=["location_id", "name", "description", "latitude", "longitude", "address", "create_time"],
+            values=[(
+                location_id, loc_data.get("name"), loc_data.get("description"),
+                float(loc_data.get("latitude", 0.0)), float(loc_data.get("longitude", 0.0)), # Ensure float
+                loc_data.get("address"), spanner.COMMIT_TIMESTAMP
+            ) for location_id, loc_data in zip(location_ids, locations_data)]
+        )
+        transaction.insert(
+            table="EventLocation",
+            columns=["event_id", "location_id", "create_time"],
+            values=[(event_id, location_id, spanner.COMMIT_TIMESTAMP) for location_id in location_ids]
+        )
+
+    # Insert all attendees into Attendance table. Repeated IDs are dropped first
+    # (the ON CONFLICT DO NOTHING of this insert), since a duplicate
+    # (event_id, person_id) key would fail the whole commit.
+    if attendee_ids:
+        attendee_ids = list(dict.fromkeys(attendee_ids))
+        transaction.insert(
+            table="Attendance",
+            columns=["event_id", "person_id", "attendance_time"],
+            values=[(event_id, attendee_id_to_add, spanner.COMMIT_TIMESTAMP) for attendee_id_to_add in attendee_ids]
+        )
+
 def add_full_event_with_details_db(event_id, event_name, description, event_date, locations_data, attendee_ids):
     """
     Inserts a new event with its title, description, multiple locations,
@@ -416,63 +652,121 @@ def add_full_event_with_details_db(event_id, event_name, description, event_date
     Returns:
         bool: True if the transaction was successful, False otherwise.
     """
+    db = get_db()
     if not db:
         print("Error: Database connection is not available for full event insert.")
         raise ConnectionError("Spanner database connection not initialized.")
 
     def _insert_event_and_attendee(transaction):
-        # Insert into Event table (Simplified Schema)
-        transaction.insert(
-            table="Event",
-            columns=[
-                "event_id", "name", "description", "event_date", "create_time"
-            ],
-            values=[(
-                event_id, event_name, description, event_date,
-                spanner.COMMIT_TIMESTAMP
-            )]
-        )
-        print(f"Transaction attempting to insert event_id: {event_id}")
-
-        # Insert Locations and EventLocation links
-        for loc_data in locations_data:
-            location_id = str(uuid.uuid4())
-            transaction.insert(
-                table="Location",
-                columns=["location_id", "name", "description", "latitude", "longitude", "address", "create_time"],
-                values=[(
-                    location_id, loc_data.get("name"), loc_data.get("description"),
-                    float(loc_data.get("latitude", 0.0)), float(loc_data.get("longitude", 0.0)), # Ensure float
-                    loc_data.get("address"), spanner.COMMIT_TIMESTAMP
-                )]
-            )
-            print(f"Transaction attempting to insert location_id: {location_id} for event {event_id}")
-            transaction.insert(
-                table="EventLocation",
-                columns=["event_id", "location_id", "create_time"],
-                values=[(event_id, location_id, spanner.COMMIT_TIMESTAMP)]
-            )
-            print(f"Transaction attempting to link event {event_id} with location {location_id}")
-
-        # Insert each attendee into Attendance table
-        if attendee_ids:
-            for attendee_id_to_add in attendee_ids:
-                transaction.insert(
-                    table="Attendance",
-                    columns=["event_id", "person_id", "attendance_time"],
-                    values=[(event_id, attendee_id_to_add, spanner.COMMIT_TIMESTAMP)]
-                )
-                print(f"Transaction attempting to insert attendee {attendee_id_to_add} for event {event_id} into Attendance")
+        _write_full_event(transaction, event_id, event_name, description, event_date, locations_data, attendee_ids)
 
     try:
         db.run_in_transaction(_insert_event_and_attendee)
-        print(f"Successfully inserted event {event_id} with details and attendees {attendee_ids}")
+        app.logger.debug("Successfully inserted event %s with details and attendees %s", event_id, attendee_ids)
         return True
     except Exception as e:
-        print(f"Error inserting full event (event_id: {event_id}, attendee_ids: {attendee_ids}): {e}")
-        traceback.print_exc() # Log detailed error
+        app.logger.exception("Error inserting full event (event_id: %s, attendee_ids: %s): %s", event_id, attendee_ids, e)
         return False # Indicate failure
 
+class AttendeesNotFoundError(LookupError):
+    """Raised when some attendee names do not match any Person."""
+    def __init__(self, names):
+        self.names = names
+        super().__init__(f"Attendees not found: {', '.join(names)}")
+
+def add_event_for_attendee_names_db(event_id, event_name, description, event_date, locations_data, attendee_names):
+    """
+    Resolves attendee names and inserts the event, its locations and its
+    attendees in a single read-write transaction, so the names are checked
+    against the same snapshot the event is committed on.
+
+    Args are as for add_full_event_with_details_db, except attendee_names
+    (list[str]) replaces attendee_ids.
+
+    Returns:
+        dict | None: name -> person_id for the attendees on success, None if the
+                     transaction failed.
+
+    Raises:
+        AttendeesNotFoundError: if any name does not match a Person; nothing is written.
+    """
+    db = get_db()
+    if not db:
+        print("Error: Database connection is not available for full event insert.")
+        raise ConnectionError("Spanner database connection not initialized.")
+
+    def _resolve_and_insert(transaction):
+        results = transaction.execute_sql(
+            _PERSON_IDS_BY_NAMES_SQL,
+            params={"names": list(dict.fromkeys(attendee_names))},
+            param_types={"names": param_types.Array(param_types.STRING)}
+        )
+        ids_by_name = {}
+        for name, person_id in results:
+            ids_by_name.setdefault(name, person_id)
+        missing = [name for name in attendee_names if name not in ids_by_name]
+        if missing:
+            raise AttendeesNotFoundError(missing) # Rolls the transaction back
+        attendee_ids = [ids_by_name[name] for name in attendee_names]
+        _write_full_event(transaction, event_id, event_name, description, event_date, locations_data, attendee_ids)
+        return ids_by_name
+
+    try:
+        ids_by_name = db.run_in_transaction(_resolve_and_insert)
+    except AttendeesNotFoundError:
+        raise
+    except Exception as e:
+        app.logger.exception("Error inserting full event (event_id: %s, attendee_names: %s): %s", event_id, attendee_names, e)
+        return None # Indicate failure
+
+    _cache_person_ids(ids_by_name)
+    app.logger.debug("Successfully inserted event %s with details and attendees %s", event_id, ids_by_name)
+    return ids_by_name
+
+# --- Request Schemas ---
+_NON_EMPTY_STRING = {"type": "string", "pattern": r"\S"}
+# Coordinates may arrive as JSON numbers or as numeric strings.
+_COORDINATE = {"anyOf": [
+    {"type": "number"},
+    {"type": "string", "pattern": r"^\s*[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?\s*$"},
+]}
+
+# Compiled once at import into a single generated validation function.
+validate_event_payload = fastjsonschema.compile({
+    "type": "object",
+    "required": ["event_name", "description", "event_date", "locations", "attendee_names"],
+    "properties": {
+        "event_name": _NON_EMPTY_STRING,
+        "description": {"type": "string"},
+        "event_date": _NON_EMPTY_STRING,
+        "attendee_names": {"type": "array", "minItems": 1, "items": _NON_EMPTY_STRING},
+        "locations": {
+            "type": "array",
+            "minItems": 1,
+            "items": {
+                "type": "object",
+                "required": ["name", "latitude", "longitude"],
+                "properties": {
+                    "name": _NON_EMPTY_STRING,
+                    "latitude": _COORDINATE,
+                    "longitude": _COORDINATE,
+                    "description": {"type": "string"},
+                    "address": {"type": "string"},
+                },
+            },
+        },
+    },
+})
+
+# --- Concurrent Page Queries ---
+# Shared by all requests; each task checks out its own session from the pool.
+_page_executor = ThreadPoolExecutor(max_workers=PAGE_QUERY_WORKERS, thread_name_prefix="page-query")
+
+def _submit_in_request(fn, *args):
+    """Runs fn(*args) on the page executor inside a copy of the current request context,
+    so helpers that flash() or use the cache keep working off the request thread."""
+    return _page_executor.submit(copy_current_request_context(fn), *args)
+
 # --- Routes ---
 @app.route('/')
 def home():
@@ -480,43 +774,86 @@ def home():
     all_posts = []
     all_events_attendance = [] # Initialize
 
+    # Optional keyset cursor for older posts: ?after_ts=<ISO timestamp>&after_id=<post_id>
+    after_ts = None
+    after_id = request.args.get("after_id")
+    if request.args.get("after_ts"):
+        try:
+            after_ts = datetime.fromisoformat(request.args["after_ts"].replace('Z', '+00:00'))
+        except ValueError:
+            abort(400)
+
+    db = get_db()
+
     if not db:
         flash("Database connection not available. Cannot load page data.", "danger")
     else:
         try:
-            # Fetch both posts and events
-            all_posts = get_all_posts_with_author_db()
-            all_events_attendance = get_all_events_with_attendees_db() # Fetch events
+            # Fetch both posts and events. The first page of posts comes from the
+            # cache; older pages are streamed into the template, with the first
+            # row pulled here so query errors surface before the response starts
+            # and an empty feed still renders as empty.
+            try:
+                all_events_attendance = get_all_events_with_attendees_db() # Fetch events
+            except Exception as e:
+                # Keep the feed even when the events panel fails to load.
+                flash(f"Failed to load events: {e}", "danger")
+            if after_ts is None or after_id is None:
+                all_posts = get_all_posts_with_author_db()
+            else:
+                post_rows = iter_all_posts_with_author_db(after_timestamp=after_ts, after_post_id=after_id)
+                first_post = next(post_rows, None)
+                if first_post is not None:
+                    all_posts = itertools.chain((first_post,), post_rows)
         except Exception as e:
              flash(f"Failed to load page data: {e}", "danger")
              # Ensure variables are defined even on error
              all_posts = []
              all_events_attendance = []
 
-    return render_template(
+    # The session is saved before a streamed body is rendered, so flashed
+    # messages are consumed now; the template then reads them from the
+    # request-level cache instead of popping them after the cookie is sent.
+    get_flashed_messages()
+    return app.response_class(stream_template(
         'index.html',
         posts=all_posts,
+        posts_page_size=POSTS_PAGE_SIZE,
         all_events_attendance=all_events_attendance, # Pass events to template
         google_maps_api_key=GOOGLE_MAPS_API_KEY, # For potential future use on home page
         google_maps_map_id=GOOGLE_MAPS_MAP_KEY # Pass it to the template
-    )
+    ))
 
 
 @app.route('/person/<string:person_id>')
 def person_profile(person_id):
     """Person profile page, fetching data from Spanner."""
+    db = get_db()
     if not db:
         flash("Database connection not available. Cannot load profile.", "danger")
         abort(503) # Service Unavailable
 
+    person = None
     try:
-        person = get_person_db(person_id)
+        # The four reads are independent, so they run concurrently and the
+        # page waits for the slowest rather than the sum.
+        person_future = _submit_in_request(get_person_db, person_id)
+        posts_future = _submit_in_request(get_posts_by_person_db, person_id)
+        friends_future = _submit_in_request(get_friends_db, person_id)
+        events_future = _submit_in_request(get_all_events_with_attendees_db)
+
+        person = person_future.result()
         if not person:
             abort(404) # Person not found
 
-        person_posts = get_posts_by_person_db(person_id)
-        friends = get_friends_db(person_id)
-        all_events_attendance = get_all_events_with_attendees_db()
+        person_posts = posts_future.result()
+        friends = friends_future.result()
+        try:
+            all_events_attendance = events_future.result()
+        except Exception as e:
+            # Keep the profile even when the events panel fails to load.
+            flash(f"Failed to load events: {e}", "danger")
+            all_events_attendance = []
 
     except Exception as e:
          flash(f"Failed to load profile data: {e}", "danger")
@@ -535,6 +872,7 @@ def person_profile(person_id):
 @app.route('/event/<string:event_id>')
 def event_detail_page(event_id):
     """Event detail page showing description, locations on a map, and attendees."""
+    db = get_db()
     if not db:
         flash("Database connection not available. Cannot load event details.", "danger")
         abort(503) # Service Unavailable
@@ -549,9 +887,7 @@ def event_detail_page(event_id):
             abort(404) # Event not found
     except Exception as e:
         flash(f"Failed to load event data: {e}", "danger")
-        # Log the error for debugging
-        print(f"Error fetching event {event_id}: {e}")
-        traceback.print_exc()
+        app.logger.exception("Error fetching event %s: %s", event_id, e)
         # Render the page with an error state or redirect
         return render_template('event_detail.html', event=None, error=True, google_maps_api_key=GOOGLE_MAPS_API_KEY)
 
@@ -564,6 +900,7 @@ def add_post_api():
     API endpoint to add a new post.
     Expects JSON body: {"author_name": "...", "text": "...", "sentiment": "..." (optional)}
     """
+    db = get_db()
     if not db:
         return jsonify({"error": "Database connection not available"}), 503 # Service Unavailable
 
@@ -603,6 +940,7 @@ def add_post_api():
         )
 
         if success:
+            cache.delete_memoized(get_all_posts_with_author_db)
             # 4. Return a success response
             post_data = {
                 "message": "Post added successfully",
@@ -621,12 +959,11 @@ def add_post_api():
 
     except ConnectionError as e:
          # Handle case where db connection failed specifically in this request path
-         print(f"ConnectionError during post add: {e}")
+         app.logger.warning("ConnectionError during post add: %s", e)
          return jsonify({"error": "Database connection error during operation"}), 503
     except Exception as e:
         # Catch any other unexpected errors (e.g., from get_person_by_name_db)
-        print(f"Unexpected error processing add post request: {e}")
-        traceback.print_exc() # Log detailed error for server admin
+        app.logger.exception("Unexpected error processing add post request: %s", e) # Logs the traceback for server admin
         return jsonify({"error": "An internal server error occurred"}), 500
 
 
@@ -645,6 +982,7 @@ def add_event_api():
         "attendee_names": ["...", "..."] // List of attendee names
     }
     """
+    db = get_db()
     if not db:
         return jsonify({"error": "Database connection not available"}), 503
 
@@ -653,10 +991,10 @@ def add_event_api():
         return jsonify({"error": "Invalid JSON payload"}), 400
 
     # --- Input Validation (Simplified) ---
-    required_fields = ["event_name", "description", "event_date", "locations", "attendee_names"]
-    missing_fields = [field for field in required_fields if field not in data]
-    if missing_fields:
-        return jsonify({"error": f"Missing required fields: {', '.join(missing_fields)}"}), 400
+    try:
+        validate_event_payload(data)
+    except fastjsonschema.JsonSchemaValueException as e:
+        return jsonify({"error": e.message}), 400
 
     event_name = data['event_name'] 
     description = data['description']
@@ -664,41 +1002,6 @@ def add_event_api():
     locations_data = data['locations']
     attendee_names = data['attendee_names']
 
-    # Basic type checks
-    if not isinstance(event_name, str) or not event_name.strip(): 
-         return jsonify({"error": "'event_name' must be a non-empty string"}), 400 
-    if not isinstance(description, str):
-         return jsonify({"error": "'description' must be a string"}), 400
-    if not isinstance(event_date_str, str) or not event_date_str.strip():
-         return jsonify({"error": "'event_date' must be a non-empty string"}), 400
-    if not isinstance(attendee_names, list) or not attendee_names: # Ensure it's a non-empty list
-         return jsonify({"error": "'attendee_names' must be a non-empty list of strings"}), 400
-    for name in attendee_names:
-        if not isinstance(name, str) or not name.strip():
-            return jsonify({"error": "Each name in 'attendee_names' must be a non-empty string"}), 400
-    if not isinstance(locations_data, list):
-        return jsonify({"error": "'locations' must be a list"}), 400
-    if not locations_data: 
-        return jsonify({"error": "'locations' list cannot be empty"}), 400
-
-    for i, loc in enumerate(locations_data):
-        if not isinstance(loc, dict):
-            return jsonify({"error": f"Each item in 'locations' must be an object (error at index {i})"}), 400
-        loc_req_fields = ["name", "latitude", "longitude"]
-        missing_loc_fields = [f for f in loc_req_fields if f not in loc or not str(loc[f]).strip()] # Check for presence and non-empty string for name
-        if missing_loc_fields:
-            return jsonify({"error": f"Location at index {i} missing required fields or has empty values: {', '.join(missing_loc_fields)}"}), 400
-        try:
-            float(loc["latitude"])
-            float(loc["longitude"])
-        except (ValueError, TypeError):
-            return jsonify({"error": f"Location at index {i} has invalid latitude/longitude. Must be numbers."}), 400
-        # Optional fields like description and address can be checked if needed
-        if "description" in loc and not isinstance(loc["description"], str):
-            return jsonify({"error": f"Location at index {i} 'description' must be a string if provided."}), 400
-        if "address" in loc and not isinstance(loc["address"], str):
-            return jsonify({"error": f"Location at index {i} 'address' must be a string if provided."}), 400
-
     # --- Process Inputs (Simplified) ---
     try:
         # Parse timestamp (ISO 8601 format expected)
@@ -719,34 +1022,31 @@ def add_event_api():
         return jsonify({"error": f"Invalid timestamp format for 'event_date'. Use ISO 8601 (e.g., YYYY-MM-DDTHH:MM:SSZ or YYYY-MM-DDTHH:MM:SS+HH:MM). Details: {e}"}), 400
 
     try:
-        # 1. Find person_ids for all attendee names
-        attendee_ids_to_add = []
-        processed_attendees_info = []
-        for attendee_name_str in attendee_names:
-            attendee_id = get_person_by_name_db(attendee_name_str)
-            if not attendee_id:
-                return jsonify({"error": f"Attendee '{attendee_name_str}' not found"}), 404 # Not Found
-            attendee_ids_to_add.append(attendee_id)
-            processed_attendees_info.append({"id": attendee_id, "name": attendee_name_str})
-
-        if not attendee_ids_to_add: # Should be caught by earlier validation, but good check
-            return jsonify({"error": "No valid attendees found or provided."}), 400
-
-        # 2. Generate a unique ID for the new event
+        # 1. Generate a unique ID for the new event
         new_event_id = str(uuid.uuid4())
 
-        # 3. Insert the event and all attendees atomically
-        success = add_full_event_with_details_db(
-            event_id=new_event_id,
-            event_name=event_name,
-            description=description,
-            event_date=event_date,
-            locations_data=locations_data,
-            attendee_ids=attendee_ids_to_add,
-        )
+        # 2. Resolve the attendee names and insert the event, locations and
+        #    attendees in one transaction
+        try:
+            ids_by_name = add_event_for_attendee_names_db(
+                event_id=new_event_id,
+                event_name=event_name,
+                description=description,
+                event_date=event_date,
+                locations_data=locations_data,
+                attendee_names=attendee_names,
+            )
+        except AttendeesNotFoundError as e:
+            return jsonify({
+                "error": str(e),
+                "missing_attendees": e.names,
+            }), 404 # Not Found
+        success = ids_by_name is not None
 
         if success:
-            # 4. Return a success response
+            cache.delete_memoized(get_all_events_with_attendees_db)
+            processed_attendees_info = [{"id": ids_by_name[name], "name": name} for name in attendee_names]
+            # 3. Return a success response
             event_data = {
                 "message": "Event and attendees added successfully",
                 "event_id": new_event_id,
@@ -762,12 +1062,11 @@ def add_event_api():
             return jsonify({"error": "Failed to save event and attendee to the database"}), 500 # Internal Server Error
 
     except ConnectionError as e:
-         print(f"ConnectionError during event add: {e}")
+         app.logger.warning("ConnectionError during event add: %s", e)
          return jsonify({"error": "Database connection error during operation"}), 503
     except Exception as e:
         # Catch other unexpected errors
-        print(f"Unexpected error processing add event request: {e}")
-        traceback.print_exc()
+        app.logger.exception("Unexpected error processing add event request: %s", e)
         return jsonify({"error": "An internal server error occurred"}), 500
 
 
@@ -779,13 +1078,21 @@ def page_not_found(e):
 @app.errorhandler(500)
 def internal_server_error(e):
      # Log the error e
-     print(f"Internal Server Error: {e}")
+     app.logger.error("Internal Server Error: %s", e)
      return render_template('500.html'), 500 # You'll need to create 500.html
 
+@app.errorhandler(Exception)
+def unhandled_exception(e):
+     # HTTP errors (abort(404), 400s, ...) keep their own status and handlers.
+     if isinstance(e, HTTPException):
+          return e
+     app.logger.exception("Unhandled exception: %s", e)
+     return render_template('500.html'), 500
+
 @app.errorhandler(503)
 def service_unavailable(e):
      # Log the error e
-     print(f"Service Unavailable Error: {e}")
+     app.logger.warning("Service Unavailable Error: %s", e)
      return render_template('503.html'), 503 # You'll need to create 503.html
 
 
@@ -794,7 +1101,7 @@ def service_unavailable(e):
 
 if __name__ == '__main__':
     # Check if db connection was successful before running
-    if not db:
+    if not get_db():
         print("\n--- Cannot start Flask app: Spanner database connection failed during initialization. ---")
         print("--- Please check GCP project, instance ID, database ID, permissions, and network connectivity. ---")
     else:
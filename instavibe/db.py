@@ -1,21 +1,27 @@
 # spanner_data_fetchers.py
 
 import os
-import traceback
-from datetime import datetime,
-import json # For example usage printing
+import logging
+import threading
+import weakref
 
+import orjson
+from cachetools import TTLCache
 from google.cloud import spanner
 from google.cloud.spanner_v1 import param_types
 from google.api_core import exceptions
 
+log = logging.getLogger(__name__)
+
 # --- Spanner Configuration ---
 INSTANCE_ID = os.environ.get("SPANNER_INSTANCE_ID", "instavibe-graph-instance")
 DATABASE_ID = os.environ.get("SPANNER_DATABASE_ID", "graphdb")
 PROJECT_ID = os.environ.get("GOOGLE_CLOUD_PROJECT")
+# Sessions kept open for concurrent callers; each query checks one out.
+SPANNER_POOL_SIZE = int(os.environ.get("SPANNER_POOL_SIZE", "10"))
 
 if not PROJECT_ID:
-    print("Warning: GOOGLE_CLOUD_PROJECT environment variable not set.")
+    log.warning("GOOGLE_CLOUD_PROJECT environment variable not set.")
 
 # --- Spanner Client Initialization ---
 db = None
@@ -24,25 +30,100 @@ try:
     if PROJECT_ID:
         spanner_client = spanner.Client(project=PROJECT_ID)
         instance = spanner_client.instance(INSTANCE_ID)
-        database = instance.database(DATABASE_ID)
-        print(f"Attempting to connect to Spanner: {instance.name}/databases/{database.name}")
+        database = instance.database(DATABASE_ID, pool=spanner.FixedSizePool(size=SPANNER_POOL_SIZE))
+        log.info("Attempting to connect to Spanner: %s/databases/%s", instance.name, database.name)
 
         if not database.exists():
-             print(f"Error: Database '{database.name}' does not exist in instance '{instance.name}'.")
+             log.error("Database '%s' does not exist in instance '%s'.", database.name, instance.name)
              db = None
         else:
-            print("Spanner database connection check successful.")
+            log.info("Spanner database connection check successful.")
             db = database
     else:
-        print("Skipping Spanner client initialization due to missing GOOGLE_CLOUD_PROJECT.")
+        log.warning("Skipping Spanner client initialization due to missing GOOGLE_CLOUD_PROJECT.")
 
 except exceptions.NotFound:
-    print(f"Error: Spanner instance '{INSTANCE_ID}' not found in project '{PROJECT_ID}'.")
+    log.error("Spanner instance '%s' not found in project '%s'.", INSTANCE_ID, PROJECT_ID)
     db = None
 except Exception as e:
-    print(f"An unexpected error occurred during Spanner initialization: {e}")
+    log.exception("An unexpected error occurred during Spanner initialization: %s", e)
     db = None
 
+# ISO 8601 in UTC, e.g. 2024-05-01T18:30:00.000000+00:00.
+ISO_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%E6S%Ez"
+
+# --- Read-through Caches ---
+# Friend lists, attended events and the recent-posts feed change far less
+# often than they are read. Cached values are shared between callers and must
+# be treated as read-only. Failed lookups (None) are not cached.
+_friends_cache = TTLCache(maxsize=10_000, ttl=int(os.environ.get("FRIENDS_CACHE_TTL", "60")))
+_events_cache = TTLCache(maxsize=10_000, ttl=int(os.environ.get("EVENTS_CACHE_TTL", "60")))
+_posts_cache = TTLCache(maxsize=64, ttl=int(os.environ.get("POSTS_CACHE_TTL", "15")))
+_cache_lock = threading.Lock()
+_MISSING = object()
+
+
+class _KeyLock:
+    """A lock that can be held in a WeakValueDictionary (plain locks cannot)."""
+    __slots__ = ("lock", "__weakref__")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+
+
+# One lock per in-flight key, so concurrent misses for the same key run the
+# query once (singleflight) while other keys proceed. Entries vanish once no
+# caller holds them.
+_key_locks = weakref.WeakValueDictionary()
+
+
+def _lock_for(key):
+    with _cache_lock:
+        key_lock = _key_locks.get(key)
+        if key_lock is None:
+            key_lock = _key_locks[key] = _KeyLock()
+        return key_lock
+
+
+def _cached(cache, key, loader):
+    """Returns cache[key], calling loader() at most once per key to fill a miss."""
+    with _cache_lock:
+        value = cache.get(key, _MISSING)
+    if value is not _MISSING:
+        return value
+
+    key_lock = _lock_for(key)
+    with key_lock.lock:
+        with _cache_lock:
+            value = cache.get(key, _MISSING)
+        if value is _MISSING:
+            value = loader()
+            if value is not None:
+                with _cache_lock:
+                    cache[key] = value
+    return value
+
+
+def invalidate_friends(*person_ids):
+    """Drops cached friend lists, e.g. for both sides of a new friendship."""
+    with _cache_lock:
+        for person_id in person_ids:
+            _friends_cache.pop(person_id, None)
+
+
+def invalidate_attended_events(*person_ids):
+    """Drops cached attended-event lists for the given people."""
+    with _cache_lock:
+        for person_id in person_ids:
+            _events_cache.pop(person_id, None)
+
+
+def invalidate_posts():
+    """Drops every cached posts feed; call after a post is added."""
+    with _cache_lock:
+        _posts_cache.clear()
+
+
 # --- Utility Function (Graph Query Specific) ---
 
 def run_graph_query(db_instance, graph_sql, params=None, param_types=None, expected_fields=None):
@@ -60,12 +141,15 @@ def run_graph_query(db_instance, graph_sql, params=None, param_types=None, expec
         list[dict]: A list of dictionaries representing the rows, or None on error.
     """
     if not db_instance:
-        print("Error: Database connection is not available.")
+        log.error("Database connection is not available.")
         return None
 
-    results_list = []
-    print(f"--- Executing Graph Query ---")
-    # print(f"GQL: {graph_sql}") # Uncomment for verbose query logging
+    field_names = expected_fields
+    if not field_names:
+         log.error("expected_fields must be provided to run_graph_query.")
+         return None
+
+    log.debug("Executing graph query: %s params=%s", graph_sql, params)
 
     try:
         with db_instance.snapshot() as snapshot:
@@ -76,31 +160,51 @@ def run_graph_query(db_instance, graph_sql, params=None, param_types=None, expec
                 param_types=param_types
             )
 
-            field_names = expected_fields
-            if not field_names:
-                 print("Error: expected_fields must be provided to run_graph_query.")
-                 return None
+            rows = list(results)
+            # Every row of a result set has the same width, so the column count
+            # is checked once; each row then becomes exactly one dict.
+            if rows and len(field_names) != len(rows[0]):
+                 log.warning("Mismatch between field names (%d) and row values (%d). Skipping rows like: %s", len(field_names), len(rows[0]), rows[0])
+                 rows = []
+            results_list = [dict(zip(field_names, row)) for row in rows]
 
-            for row in results:
-                if len(field_names) != len(row):
-                     print(f"Warning: Mismatch between field names ({len(field_names)}) and row values ({len(row)}). Skipping row: {row}")
-                     continue
-                results_list.append(dict(zip(field_names, row)))
-
-            # print(f"Graph Query successful, fetched {len(results_list)} rows.") # Uncomment for verbose success logging
+            log.debug("Graph query successful, fetched %d rows.", len(results_list))
 
     except (exceptions.NotFound, exceptions.PermissionDenied, exceptions.InvalidArgument) as spanner_err:
         # InvalidArgument might occur if graph syntax is wrong or graph doesn't exist
-        print(f"Spanner Graph Query Error ({type(spanner_err).__name__}): {spanner_err}")
+        log.error("Spanner Graph Query Error (%s): %s", type(spanner_err).__name__, spanner_err)
         return None
     except Exception as e:
-        print(f"An unexpected error occurred during graph query execution or processing: {e}")
-        traceback.print_exc()
+        log.exception("An unexpected error occurred during graph query execution or processing: %s", e)
         return None
 
     return results_list
 
 
+def stream_graph_query(db_instance, graph_sql, params=None, param_types=None, expected_fields=None):
+    """
+    Executes a Spanner Graph Query and yields each row as a dict while the
+    result set streams in, so memory stays bounded by Spanner's partial
+    result batches rather than the full result.
+
+    Args are as for run_graph_query. Unlike run_graph_query, errors are raised
+    to the caller, since rows may already have been consumed.
+    """
+    if not db_instance:
+        raise ConnectionError("Database connection is not available.")
+    if not expected_fields:
+        raise ValueError("expected_fields must be provided to stream_graph_query.")
+
+    with db_instance.snapshot() as snapshot:
+        results = snapshot.execute_sql(
+            graph_sql,
+            params=params,
+            param_types=param_types
+        )
+        for row in results:
+            yield dict(zip(expected_fields, row))
+
+
 # --- Data Fetching Functions using Graph Queries ---
 
 def get_person_attended_events_json(db_instance, person_id):
@@ -118,39 +222,63 @@ def get_person_attended_events_json(db_instance, person_id):
     if not db_instance: return None
 
     # Graph Query: Find Person node, follow 'Attended' edge to Event node
+    # Timestamps are formatted as ISO 8601 (UTC) by Spanner, so rows arrive
+    # JSON-ready; the fixed-width UTC strings still sort chronologically.
     graph_sql = """
         Graph SocialGraph
         MATCH (p:Person)-[att:Attended]->(e:Event)
         WHERE p.person_id = @person_id
-        RETURN e.event_id, e.name, e.event_date, att.attendance_time
-        ORDER BY e.event_date DESC
+        RETURN e.event_id, e.name,
+               FORMAT_TIMESTAMP(@iso_format, e.event_date, 'UTC') AS event_date,
+               FORMAT_TIMESTAMP(@iso_format, att.attendance_time, 'UTC') AS attendance_time
+        ORDER BY event_date DESC
     """
-    params = {"person_id": person_id}
-    param_types_map = {"person_id": param_types.STRING}
+    params = {"person_id": person_id, "iso_format": ISO_TIMESTAMP_FORMAT}
+    param_types_map = {"person_id": param_types.STRING, "iso_format": param_types.STRING}
     fields = ["event_id", "name", "event_date", "attendance_time"] # Must match RETURN
 
-    results = run_graph_query(db_instance, graph_sql, params=params, param_types=param_types_map, expected_fields=fields)
-
-    if results is None:
-        return None
-
-    # Convert datetime objects to ISO format strings
-    for event in results:
-        if isinstance(event.get('event_date'), datetime):
-            event['event_date'] = event['event_date'].isoformat()
-        if isinstance(event.get('attendance_time'), datetime):
-            event['attendance_time'] = event['attendance_time'].isoformat()
-
-    return results
-
-
-def get_all_posts_json(db_instance, limit=100):
+    return _cached(_events_cache, person_id, lambda: run_graph_query(
+        db_instance, graph_sql, params=params, param_types=param_types_map, expected_fields=fields))
+
+
+# Graph Query: Find Person nodes that 'Wrote' a Post node
+_ALL_POSTS_GQL = """
+    Graph SocialGraph
+    MATCH (author:Person)-[w:Wrote]->(post:Post)
+    {where}
+    RETURN post.post_id, post.author_id, post.text, post.sentiment,
+           FORMAT_TIMESTAMP(@iso_format, post.post_timestamp, 'UTC') AS post_timestamp,
+           author.name AS author_name
+    ORDER BY post_timestamp DESC, post_id DESC
+    LIMIT @limit
+"""
+_POSTS_AFTER_FILTER = """WHERE post.post_timestamp < @after_ts
+       OR (post.post_timestamp = @after_ts AND post.post_id < @after_id)"""
+_POST_FIELDS = ["post_id", "author_id", "text", "sentiment", "post_timestamp", "author_name"] # Must match RETURN
+
+
+def _all_posts_query(limit, after, after_post_id):
+    params = {"limit": limit, "iso_format": ISO_TIMESTAMP_FORMAT}
+    param_types_map = {"limit": param_types.INT64, "iso_format": param_types.STRING}
+    if after is None or after_post_id is None:
+        return _ALL_POSTS_GQL.format(where=""), params, param_types_map
+    # `after` may be the ISO string from a previous page; Spanner parses it as a TIMESTAMP.
+    params.update(after_ts=after, after_id=after_post_id)
+    param_types_map.update(after_ts=param_types.TIMESTAMP, after_id=param_types.STRING)
+    return _ALL_POSTS_GQL.format(where=_POSTS_AFTER_FILTER), params, param_types_map
+
+
+def get_all_posts_json(db_instance, limit=100, after=None, after_post_id=None):
     """
     Fetches all available posts with author name using Graph Query.
 
     Args:
         db_instance: The Spanner database object.
         limit (int): Maximum number of posts to fetch.
+        after (str | datetime, optional): post_timestamp of the last post
+                                          already received, to fetch the next page.
+        after_post_id (str, optional): post_id of that same post, to break
+                                       ties on equal timestamps.
 
     Returns:
         list[dict] or None: List of post dictionaries with ISO date strings,
@@ -158,29 +286,19 @@ def get_all_posts_json(db_instance, limit=100):
     """
     if not db_instance: return None
 
-    # Graph Query: Find Person nodes that 'Wrote' a Post node
-    graph_sql = """
-        Graph SocialGraph
-        MATCH (author:Person)-[w:Wrote]->(post:Post)
-        RETURN post.post_id, post.author_id, post.text, post.sentiment, post.post_timestamp, author.name AS author_name
-        ORDER BY post.post_timestamp DESC
-        LIMIT @limit
-    """
-    params = {"limit": limit}
-    param_types_map = {"limit": param_types.INT64}
-    fields = ["post_id", "author_id", "text", "sentiment", "post_timestamp", "author_name"] # Must match RETURN
+    graph_sql, params, param_types_map = _all_posts_query(limit, after, after_post_id)
+    return _cached(_posts_cache, (limit, after, after_post_id), lambda: run_graph_query(
+        db_instance, graph_sql, params=params, param_types=param_types_map, expected_fields=_POST_FIELDS))
 
-    results = run_graph_query(db_instance, graph_sql, params=params, param_types=param_types_map, expected_fields=fields)
 
-    if results is None:
-        return None
-
-    # Convert datetime objects to ISO format strings
-    for post in results:
-        if isinstance(post.get('post_timestamp'), datetime):
-            post['post_timestamp'] = post['post_timestamp'].isoformat()
-
-    return results
+def iter_all_posts_json(db_instance, limit=100, after=None, after_post_id=None):
+    """
+    Streams posts with author name, one dict per row, for large limits
+    (e.g. exports) where get_all_posts_json would hold every row at once.
+    Results are not cached, and errors are raised rather than returned as None.
+    """
+    graph_sql, params, param_types_map = _all_posts_query(limit, after, after_post_id)
+    return stream_graph_query(db_instance, graph_sql, params=params, param_types=param_types_map, expected_fields=_POST_FIELDS)
 
 
 def get_person_friends_json(db_instance, person_id):
@@ -209,14 +327,15 @@ def get_person_friends_json(db_instance, person_id):
     param_types_map = {"person_id": param_types.STRING}
     fields = ["person_id", "name"] # Must match RETURN
 
-    results = run_graph_query(db_instance, graph_sql, params=params, param_types=param_types_map, expected_fields=fields)
-
     # No date conversion needed here
-    return results
+    return _cached(_friends_cache, person_id, lambda: run_graph_query(
+        db_instance, graph_sql, params=params, param_types=param_types_map, expected_fields=fields))
 
 
 # --- Example Usage (if run directly) ---
 if __name__ == "__main__":
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "WARNING").upper(),
+                        format="%(asctime)s %(levelname)s %(name)s %(message)s")
     if db:
         print("\n--- Testing Graph Data Fetching Functions ---")
 
@@ -226,21 +345,21 @@ if __name__ == "__main__":
         print(f"\n1. Fetching events attended by Person ID: {test_person_id}")
         attended_events = get_person_attended_events_json(db, test_person_id)
         if attended_events is not None:
-            print(json.dumps(attended_events, indent=2))
+            print(orjson.dumps(attended_events, option=orjson.OPT_INDENT_2).decode())
         else:
             print("Failed to fetch attended events.")
 
         print("\n2. Fetching all posts (limit 10)")
         all_posts = get_all_posts_json(db, limit=10)
         if all_posts is not None:
-            print(json.dumps(all_posts, indent=2))
+            print(orjson.dumps(all_posts, option=orjson.OPT_INDENT_2).decode())
         else:
             print("Failed to fetch all posts.")
 
         print(f"\n3. Fetching friends for Person ID: {test_person_id}")
         friends = get_person_friends_json(db, test_person_id)
         if friends is not None:
-            print(json.dumps(friends, indent=2))
+            print(orjson.dumps(friends, option=orjson.OPT_INDENT_2).decode())
         else:
             print("Failed to fetch friends.")
 
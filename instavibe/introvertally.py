@@ -1,63 +1,155 @@
 from vertexai import agent_engines
 from dotenv import load_dotenv
-import pprint
-import json 
+import logging
+import string
+import orjson
 import os
 
+from plan_json import JsonObjectScanner, strip_json_fence
+
 load_dotenv()
 
+# Prompts and per-event dumps are only formatted when DEBUG is enabled for
+# this logger; the streaming path otherwise does no console I/O.
+logger = logging.getLogger(__name__)
+
 ORCHESTRATE_AGENT_ID = os.environ.get('ORCHESTRATE_AGENT_ID')
 agent_engine = agent_engines.get(ORCHESTRATE_AGENT_ID)
 
+# Prompts are parsed once at import; each call only substitutes its values.
+_PLAN_PROMPT = string.Template("""Plan a personalized night out for ${user_name} with friends ${selected_friend_names_str} on ${planned_date}, with the location or preference being "${location_n_perference}".
 
-def call_agent_for_plan(user_name, planned_date, location_n_perference, selected_friend_names_list):
-    user_id = str(user_name)
-    # agent_thoughts_log = [] # No longer needed here, we yield directly
-
-    yield {"type": "thought", "data": f"--- IntrovertAlly Agent Call Initiated ---"}
-    yield {"type": "thought", "data": f"Session ID for this run: {user_id}"}
-    yield {"type": "thought", "data": f"User: {user_name}"}
-    yield {"type": "thought", "data": f"Planned Date: {planned_date}"}
-    yield {"type": "thought", "data": f"Location/Preference: {location_n_perference}"}
-    yield {"type": "thought", "data": f"Selected Friends: {', '.join(selected_friend_names_list)}"}
-    yield {"type": "thought", "data": f"Initiating plan for {user_name} on {planned_date} regarding '{location_n_perference}' with friends: {', '.join(selected_friend_names_list)}."}
-
-    selected_friend_names_str = ', '.join(selected_friend_names_list)
-    # print(f"Selected Friends (string for agent): {selected_friend_names_str}") # Console log
-
-    # Constructing an example for the prompt, e.g., ["Alice", "Bob"]
-    friends_list_example_for_prompt = json.dumps(selected_friend_names_list)
-
-    prompt_message = f"""Plan a personalized night out for {user_name} with friends {selected_friend_names_str} on {planned_date}, with the location or preference being "{location_n_perference}".
-
-    Analyze friend interests (if possible, use Instavibe profiles or summarized interests) to create a tailored plan.  Ensure the plan includes the date {planned_date}.
+    Analyze friend interests (if possible, use Instavibe profiles or summarized interests) to create a tailored plan.  Ensure the plan includes the date ${planned_date}.
 
     Output the entire plan in a SINGLE, COMPLETE JSON object with the following structure.  **CRITICAL: The FINAL RESPONSE MUST BE ONLY THIS JSON.  If any fields are missing or unavailable, INVENT them appropriately to complete the JSON structure.  Do not return any conversational text or explanations.  Just the raw, valid JSON.**
 
-    {{
-    "friends_name_list": {friends_list_example_for_prompt}, //  Array of strings: {selected_friend_names_str}
-    "event_name": "string",        // Concise, descriptive name for the event (e.g., "{selected_friend_names_str}'s Night Out")
-    "event_date": "{planned_date}", // Date in ISO 8601 format.
+    {
+    "friends_name_list": ${friends_list_example_for_prompt}, //  Array of strings: ${selected_friend_names_str}
+    "event_name": "string",        // Concise, descriptive name for the event (e.g., "${selected_friend_names_str}'s Night Out")
+    "event_date": "${planned_date}", // Date in ISO 8601 format.
     "event_description": "string", // Engaging summary of planned activities.
     "locations_and_activities": [  // Array detailing each step of the plan.
-        {{
+        {
         "name": "string",          // Name of the place, venue, or activity.
         "latitude": 12.345,        // Approximate latitude (e.g., 34.0522) or null if not available.
         "longitude": -67.890,      // Approximate longitude (e.g., -118.2437) or null if not available.
         "address": "string or null", // Physical address if available, otherwise null.
         "description": "string"    // Description of this location/activity.
-        }}
+        }
         // Add more location/activity objects as needed.
     ],
-    "post_to_go_out": "string"     // Short, catchy, and exciting text message from {user_name} to invite friends.
-    }}
+    "post_to_go_out": "string"     // Short, catchy, and exciting text message from ${user_name} to invite friends.
+    }
+    """)
+
+_POST_PROMPT = string.Template("""
+    You are an Orchestrator assistant for the Instavibe platform. User '${user_name}' has finalized an event plan and wants to:
+    1. Create the event on Instavibe.
+    2. Create an invite post for this event on Instavibe.
+
+    You have tools like `list_remote_agents` to discover available specialized agents and `send_task(agent_name: str, message: str)` to delegate tasks to them.
+    Your primary role is to understand the user's overall goal, identify the necessary steps, select the most appropriate remote agent(s) for those steps, and then send them clear instructions.
+
+    Confirmed Plan:
+    ```json
+    ${confirmed_plan_json}
+    ```
+
+    Invite Message (this is the exact text for the post content):
+    "${edited_invite_message}"
+
+    Your explicit tasks are, in this exact order:
+
+    TASK 1: Create the Event on Instavibe.
+    - First, identify a suitable remote agent that is capable of creating events on the Instavibe platform. You should use your `list_remote_agents` tool if you need to refresh your knowledge of available agents and their capabilities.
+    - Once you have selected an appropriate agent, you MUST use your tool to instruct that agent to create the event.
+    - The `message` you send to the agent for this task should be a clear, natural language instruction. This message MUST include all necessary details for event creation, derived from the "Confirmed Plan" JSON:
+        - Event Name: "${event_name}"
+        - Event Description: "${event_description}"
+        - Event Date: "${event_date}" (ensure this is in a standard date/time format like ISO 8601)
+        - Locations: ${locations_json} (describe these locations clearly to the agent)
+        - Attendees: ${attendees_json} (this list includes the user '${user_name}' and their friends)
+    - Narrate your thought process: which agent you are selecting (or your criteria if you can't name it), and the natural language message you are formulating for the tool to create the event.
+    - After the  tool call is complete, briefly acknowledge its success based on the tool's response.
+
+    TASK 2: Create the Invite Post on Instavibe.
+    - Only after TASK 1 (event creation) is confirmed as  successful, you MUST use your tool again.
+    - The `message` you send to the agent for this task should be a clear, natural language instruction to create a post. This message MUST include:
+        - The author of the post: "${user_name}"
+        - The content of the post: The "Invite Message" provided above ("${edited_invite_message}")
+        - An instruction to associate this post with the event created in TASK 1 (e.g., by referencing its name: "${event_name}").
+        - Indicate the sentiment is "positive" as it's an invitation.
+    - Narrate the natural language message you are formulating for the `send_task` tool to create the post.
+    - After the `send_task` tool call is (simulated as) complete, briefly acknowledge its success.
+
+    IMPORTANT INSTRUCTIONS FOR YOUR BEHAVIOR:
+    - Your primary role here is to orchestrate these two actions by selecting an appropriate remote agent and sending it clear, natural language instructions via your  tool.
+    - Your responses during this process should be a stream of consciousness, primarily narrating your agent selection (if applicable), the formulation of your natural language messages for , and theiroutcomes.
+    - Do NOT output any JSON yourself. Your output must be plain text only, describing your actions.
+    - Conclude with a single, friendly success message confirming that you have (simulated) instructing the remote agent to create both the event and the post. For example: "Alright, I've instructed the appropriate Instavibe agent to create the event '${event_name}' and to make the invite post for ${user_name}!"
+
+    """)
+
+
+def _iter_parts(event):
+    """
+    Yields (kind, value) pairs for the text, tool_code and tool_code_output
+    entries of an agent event's content parts. Content may be a dict with
+    'parts', a bare list of parts, or missing.
     """
+    content = event.get('content')
+    if content.__class__ is dict:
+        parts = content.get('parts') or ()
+    elif content.__class__ is list:
+        parts = content
+    else:
+        return
+    for part in parts:
+        if part.__class__ is not dict:
+            continue
+        text = part.get('text')
+        if text:
+            yield 'text', text
+            continue
+        tool_code = part.get('tool_code')
+        if tool_code:
+            yield 'tool_code', tool_code
+        tool_code_output = part.get('tool_code_output')
+        if tool_code_output:
+            yield 'tool_code_output', tool_code_output
+
+
+def call_agent_for_plan(user_name, planned_date, location_n_perference, selected_friend_names_list):
+    user_id = str(user_name)
+    # agent_thoughts_log = [] # No longer needed here, we yield directly
+
+    selected_friend_names_str = ', '.join(selected_friend_names_list)
+
+    # The request details are narrated once; the UI shows each thought as a line.
+    yield {"type": "thought", "data": f"--- IntrovertAlly Agent Call Initiated ---"}
+    yield {"type": "thought", "data": f"Initiating plan for {user_name} (session {user_id}) on {planned_date} regarding '{location_n_perference}' with friends: {selected_friend_names_str}."}
+
+    # Constructing an example for the prompt, e.g., ["Alice", "Bob"]
+    friends_list_example_for_prompt = orjson.dumps(selected_friend_names_list).decode()
+
+    prompt_message = _PLAN_PROMPT.substitute(
+        user_name=user_name,
+        selected_friend_names_str=selected_friend_names_str,
+        planned_date=planned_date,
+        location_n_perference=location_n_perference,
+        friends_list_example_for_prompt=friends_list_example_for_prompt,
+    )
 
-    print(f"--- Sending Prompt to Agent ---") 
-    print(prompt_message) 
+    logger.debug("Sending prompt to agent:\n%s", prompt_message)
     yield {"type": "thought", "data": f"Sending detailed planning prompt to agent for {user_name}'s event."}
 
-    accumulated_json_str = ""
+    # Text parts are collected and joined once; the scanner spots the plan
+    # object as soon as it closes so the UI gets it without waiting for the
+    # rest of the agent stream.
+    text_chunks = []
+    scanner = JsonObjectScanner()
+    final_result_json = None
+    tool_name = 'Unnamed tool'
 
     yield {"type": "thought", "data": f"--- Agent Response Stream Starting ---"}
     try:
@@ -67,55 +159,62 @@ def call_agent_for_plan(user_name, planned_date, location_n_perference, selected
                 message=prompt_message,
             )
         ):
-            print(f"\n--- Event {event_idx} Received ---") # Console
-            pprint.pprint(event) # Console
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Event %d received: %r", event_idx, event)
             try:
-                content = event.get('content', {})
-                parts = content.get('parts', [])
-                
-                if not parts:
-                    pass # Avoid too much noise for empty events
-                for part_idx, part in enumerate(parts):
-                    if isinstance(part, dict):
-                        text = part.get('text')
-                        if text:
-                            yield {"type": "thought", "data": f"Agent: \"{text}\""}
-                            accumulated_json_str += text
-                        else:
-                            tool_code = part.get('tool_code')
-                            tool_code_output = part.get('tool_code_output')
-                            if tool_code:
-                                yield {"type": "thought", "data": f"Agent is considering using a tool: {tool_code.get('name', 'Unnamed tool')}."}
-                            if tool_code_output:
-                                yield {"type": "thought", "data": f"Agent received output from tool '{tool_code.get('name', 'Unnamed tool')}'."}
+                for kind, value in _iter_parts(event):
+                    if kind == 'text':
+                        yield {"type": "thought", "data": f"Agent: \"{value}\""}
+                        text_chunks.append(value)
+                        if scanner is not None:
+                            candidate = scanner.feed(value)
+                            # Each location is shown as soon as its object closes,
+                            # ahead of the complete plan.
+                            for item in scanner.pop_items():
+                                try:
+                                    yield {"type": "plan_partial", "data": {"location": orjson.loads(item)}}
+                                except orjson.JSONDecodeError:
+                                    pass
+                            if candidate is not None:
+                                try:
+                                    final_result_json = orjson.loads(candidate)
+                                except orjson.JSONDecodeError:
+                                    # Not the plan after all; fall back to parsing the full response.
+                                    scanner = None
+                                if final_result_json is not None:
+                                    break
+                    elif kind == 'tool_code':
+                        tool_name = value.get('name', 'Unnamed tool')
+                        yield {"type": "thought", "data": f"Agent is considering using a tool: {tool_name}."}
+                    else:
+                        yield {"type": "thought", "data": f"Agent received output from tool '{tool_name}'."}
             except Exception as e_inner:
                 yield {"type": "thought", "data": f"Error processing agent event part {event_idx}: {str(e_inner)}"}
+            if final_result_json is not None:
+                # The plan object is closed; stop reading the agent stream early.
+                break
 
     except Exception as e_outer:
         yield {"type": "thought", "data": f"Critical error during agent stream query: {str(e_outer)}"}
-        yield {"type": "error", "data": {"message": f"Error during agent interaction: {str(e_outer)}", "raw_output": accumulated_json_str}}
+        yield {"type": "error", "data": {"message": f"Error during agent interaction: {str(e_outer)}", "raw_output": "".join(text_chunks)}}
         return # Stop generation
     
     yield {"type": "thought", "data": f"--- End of Agent Response Stream ---"}
 
+    if final_result_json is not None:
+        yield {"type": "plan_complete", "data": final_result_json}
+        return
+
+    accumulated_json_str = "".join(text_chunks)
+
     # Attempt to extract JSON if it's wrapped in markdown
-    if "```json" in accumulated_json_str:
-        print("Detected JSON in markdown code block. Extracting...") 
-       
-        try:
-            # Extract content between ```json and ```
-            json_block = accumulated_json_str.split("```json", 1)[1].rsplit("```", 1)[0].strip()
-            accumulated_json_str = json_block
-            print(f"Extracted JSON block: {accumulated_json_str}") 
-        except IndexError:
-            # print("Error extracting JSON from markdown block. Will try to parse as is.") # Console
-            yield {"type": "thought", "data": "Could not extract JSON from markdown block, will attempt to parse the full response."}
+    accumulated_json_str = strip_json_fence(accumulated_json_str)
 
     if accumulated_json_str:
         try:
-            final_result_json = json.loads(accumulated_json_str)
+            final_result_json = orjson.loads(accumulated_json_str)
             yield {"type": "plan_complete", "data": final_result_json}
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             # print(f"Error decoding accumulated string as JSON: {e}") # Console
             yield {"type": "thought", "data": f"Failed to parse the agent's output as a valid plan. Error: {e}"}
             yield {"type": "thought", "data": f"Raw output received: {accumulated_json_str}"}
@@ -140,58 +239,22 @@ def post_plan_event(user_name, confirmed_plan, edited_invite_message, agent_sess
     yield {"type": "thought", "data": f"Received Invite Message: {edited_invite_message[:100]}..."} # Log a preview
     yield {"type": "thought", "data": f"Initiating process to post event and invite for {user_name}."}
 
-    prompt_message = f"""
-    You are an Orchestrator assistant for the Instavibe platform. User '{user_name}' has finalized an event plan and wants to:
-    1. Create the event on Instavibe.
-    2. Create an invite post for this event on Instavibe.
-
-    You have tools like `list_remote_agents` to discover available specialized agents and `send_task(agent_name: str, message: str)` to delegate tasks to them.
-    Your primary role is to understand the user's overall goal, identify the necessary steps, select the most appropriate remote agent(s) for those steps, and then send them clear instructions.
-
-    Confirmed Plan:
-    ```json
-    {json.dumps(confirmed_plan, indent=2)}
-    ```
-
-    Invite Message (this is the exact text for the post content):
-    "{edited_invite_message}"
-
-    Your explicit tasks are, in this exact order:
-
-    TASK 1: Create the Event on Instavibe.
-    - First, identify a suitable remote agent that is capable of creating events on the Instavibe platform. You should use your `list_remote_agents` tool if you need to refresh your knowledge of available agents and their capabilities.
-    - Once you have selected an appropriate agent, you MUST use your tool to instruct that agent to create the event.
-    - The `message` you send to the agent for this task should be a clear, natural language instruction. This message MUST include all necessary details for event creation, derived from the "Confirmed Plan" JSON:
-        - Event Name: "{confirmed_plan.get('event_name', 'Unnamed Event')}"
-        - Event Description: "{confirmed_plan.get('event_description', 'No description provided.')}"
-        - Event Date: "{confirmed_plan.get('event_date', 'MISSING_EVENT_DATE_IN_PLAN')}" (ensure this is in a standard date/time format like ISO 8601)
-        - Locations: {json.dumps(confirmed_plan.get('locations_and_activities', []))} (describe these locations clearly to the agent)
-        - Attendees: {json.dumps(list(set(confirmed_plan.get('friends_name_list', []) + [user_name])))} (this list includes the user '{user_name}' and their friends)
-    - Narrate your thought process: which agent you are selecting (or your criteria if you can't name it), and the natural language message you are formulating for the tool to create the event.
-    - After the  tool call is complete, briefly acknowledge its success based on the tool's response.
-
-    TASK 2: Create the Invite Post on Instavibe.
-    - Only after TASK 1 (event creation) is confirmed as  successful, you MUST use your tool again.
-    - The `message` you send to the agent for this task should be a clear, natural language instruction to create a post. This message MUST include:
-        - The author of the post: "{user_name}"
-        - The content of the post: The "Invite Message" provided above ("{edited_invite_message}")
-        - An instruction to associate this post with the event created in TASK 1 (e.g., by referencing its name: "{confirmed_plan.get('event_name', 'Unnamed Event')}").
-        - Indicate the sentiment is "positive" as it's an invitation.
-    - Narrate the natural language message you are formulating for the `send_task` tool to create the post.
-    - After the `send_task` tool call is (simulated as) complete, briefly acknowledge its success.
-
-    IMPORTANT INSTRUCTIONS FOR YOUR BEHAVIOR:
-    - Your primary role here is to orchestrate these two actions by selecting an appropriate remote agent and sending it clear, natural language instructions via your  tool.
-    - Your responses during this process should be a stream of consciousness, primarily narrating your agent selection (if applicable), the formulation of your natural language messages for , and theiroutcomes.
-    - Do NOT output any JSON yourself. Your output must be plain text only, describing your actions.
-    - Conclude with a single, friendly success message confirming that you have (simulated) instructing the remote agent to create both the event and the post. For example: "Alright, I've instructed the appropriate Instavibe agent to create the event '{confirmed_plan.get('event_name', 'Unnamed Event')}' and to make the invite post for {user_name}!"
-
-    """
+    # Attendees are de-duplicated in order so the same plan always yields the same prompt.
+    prompt_message = _POST_PROMPT.substitute(
+        user_name=user_name,
+        confirmed_plan_json=orjson.dumps(confirmed_plan, option=orjson.OPT_INDENT_2).decode(),
+        edited_invite_message=edited_invite_message,
+        event_name=confirmed_plan.get('event_name', 'Unnamed Event'),
+        event_description=confirmed_plan.get('event_description', 'No description provided.'),
+        event_date=confirmed_plan.get('event_date', 'MISSING_EVENT_DATE_IN_PLAN'),
+        locations_json=orjson.dumps(confirmed_plan.get('locations_and_activities', [])).decode(),
+        attendees_json=orjson.dumps(list(dict.fromkeys([*confirmed_plan.get('friends_name_list', []), user_name]))).decode(),
+    )
 
     yield {"type": "thought", "data": f"Sending posting instructions to agent for {user_name}'s event."}
-    print(f"prompt_message: {prompt_message}") 
+    logger.debug("prompt_message: %s", prompt_message)
     
-    accumulated_response_text = ""
+    response_chunks = []
 
     try:
         for event_idx, event in enumerate(
@@ -200,24 +263,20 @@ def post_plan_event(user_name, confirmed_plan, edited_invite_message, agent_sess
             message=prompt_message,
         )
         ):
-            print(f"\n--- Post Event - Agent Event {event_idx} Received ---") # Console
-            pprint.pprint(event) # Console
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Post event - agent event %d received: %r", event_idx, event)
             try:
-                content = event.get('content', {})
-                parts = content.get('parts', [])
-                for part_idx, part in enumerate(parts):
-                    if isinstance(part, dict):
-                        text = part.get('text')
-                        if text:
-                            yield {"type": "thought", "data": f"Agent: \"{text}\""}
-                            accumulated_response_text += text
-                        # We don't expect tool calls here for this simulation
+                for kind, value in _iter_parts(event):
+                    if kind == 'text':
+                        yield {"type": "thought", "data": f"Agent: \"{value}\""}
+                        response_chunks.append(value)
+                    # We don't expect tool calls here for this simulation
             except Exception as e_inner:
                 yield {"type": "thought", "data": f"Error processing agent event part {event_idx} during posting: {str(e_inner)}"}
 
     except Exception as e_outer:
         yield {"type": "thought", "data": f"Critical error during agent stream query for posting: {str(e_outer)}"}
-        yield {"type": "error", "data": {"message": f"Error during agent interaction for posting: {str(e_outer)}", "raw_output": accumulated_response_text}}
+        yield {"type": "error", "data": {"message": f"Error during agent interaction for posting: {str(e_outer)}", "raw_output": "".join(response_chunks)}}
         return # Stop generation if there's a major error
 
     yield {"type": "thought", "data": f"--- End of Agent Response Stream for Posting ---"}
@@ -0,0 +1,115 @@
+"""
+Helpers for pulling the plan JSON out of the orchestrator's text stream.
+
+Shared by the web app (introvertally.py) and the introvert-ally Cloud
+Function, which links this file into its own source directory.
+"""
+
+_FENCE = "```json"
+
+
+def strip_json_fence(text):
+    """
+    Returns the body of a ```json ... ``` block, up to the last closing
+    fence (or the end of the text if it is unclosed). Text that already
+    starts as raw JSON is returned without scanning for a fence.
+    """
+    if text.lstrip()[:1] in ('{', '['):
+        return text
+    _, fence, rest = text.partition(_FENCE)
+    if not fence:
+        return text
+    body, closing, _ = rest.rpartition("```")
+    return (body if closing else rest).strip()
+
+
+class JsonObjectScanner:
+    """
+    Finds the plan object in text fed chunk by chunk, mirroring
+    strip_json_fence: the object must either open the response or follow a
+    ```json fence, so braces in the agent's narration are never taken as the
+    plan. Braces inside strings are ignored. Objects nested one level down
+    (the plan's locations_and_activities entries) are collected as they
+    close; see pop_items().
+
+    A response with JSON elsewhere is left to the caller's full-text parse
+    once the stream ends.
+    """
+
+    def __init__(self):
+        self._head = "" # Text seen before the object starts
+        self._raw_possible = True # Nothing but whitespace seen so far
+        self._parts = []
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._item_parts = None # Text of the nested object being read, if any
+        self._items = []
+
+    def pop_items(self):
+        """Returns the text of nested objects closed since the last call."""
+        items, self._items = self._items, []
+        return items
+
+    def _find_start(self, text):
+        """Returns the text from the object's opening brace, or None if it has not appeared yet."""
+        head = self._head + text
+        if self._raw_possible:
+            stripped = head.lstrip()
+            if not stripped:
+                self._head = head
+                return None
+            if stripped[0] == '{':
+                self._head = ""
+                return stripped
+            self._raw_possible = False
+        fence = head.find(_FENCE)
+        if fence < 0:
+            # Keep just enough to spot a fence split across chunks.
+            self._head = head[-(len(_FENCE) - 1):]
+            return None
+        brace = head.find('{', fence + len(_FENCE))
+        if brace < 0:
+            self._head = head[fence:]
+            return None
+        self._head = ""
+        return head[brace:]
+
+    def feed(self, text):
+        """Returns the object's text once it closes, otherwise None."""
+        if not self._started:
+            text = self._find_start(text)
+            if text is None:
+                return None
+            self._started = True
+        item_from = 0
+        for i in range(len(text)):
+            ch = text[i]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == '\\':
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == '{':
+                self._depth += 1
+                if self._depth == 2:
+                    self._item_parts = []
+                    item_from = i
+            elif ch == '}':
+                if self._depth == 2 and self._item_parts is not None:
+                    self._item_parts.append(text[item_from:i + 1])
+                    self._items.append("".join(self._item_parts))
+                    self._item_parts = None
+                self._depth -= 1
+                if self._depth == 0:
+                    self._parts.append(text[:i + 1])
+                    return "".join(self._parts)
+        self._parts.append(text)
+        if self._item_parts is not None:
+            self._item_parts.append(text[item_from:])
+        return None
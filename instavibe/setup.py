@@ -1,10 +1,10 @@
 import os
 import uuid
 from datetime import datetime, timedelta, timezone
-from dateutil import parser as dateutil_parser
 import time
 
 from google.cloud import spanner
+from google.cloud.spanner_v1 import param_types
 from google.api_core import exceptions
 
 # --- Configuration ---
@@ -12,6 +12,10 @@ INSTANCE_ID = os.environ.get("SPANNER_INSTANCE_ID","instavibe-graph-instance")
 DATABASE_ID = os.environ.get("SPANNER_DATABASE_ID","graphdb")
 
 PROJECT_ID = os.environ.get("GOOGLE_CLOUD_PROJECT")
+# Mutation budget per commit. Spanner caps a commit at 80,000 mutations (one per
+# inserted cell, plus secondary index entries), so the default leaves headroom
+# for the indexes. The seed set fits in one commit; only larger loads are split.
+MAX_COMMIT_MUTATIONS = max(1, int(os.environ.get("SPANNER_MAX_COMMIT_MUTATIONS", "40000")))
 
 # --- Spanner Client Initialization ---
 try:
@@ -36,11 +40,7 @@ def run_ddl_statements(db_instance, ddl_list, operation_description):
     if not db_instance:
         print(f"Skipping DDL ({operation_description}) - database connection not available.")
         return False
-    print(f"\n--- Running DDL: {operation_description} ---")
-    print("Statements:")
-    # Print statements cleanly
-    for i, stmt in enumerate(ddl_list):
-        print(f"  [{i+1}] {stmt.strip()}") # Add numbering for clarity
+    print(f"\n--- Running DDL: {operation_description} ({len(ddl_list)} statements) ---")
     try:
         operation = db_instance.update_ddl(ddl_list)
         print("Waiting for DDL operation to complete...")
@@ -66,10 +66,15 @@ def run_ddl_statements(db_instance, ddl_list, operation_description):
         print("Stopping script due to unexpected DDL error.")
         return False
 
-def setup_base_schema_and_indexes(db_instance):
-    """Creates the base relational tables and associated indexes."""
+def setup_base_schema(db_instance):
+    """
+    Creates the base relational tables and the property graph over them in a
+    single schema update, so the script waits on one long-running operation
+    instead of two. Secondary indexes are added by setup_indexes after the
+    data load.
+    """
     ddl_statements = [
-        # --- 1. Base Tables (No Graph Definition Here) ---
+        # --- Base Tables (the graph definition is appended below) ---
         """
         CREATE TABLE IF NOT EXISTS Person (
             person_id STRING(36) NOT NULL,
@@ -138,83 +143,352 @@ def setup_base_schema_and_indexes(db_instance):
             CONSTRAINT FK_Location FOREIGN KEY (location_id) REFERENCES Location (location_id)
         ) PRIMARY KEY (event_id, location_id)
         """,
-        # --- 2. Indexes ---
+    ]
+    return run_ddl_statements(db_instance, ddl_statements + GRAPH_DDL, "Create Base Tables and Property Graph")
+
+def setup_indexes(db_instance):
+    """
+    Creates the secondary indexes. Run after insert_relational_data so each
+    index is backfilled once over the loaded rows rather than maintained on
+    every insert mutation.
+    """
+    ddl_statements = [
         "CREATE INDEX IF NOT EXISTS PersonByName ON Person(name)",
         "CREATE INDEX IF NOT EXISTS EventByDate ON Event(event_date DESC)",
-        "CREATE INDEX IF NOT EXISTS PostByTimestamp ON Post(post_timestamp DESC)",
-        "CREATE INDEX IF NOT EXISTS PostByAuthor ON Post(author_id, post_timestamp DESC)",
+        # Stores the feed columns so the newest-posts scan never touches the base table.
+        "CREATE INDEX IF NOT EXISTS PostByTimestamp ON Post(post_timestamp DESC) STORING (author_id, text, sentiment)",
+        # Stores the profile columns so a person's posts are read from the index alone.
+        "CREATE INDEX IF NOT EXISTS PostByAuthor ON Post(author_id, post_timestamp DESC) STORING (text, sentiment)",
         "CREATE INDEX IF NOT EXISTS FriendshipByPersonB ON Friendship(person_id_b, person_id_a)",
         "CREATE INDEX IF NOT EXISTS AttendanceByEvent ON Attendance(event_id, person_id)",
         "CREATE INDEX IF NOT EXISTS MentionByPerson ON Mention(mentioned_person_id, post_id)",
         "CREATE INDEX IF NOT EXISTS EventLocationByLocationId ON EventLocation(location_id, event_id)", # Index for linking table
-
     ]
-    return run_ddl_statements(db_instance, ddl_statements, "Create Base Tables and Indexes")
-
-# --- NEW: Function to create the property graph ---
-def setup_graph_definition(db_instance):
-    """Creates the Property Graph definition based on existing tables."""
-    # NOTE: Graph name cannot contain hyphens if unquoted. Using SocialGraph.
+    if not run_ddl_statements(db_instance, ddl_statements, "Create Secondary Indexes"):
+        return False
+    return add_missing_stored_columns(db_instance)
+
+# STORING columns each index should have. CREATE INDEX IF NOT EXISTS leaves an
+# index created by an older version of this script untouched, so missing
+# columns are added with ALTER INDEX instead.
+INDEX_STORED_COLUMNS = {
+    "PostByTimestamp": ("author_id", "text", "sentiment"),
+    "PostByAuthor": ("text", "sentiment"),
+}
+
+def add_missing_stored_columns(db_instance):
+    """Adds any INDEX_STORED_COLUMNS entries that existing indexes do not store yet."""
+    # Stored (non-key) index columns have a NULL ORDINAL_POSITION.
+    with db_instance.snapshot() as snapshot:
+        rows = snapshot.execute_sql(
+            "SELECT INDEX_NAME, COLUMN_NAME FROM INFORMATION_SCHEMA.INDEX_COLUMNS "
+            "WHERE TABLE_SCHEMA = '' AND ORDINAL_POSITION IS NULL AND INDEX_NAME IN UNNEST(@names)",
+            params={"names": list(INDEX_STORED_COLUMNS)},
+            param_types={"names": param_types.Array(param_types.STRING)},
+        )
+        stored = {(index_name, column_name) for index_name, column_name in rows}
     ddl_statements = [
-        # --- Create the Property Graph Definition (Using SOURCE/DESTINATION) ---
-        # "DROP PROPERTY GRAPH IF EXISTS SocialGraph", # Optional for dev
-        """
-        CREATE PROPERTY GRAPH IF NOT EXISTS SocialGraph
-          NODE TABLES (
-            Person KEY (person_id),
-            Event KEY (event_id),
-            Post KEY (post_id),
-            Location KEY (location_id) -- New Node Table
-          )
-          EDGE TABLES (
-            Friendship 
-              SOURCE KEY (person_id_a) REFERENCES Person (person_id)
-              DESTINATION KEY (person_id_b) REFERENCES Person (person_id),
-
-            
-            Attendance AS Attended 
-              SOURCE KEY (person_id) REFERENCES Person (person_id)
-              DESTINATION KEY (event_id) REFERENCES Event (event_id),
-
-            
-            Mention AS Mentioned
-              SOURCE KEY (post_id) REFERENCES Post (post_id)
-              DESTINATION KEY (mentioned_person_id) REFERENCES Person (person_id),
-
-            
-            Post AS Wrote 
-              SOURCE KEY (author_id) REFERENCES Person (person_id)
-              DESTINATION KEY (post_id) REFERENCES Post (post_id),
-
-            EventLocation AS HasLocation -- New Edge Table
-              SOURCE KEY (event_id) REFERENCES Event (event_id)
-              DESTINATION KEY (location_id) REFERENCES Location (location_id)
-          )
-        """
+        f"ALTER INDEX {index_name} ADD STORED COLUMN {column_name}"
+        for index_name, columns in INDEX_STORED_COLUMNS.items()
+        for column_name in columns
+        if (index_name, column_name) not in stored
     ]
-    return run_ddl_statements(db_instance, ddl_statements, "Create Property Graph Definition")
+    if not ddl_statements:
+        print("Index STORING columns are up to date.")
+        return True
+    return run_ddl_statements(db_instance, ddl_statements, "Add Missing Index STORING Columns")
+
+# --- Property Graph definition over the base tables ---
+# NOTE: Graph name cannot contain hyphens if unquoted. Using SocialGraph.
+GRAPH_DDL = [
+    # --- Create the Property Graph Definition (Using SOURCE/DESTINATION) ---
+    # "DROP PROPERTY GRAPH IF EXISTS SocialGraph", # Optional for dev
+    """
+    CREATE PROPERTY GRAPH IF NOT EXISTS SocialGraph
+      NODE TABLES (
+        Person KEY (person_id),
+        Event KEY (event_id),
+        Post KEY (post_id),
+        Location KEY (location_id) -- New Node Table
+      )
+      EDGE TABLES (
+        Friendship 
+          SOURCE KEY (person_id_a) REFERENCES Person (person_id)
+          DESTINATION KEY (person_id_b) REFERENCES Person (person_id),
+
+        
+        Attendance AS Attended 
+          SOURCE KEY (person_id) REFERENCES Person (person_id)
+          DESTINATION KEY (event_id) REFERENCES Event (event_id),
+
+        
+        Mention AS Mentioned
+          SOURCE KEY (post_id) REFERENCES Post (post_id)
+          DESTINATION KEY (mentioned_person_id) REFERENCES Person (person_id),
+
+        
+        Post AS Wrote 
+          SOURCE KEY (author_id) REFERENCES Person (person_id)
+          DESTINATION KEY (post_id) REFERENCES Post (post_id),
+
+        EventLocation AS HasLocation -- New Edge Table
+          SOURCE KEY (event_id) REFERENCES Event (event_id)
+          DESTINATION KEY (location_id) REFERENCES Location (location_id)
+      )
+    """
+]
 
     
 
+# Seed posts: (person, text, sentiment, mention, days_ago, hours_ago)
+POSTS_DATA = (
+    ("Alice", "Great discussion at the AI meetup! Learned so much.", "positive", "Ethan", 5, 8),
+    ("Alice", "Feeling the pressure for this project deadline. Need more coffee.", "negative", None, 1, 2),
+    ("Alice", "The bake sale was fun! Happy to support a good cause.", "positive", "Hannah", 6, 2),
+    ("Alice", "Trying out a new vegetarian chili recipe tonight.", "neutral", None, 0, 3),
+    ("Alice", "Weekend coding session in progress. Making headway!", "positive", None, 2, 10),
+    ("Alice", "Anyone read any good non-fiction lately? Looking for recommendations.", "neutral", "Bob", 8, 5),
+    ("Alice", "Reflecting on the AI ethics panel from the meetup. Important stuff.", "neutral", None, 4, 15),
+    ("Alice", "My basil plant is thriving! Small victories.", "positive", None, 3, 9),
+    ("Alice", "Ugh, debugging this legacy code is painful.", "negative", None, 7, 6),
+    ("Alice", "Planning a weekend hike if the weather holds up.", "positive", "Charlie", 1, 18),
+    ("Alice", "Discovered a great new podcast about behavioral economics.", "positive", None, 10, 11),
+    ("Alice", "Just finished 'Klara and the Sun'. Beautifully written.", "positive", "Fiona", 9, 14),
+    ("Alice", "Why is finding a good plumber so difficult?", "negative", None, 12, 7),
+    ("Alice", "Contemplating a career shift... maybe something more creative?", "neutral", None, 11, 20),
+    ("Alice", "Made some progress on my Spanish lessons today!", "positive", None, 0, 8),
+    ("Bob", "Lovely picnic today! Perfect weather and company.", "positive", "Diana", 4, 2),
+    ("Bob", "Ugh, the traffic this morning was brutal.", "negative", None, 1, 14),
+    ("Bob", "Just finished reading 'Project Hail Mary'. Absolutely fantastic!", "positive", None, 0, 5),
+    ("Bob", "The bake sale goodies were delicious! Thanks @Alice!", "positive", "Alice", 6, 1),
+    ("Bob", "Trying to get back into a regular workout routine.", "neutral", None, 2, 12),
+    ("Bob", "Anyone have tips for dealing with noisy upstairs neighbors?", "negative", None, 9, 6),
+    ("Bob", "Exploring the new exhibit at the art museum this weekend.", "positive", "Ian", 3, 19),
+    ("Bob", "That feeling when your code compiles on the first try!", "positive", None, 7, 11),
+    ("Bob", "Thinking about the philosophical implications of the simulation hypothesis.", "neutral", None, 11, 8),
+    ("Bob", "Made homemade pizza tonight. Success!", "positive", None, 0, 2),
+    ("Bob", "Why does laundry pile up so fast?", "negative", None, 5, 16),
+    ("Bob", "Looking forward to the long weekend.", "positive", None, 10, 9),
+    ("Bob", "Discovered a hidden gem of a bookstore downtown.", "positive", None, 13, 13),
+    ("Bob", "Trying to learn basic Japanese. It's harder than it looks!", "neutral", None, 8, 17),
+    ("Bob", "Sometimes a simple walk in the park is all you need.", "positive", None, 1, 7),
+    ("Charlie", "Mind blown by the possibilities discussed at the AI meetup.", "positive", "Ethan", 5, 7),
+    ("Charlie", "Trying out that new Italian place downtown tonight.", "neutral", "Diana", 0, 4),
+    ("Charlie", "Finally finished the presentation deck. Relief!", "positive", None, 2, 6),
+    ("Charlie", "Weekend project: building a birdhouse.", "positive", None, 3, 11),
+    ("Charlie", "Is it just me, or are streaming service interfaces getting worse?", "negative", None, 8, 9),
+    ("Charlie", "Enjoying a quiet morning with coffee and the newspaper.", "positive", None, 1, 15),
+    ("Charlie", "Thinking about the future of remote work.", "neutral", None, 10, 12),
+    ("Charlie", "That AI meetup really sparked some ideas for my own work.", "positive", "Alice", 4, 14),
+    ("Charlie", "My attempt at sourdough bread was... interesting. Need practice.", "neutral", None, 6, 10),
+    ("Charlie", "Looking for recommendations for a good tailor.", "neutral", None, 12, 8),
+    ("Charlie", "The fall colors are starting to show. Beautiful time of year.", "positive", None, 7, 13),
+    ("Charlie", "Frustrated with customer service hold times today.", "negative", None, 1, 5),
+    ("Charlie", "Planning a visit to see family next month.", "positive", None, 9, 16),
+    ("Charlie", "Re-watching 'The Office' for the nth time. Still hilarious.", "positive", None, 13, 7),
+    ("Charlie", "Contemplating the ethics of data privacy in modern apps.", "neutral", None, 11, 19),
+    ("Diana", "That indie film was so moving. Highly recommend 'The Lighthouse Keeper'.", "positive", "Hannah", 3, 10),
+    ("Diana", "Can this rain stop already? My plants are drowning.", "negative", None, 1, 10),
+    ("Diana", "The picnic @Bob organized was lovely! So relaxing.", "positive", "Bob", 4, 1),
+    ("Diana", "Trying to declutter my apartment. It's a slow process.", "neutral", None, 2, 8),
+    ("Diana", "Excited to try the Italian place @Charlie mentioned!", "positive", "Charlie", 0, 2),
+    ("Diana", "Feeling creatively inspired after visiting the gallery.", "positive", None, 7, 14),
+    ("Diana", "My favorite coffee shop changed their beans. Not sure how I feel.", "negative", None, 9, 12),
+    ("Diana", "Working on my pottery skills. Made a slightly lopsided bowl!", "positive", "Fiona", 6, 7),
+    ("Diana", "Does anyone else find online meetings exhausting?", "negative", None, 11, 6),
+    ("Diana", "Planning a weekend trip to the coast soon.", "positive", None, 10, 15),
+    ("Diana", "Just finished a challenging puzzle. So satisfying!", "positive", None, 5, 9),
+    ("Diana", "Thinking about volunteering at the animal shelter.", "positive", None, 13, 11),
+    ("Diana", "Why are Mondays always so... Monday-ish?", "negative", None, 8, 13),
+    ("Diana", "Enjoying the simple pleasure of a good cup of tea.", "positive", None, 0, 6),
+    ("Diana", "The film screening had such a great Q&A session afterwards.", "positive", "Kevin", 3, 5),
+    ("Ethan", "The potluck was delicious! So many amazing dishes.", "positive", "George", 2, 5),
+    ("Ethan", "Feeling stressed about my presentation tomorrow. Wish me luck!", "negative", None, 0, 12),
+    ("Ethan", "Anyone else find prompt engineering fascinating? #AI", "neutral", "Alice", 4, 10),
+    ("Ethan", "Great points at the AI meetup, @Charlie!", "positive", "Charlie", 5, 6),
+    ("Ethan", "Weekend hike was invigorating! Much needed nature time.", "positive", None, 3, 14),
+    ("Ethan", "My internet connection has been so unstable lately.", "negative", None, 1, 9),
+    ("Ethan", "Trying to learn Python for data analysis. Steep learning curve!", "neutral", None, 8, 11),
+    ("Ethan", "Nice catching up with @Ian at the potluck!", "positive", "Ian", 2, 3),
+    ("Ethan", "Experimenting with sous vide cooking. Game changer!", "positive", None, 7, 7),
+    ("Ethan", "Why do software updates always happen at the worst times?", "negative", None, 10, 6),
+    ("Ethan", "Looking forward to the tech conference next month.", "positive", None, 9, 18),
+    ("Ethan", "Discovered some amazing street art on my walk today.", "positive", "Fiona", 6, 13),
+    ("Ethan", "Feeling a bit overwhelmed with work this week.", "negative", None, 4, 7),
+    ("Ethan", "Reading 'Thinking, Fast and Slow'. Mind-bending stuff.", "positive", None, 12, 15),
+    ("Ethan", "Just booked flights for a vacation! So excited.", "positive", None, 11, 10),
+    ("Fiona", "We escaped! 'The Lost Temple' was challenging but super fun.", "positive", "Julia", 1, 3),
+    ("Fiona", "Looking forward to a relaxing weekend. Maybe some hiking?", "positive", "Ethan", 0, 6),
+    ("Fiona", "Loved the picnic vibes! Thanks for organizing, @Diana!", "positive", "Diana", 4, 0),
+    ("Fiona", "Trying my hand at watercolor painting. It's harder than it looks!", "neutral", "Laura", 2, 9),
+    ("Fiona", "Great catching up with @Hannah today!", "positive", "Hannah", 3, 7),
+    ("Fiona", "Feeling inspired after browsing a local craft fair.", "positive", "Nora", 7, 10),
+    ("Fiona", "My commute felt extra long today. Ugh.", "negative", None, 5, 13),
+    ("Fiona", "Anyone have good recommendations for fantasy novels?", "neutral", "Ian", 9, 11),
+    ("Fiona", "Made some killer guacamole for game night!", "positive", "Kevin", 6, 5),
+    ("Fiona", "Thinking about the concept of 'ikigai'. Interesting.", "neutral", "Mike", 11, 14),
+    ("Fiona", "So many emails to catch up on after the long weekend.", "negative", None, 8, 15),
+    ("Fiona", "Planning a board game night soon! Who's in? @Oscar?", "positive", "Oscar", 10, 8),
+    ("Fiona", "The escape room puzzles were clever! @George, we should try another.", "positive", "George", 1, 1),
+    ("Fiona", "Enjoying the crisp autumn air on my walk.", "positive", "Alice", 12, 16),
+    ("Fiona", "Trying to be more mindful throughout the day.", "neutral", None, 13, 9),
+    ("George", "Great turnout at the potluck! Good food, good company.", "positive", "Ian", 2, 4),
+    ("Fiona", "The 'Music in the Park' festival was amazing! The main stage had great sound, and the food truck area near the fountain was bustling. @Julia, you missed out!", "positive", "Julia", 0, 20),
+    ("George", "Tried that new artisanal coffee shop. It was... okay. Overpriced?", "neutral", None, 4, 16),
+    ("George", "The escape room was a blast! @Fiona, great suggestion!", "positive", "Fiona", 1, 2),
+    ("George", "Working on some woodworking projects this weekend.", "positive", None, 3, 12),
+    ("George", "My back is killing me after yard work yesterday.", "negative", None, 0, 10),
+    ("George", "Reading a fascinating biography about Churchill.", "positive", None, 8, 7),
+    ("George", "The potluck chili seemed to be a hit! Thanks @Ethan!", "positive", "Ethan", 2, 1),
+    ("George", "Dealing with insurance paperwork is the worst.", "negative", None, 10, 11),
+    ("George", "Looking forward to the football game tonight.", "positive", None, 6, 6),
+    ("George", "Thinking about the changing landscape of the tech industry.", "neutral", None, 11, 15),
+    ("George", "Enjoyed catching up with @Hannah at the potluck.", "positive", "Hannah", 2, 2),
+    ("George", "Why is finding decent parking downtown such a nightmare?", "negative", None, 7, 9),
+    ("George", "Planning a fishing trip for next month.", "positive", None, 13, 14),
+    ("George", "Trying to cut back on screen time. It's a challenge.", "neutral", None, 5, 18),
+    ("George", "Simple pleasures: a good cup of coffee and a quiet house.", "positive", None, 1, 16),
+    ("Hannah", "The bake sale raised a good amount for the shelter! Thanks to everyone who came.", "positive", "Alice", 6, 3),
+    ("Hannah", "My upstairs neighbors sound like they're bowling up there.", "negative", None, 1, 13),
+    ("Hannah", "That indie film @Diana recommended was excellent!", "positive", "Diana", 3, 8),
+    ("Hannah", "Spent the afternoon volunteering at the community garden.", "positive", None, 2, 7),
+    ("Hannah", "Feeling grateful for good friends. @Fiona, always great chatting!", "positive", "Fiona", 4, 6),
+    ("Hannah", "Trying to learn calligraphy. My hand hurts!", "neutral", None, 8, 10),
+    ("Hannah", "This rainy weather makes me want to curl up with a book.", "neutral", None, 0, 9),
+    ("Hannah", "Disappointed that my favorite local bakery closed down.", "negative", None, 10, 7),
+    ("Hannah", "Made some progress on the quilt I'm working on.", "positive", "Julia", 7, 15),
+    ("Hannah", "Looking forward to the farmers market this weekend.", "positive", None, 5, 11),
+    ("Hannah", "Why are printer ink cartridges so expensive?", "negative", None, 12, 9),
+    ("Hannah", "Enjoyed the thoughtful discussion after the film screening.", "positive", "Kevin", 3, 4),
+    ("Hannah", "Thinking about the importance of local community initiatives.", "positive", "George", 9, 14),
+    ("Hannah", "Just finished a great yoga session. Feeling centered.", "positive", None, 1, 17),
+    ("Hannah", "Contemplating the beauty of imperfection in handmade crafts.", "neutral", None, 11, 12),
+    ("Ian", "Still processing the AI ethics discussion from the meetup.", "neutral", "Alice", 5, 5),
+    ("Ian", "Potluck food coma is real. So worth it though.", "positive", "Ethan", 2, 2),
+    ("Ian", "Great catching up with @George at the potluck!", "positive", "George", 2, 1),
+    ("Ian", "Trying to fix a bug in my code that's driving me crazy.", "negative", None, 0, 7),
+    ("Ian", "Exploring the city's bike trails this weekend.", "positive", "Bob", 3, 10),
+    ("Ian", "Anyone else obsessed with mechanical keyboards?", "positive", None, 7, 12),
+    ("Ian", "My internet provider is having an outage. Fun.", "negative", None, 9, 9),
+    ("Ian", "Listening to some classic rock while coding.", "positive", None, 1, 11),
+    ("Ian", "Thinking about the future of open-source software.", "neutral", None, 11, 13),
+    ("Ian", "Made some surprisingly good instant ramen hacks.", "positive", "Kevin", 6, 8),
+    ("Ian", "Looking forward to the new sci-fi movie coming out.", "positive", None, 10, 14),
+    ("Ian", "Why is finding parking near the office so impossible?", "negative", None, 4, 11),
+    ("Ian", "Good chat about fantasy novels, @Fiona!", "positive", "Fiona", 8, 16),
+    ("Ian", "Trying out a new Linux distribution on an old laptop.", "neutral", None, 13, 6),
+    ("Ian", "Sometimes you just need a day to do absolutely nothing.", "positive", None, 5, 15),
+    ("Julia", "That escape room was tough! Barely made it out.", "positive", "Fiona", 1, 2),
+    ("Julia", "Making progress on learning guitar! Finally nailed the F chord.", "positive", None, 0, 11),
+    ("Julia", "Enjoyed the picnic in the park. Such a lovely day.", "positive", "Bob", 4, 3),
+    ("Julia", "Working on a complex knitting pattern. Wish me luck!", "neutral", "Hannah", 2, 10),
+    ("Julia", "Feeling a bit under the weather today.", "negative", None, 5, 7),
+    ("Julia", "Reading 'Circe' by Madeline Miller. So captivating!", "positive", "Laura", 8, 14),
+    ("Julia", "Trying out a new Thai recipe tonight.", "positive", None, 3, 6),
+    ("Julia", "Why is adulting mostly just figuring out what to eat for dinner?", "negative", None, 10, 9),
+    ("Julia", "Looking forward to visiting the botanical gardens.", "positive", None, 7, 16),
+    ("Julia", "Thinking about the balance between work and personal life.", "neutral", None, 12, 11),
+    ("Julia", "Great teamwork in the escape room, @George!", "positive", "George", 1, 0),
+    ("Julia", "My computer decided to update right before a meeting. Perfect timing.", "negative", None, 6, 12),
+    ("Julia", "Planning a cozy weekend with books and tea.", "positive", "Kevin", 9, 19),
+    ("Julia", "Discovered some beautiful yarn at the local craft store.", "positive", None, 13, 8),
+    ("Julia", "Contemplating the beauty of a well-organized spreadsheet.", "neutral", None, 11, 18),
+    ("Kevin", "The film screening was intense. 'The Lighthouse Keeper' will stick with me.", "neutral", "Diana", 3, 9),
+    ("Kevin", "Trying a new vegetarian lasagna recipe tonight. Fingers crossed!", "neutral", None, 0, 5),
+    ("Kevin", "Finally beat that challenging level in Elden Ring!", "positive", None, 2, 4),
+    ("Kevin", "My ramen hack turned out pretty good! Thanks for the tip @Ian!", "positive", "Ian", 5, 14),
+    ("Kevin", "Feeling overwhelmed by job applications.", "negative", None, 1, 8),
+    ("Kevin", "Exploring some indie games on Steam.", "positive", None, 7, 17),
+    ("Kevin", "Why does my phone battery drain so quickly?", "negative", None, 9, 13),
+    ("Kevin", "Looking forward to game night! @Fiona, bring the snacks!", "positive", "Fiona", 4, 19),
+    ("Kevin", "Thinking about learning how to DJ.", "neutral", None, 11, 11),
+    ("Kevin", "Made some decent progress on my coding bootcamp assignments.", "positive", None, 6, 14),
+    ("Kevin", "The cost of concert tickets is getting ridiculous.", "negative", None, 10, 16),
+    ("Kevin", "Planning a movie marathon weekend.", "positive", "Mike", 8, 18),
+    ("Kevin", "Discovered a cool retro arcade downtown.", "positive", None, 13, 10),
+    ("Kevin", "Trying to understand blockchain technology. It's complex!", "neutral", None, 12, 14),
+    ("Kevin", "Sometimes you just need pizza.", "positive", None, 0, 1),
+    ("Laura", "Such a cozy vibe at the potluck. Nice to chat with everyone.", "positive", "Julia", 2, 3),
+    ("Laura", "Finished 'Klara and the Sun'. What a beautiful, melancholic book.", "positive", "Alice", 3, 16),
+    ("Laura", "Spent the morning gardening. Feeling peaceful.", "positive", None, 1, 14),
+    ("Laura", "My favorite tea shop has a new seasonal blend!", "positive", "Nora", 4, 9),
+    ("Laura", "Dealing with a mountain of emails after being off.", "negative", None, 7, 8),
+    ("Laura", "Reading poetry by Mary Oliver. So insightful.", "positive", None, 9, 15),
+    ("Laura", "Trying out watercolor painting. @Fiona, any tips?", "neutral", "Fiona", 5, 10),
+    ("Laura", "Why is finding comfortable *and* stylish shoes so hard?", "negative", None, 11, 7),
+    ("Laura", "Looking forward to a quiet weekend of reading.", "positive", None, 6, 18),
+    ("Laura", "Thinking about the passage of time and changing seasons.", "neutral", None, 13, 12),
+    ("Laura", "Enjoyed the conversation at the potluck, @Ethan!", "positive", "Ethan", 2, 0),
+    ("Laura", "My attempts at baking macarons were a disaster.", "negative", None, 8, 12),
+    ("Laura", "Planning a visit to the library soon.", "positive", None, 10, 18),
+    ("Laura", "Discovered a charming little antique shop.", "positive", None, 12, 13),
+    ("Laura", "Contemplating the simple beauty of a well-brewed cup of tea.", "positive", None, 0, 16),
+    ("Mike", "Thinking about taking up pottery. Seems like a relaxing hobby.", "positive", "Oscar", 3, 18),
+    ("Mike", "Weekend vibes starting now!", "positive", None, 0, 2),
+    ("Mike", "Just finished a tough workout at the gym.", "positive", None, 1, 12),
+    ("Mike", "My fantasy football team is doing terribly.", "negative", None, 4, 8),
+    ("Mike", "Trying out a new barbecue rub recipe this weekend.", "positive", None, 2, 14),
+    ("Mike", "Anyone have recommendations for good action movies?", "neutral", "Kevin", 8, 16),
+    ("Mike", "Dealing with car repairs. Always expensive.", "negative", None, 6, 9),
+    ("Mike", "Looking forward to watching the game tonight.", "positive", None, 5, 5),
+    ("Mike", "Thinking about the strategy behind successful team management.", "neutral", None, 11, 16),
+    ("Mike", "Made some killer burgers on the grill.", "positive", None, 7, 6),
+    ("Mike", "Why are meetings scheduled right before lunch?", "negative", None, 10, 13),
+    ("Mike", "Planning a camping trip for next month.", "positive", "Fiona", 9, 10),
+    ("Mike", "Discovered a great local brewery.", "positive", None, 13, 5),
+    ("Mike", "Trying to get better at time management.", "neutral", None, 12, 18),
+    ("Mike", "Sometimes a cold beer after work is just perfect.", "positive", None, 0, 4),
+    ("Nora", "Enjoying a quiet evening with a cup of tea and a good book.", "neutral", "Laura", 1, 6),
+    ("Nora", "Thinking of you @Laura! Hope you're having a good week.", "positive", "Laura", 3, 15),
+    ("Nora", "Spent the afternoon bird watching in the park.", "positive", None, 2, 11),
+    ("Nora", "My favorite podcast released a new episode!", "positive", None, 0, 8),
+    ("Nora", "Feeling frustrated with a bureaucratic process.", "negative", None, 5, 9),
+    ("Nora", "Reading about sustainable living practices.", "positive", None, 8, 13),
+    ("Nora", "Trying out a new herbal tea blend.", "neutral", None, 4, 12),
+    ("Nora", "Why is junk mail still a thing?", "negative", None, 10, 10),
+    ("Nora", "Looking forward to the craft fair next weekend. @Fiona, are you going?", "positive", "Fiona", 7, 18),
+    ("Nora", "Thinking about the importance of quiet contemplation.", "neutral", None, 12, 10),
+    ("Nora", "Enjoyed the peaceful atmosphere at the library today.", "positive", None, 6, 15),
+    ("Nora", "My allergies are acting up today.", "negative", None, 1, 15),
+    ("Nora", "Planning a visit to a national park.", "positive", "Oscar", 9, 17),
+    ("Nora", "Discovered a lovely little shop selling handmade soaps.", "positive", None, 13, 15),
+    ("Nora", "Contemplating the changing colors of the leaves.", "neutral", None, 11, 9),
+    ("Oscar", "Planning a weekend getaway to the mountains. Need some fresh air!", "positive", "Nora", 1, 19),
+    ("Oscar", "Just saw @Mike's post about pottery - maybe I should join him?", "neutral", "Mike", 3, 17),
+    ("Oscar", "Finished assembling the new bookshelf. Success!", "positive", None, 0, 10),
+    ("Oscar", "My favorite sports team lost again. Disappointing.", "negative", None, 4, 5),
+    ("Oscar", "Trying out stargazing with a new telescope.", "positive", None, 2, 1),
+    ("Oscar", "Anyone have recommendations for good historical fiction?", "neutral", "Laura", 8, 19),
+    ("Oscar", "Dealing with a leaky faucet. Plumbing is not my strong suit.", "negative", None, 6, 11),
+    ("Oscar", "Looking forward to board game night! @Fiona, what are we playing?", "positive", "Fiona", 5, 12),
+    ("Oscar", "Thinking about the impact of automation on the job market.", "neutral", None, 11, 8),
+    ("Oscar", "Made some excellent French press coffee this morning.", "positive", None, 7, 19),
+    ("Oscar", "Why are online forms always so poorly designed?", "negative", None, 10, 14),
+    ("Oscar", "Planning a hiking trip for the fall.", "positive", None, 9, 13),
+    ("Oscar", "Discovered a great podcast about unsolved mysteries.", "positive", None, 13, 4),
+    ("Oscar", "Trying to learn chess strategy. It's fascinating!", "neutral", None, 12, 17),
+    ("Oscar", "Sometimes a quiet evening at home is the best.", "positive", None, 0, 3),
+)
+
 # --- Data Generation / Insertion ---
 def generate_uuid(): return str(uuid.uuid4())
 
+def generate_uuids(n):
+    """Returns n random (version 4) UUID strings from a single os.urandom read."""
+    raw = os.urandom(16 * n)
+    return [str(uuid.UUID(bytes=raw[i:i + 16], version=4)) for i in range(0, 16 * n, 16)]
+
 def insert_relational_data(db_instance):
     """Generates and inserts the curated data into the new relational tables."""
     if not db_instance: print("Skipping data insertion - db connection unavailable."); return False
     print("\n--- Defining Fixed Curated Data for Relational Insertion ---")
 
-    people_map = {} # name -> id
     event_map = {}  # name -> id
     # post_map is not strictly needed if we don't refer back to posts by internal ref later
     locations_map = {} # (name, lat, lon) -> location_id to avoid duplicate locations
 
-    people_rows = []
     events_rows = []
-    posts_rows = []
-    friendship_rows = []
     attendance_rows = []
-    mention_rows = []
     locations_rows = [] # For Location table
     event_locations_rows = [] # For EventLocation table
 
@@ -228,34 +502,34 @@ def insert_relational_data(db_instance):
         "Mike": {"age": 36}, "Nora": {"age": 29}, "Oscar": {"age": 32}
     }
     print(f"Preparing {len(people_data)} people.")
-    for name, data in people_data.items():
-        person_id = generate_uuid()
-        people_map[name] = person_id
-        people_rows.append({
-            "person_id": person_id, "name": name, "age": data.get("age"), # Use .get for safety
-            "create_time": spanner.COMMIT_TIMESTAMP
-        })
+    people_map = dict(zip(people_data, generate_uuids(len(people_data)))) # name -> id
+    people_rows = [{
+        "person_id": person_id, "name": name, "age": people_data[name].get("age"), # Use .get for safety
+        "create_time": spanner.COMMIT_TIMESTAMP
+    } for name, person_id in people_map.items()]
 
     # 2. Prepare Events Data
     event_data = {
-        "Charity Bake Sale": {"date": (now - timedelta(days=6, hours=4)).isoformat(), "description": "Support local charities by buying delicious baked goods. All proceeds go to a good cause.", "locations": [{"name": "Community Hall - Main Room", "description": "Cakes, pies, and cookies.", "latitude": 34.052235, "longitude": -118.243683, "address": "123 Main St, Anytown"}, {"name": "Community Hall - Patio", "description": "Brownies and beverages.", "latitude": 34.052000, "longitude": -118.243500, "address": "123 Main St, Anytown (Patio)"}]},
-        "Tech Meetup: Future of AI": {"date": (now - timedelta(days=5, hours=10)).isoformat(), "description": "A deep dive into the future of Artificial Intelligence, with guest speakers from leading tech companies.", "locations": [{"name": "Innovation Hub Auditorium", "description": "Main presentations and Q&A.", "latitude": 37.774929, "longitude": -122.419418, "address": "456 Tech Ave, San Francisco"}]},
-        "Central Park Picnic": {"date": (now - timedelta(days=4, hours=6)).isoformat(), "description": "A casual picnic in the park. Bring your own food and blankets!", "locations": [{"name": "Great Lawn - North End", "description": "Look for the blue balloons.", "latitude": 40.782864, "longitude": -73.965355, "address": "Central Park, New York"}]},
-        "Indie Film Screening": {"date": (now - timedelta(days=3, hours=12)).isoformat(), "description": "Screening of 'The Lighthouse Keeper', followed by a Q&A with the director.", "locations": [{"name": "Art House Cinema", "description": "Screen 2.", "latitude": 34.090000, "longitude": -118.360000, "address": "789 Movie Ln, Los Angeles"}]},
-        "Neighborhood Potluck": {"date": (now - timedelta(days=2, hours=8)).isoformat(), "description": "Share your favorite dish with your neighbors. Fun for the whole family.", "locations": [{"name": "Greenwood Park Pavilion", "description": "Covered area near the playground.", "latitude": 47.606209, "longitude": -122.332069, "address": "101 Park Rd, Seattle"}]},
-        "Escape Room: The Lost Temple": {"date": (now - timedelta(days=1, hours=5)).isoformat(), "description": "Can you solve the puzzles and escape the Lost Temple in 60 minutes?", "locations": [{"name": "Enigma Escapes", "description": "The Lost Temple room.", "latitude": 30.267153, "longitude": -97.743057, "address": "321 Puzzle Pl, Austin"}]},
-        "Music in the Park Festival": {"date": (now - timedelta(days=0, hours=18)).isoformat(), "description": "A two-day music festival featuring local bands and artists across multiple stages.", "locations": [{"name": "Main Stage - Meadow", "description": "Headline acts.", "latitude": 34.0600, "longitude": -118.2500, "address": "City Park, Meadow Area"}, {"name": "Acoustic Tent - By The Lake", "description": "Intimate performances.", "latitude": 34.0615, "longitude": -118.2520, "address": "City Park, Lakeside"}, {"name": "Food Truck Alley - East Path", "description": "Various food vendors.", "latitude": 34.0590, "longitude": -118.2480, "address": "City Park, East Pathway"}]}
+        "Charity Bake Sale": {"date": now - timedelta(days=6, hours=4), "description": "Support local charities by buying delicious baked goods. All proceeds go to a good cause.", "locations": [{"name": "Community Hall - Main Room", "description": "Cakes, pies, and cookies.", "latitude": 34.052235, "longitude": -118.243683, "address": "123 Main St, Anytown"}, {"name": "Community Hall - Patio", "description": "Brownies and beverages.", "latitude": 34.052000, "longitude": -118.243500, "address": "123 Main St, Anytown (Patio)"}]},
+        "Tech Meetup: Future of AI": {"date": now - timedelta(days=5, hours=10), "description": "A deep dive into the future of Artificial Intelligence, with guest speakers from leading tech companies.", "locations": [{"name": "Innovation Hub Auditorium", "description": "Main presentations and Q&A.", "latitude": 37.774929, "longitude": -122.419418, "address": "456 Tech Ave, San Francisco"}]},
+        "Central Park Picnic": {"date": now - timedelta(days=4, hours=6), "description": "A casual picnic in the park. Bring your own food and blankets!", "locations": [{"name": "Great Lawn - North End", "description": "Look for the blue balloons.", "latitude": 40.782864, "longitude": -73.965355, "address": "Central Park, New York"}]},
+        "Indie Film Screening": {"date": now - timedelta(days=3, hours=12), "description": "Screening of 'The Lighthouse Keeper', followed by a Q&A with the director.", "locations": [{"name": "Art House Cinema", "description": "Screen 2.", "latitude": 34.090000, "longitude": -118.360000, "address": "789 Movie Ln, Los Angeles"}]},
+        "Neighborhood Potluck": {"date": now - timedelta(days=2, hours=8), "description": "Share your favorite dish with your neighbors. Fun for the whole family.", "locations": [{"name": "Greenwood Park Pavilion", "description": "Covered area near the playground.", "latitude": 47.606209, "longitude": -122.332069, "address": "101 Park Rd, Seattle"}]},
+        "Escape Room: The Lost Temple": {"date": now - timedelta(days=1, hours=5), "description": "Can you solve the puzzles and escape the Lost Temple in 60 minutes?", "locations": [{"name": "Enigma Escapes", "description": "The Lost Temple room.", "latitude": 30.267153, "longitude": -97.743057, "address": "321 Puzzle Pl, Austin"}]},
+        "Music in the Park Festival": {"date": now - timedelta(days=0, hours=18), "description": "A two-day music festival featuring local bands and artists across multiple stages.", "locations": [{"name": "Main Stage - Meadow", "description": "Headline acts.", "latitude": 34.0600, "longitude": -118.2500, "address": "City Park, Meadow Area"}, {"name": "Acoustic Tent - By The Lake", "description": "Intimate performances.", "latitude": 34.0615, "longitude": -118.2520, "address": "City Park, Lakeside"}, {"name": "Food Truck Alley - East Path", "description": "Various food vendors.", "latitude": 34.0590, "longitude": -118.2480, "address": "City Park, East Pathway"}]}
     }
     print(f"Preparing {len(event_data)} events.")
     for name, data in event_data.items():
         event_id = generate_uuid()
         event_map[name] = event_id
         try:
-             ts_str = data.get("date")
-             if not ts_str:
+             ts = data.get("date")
+             if not ts:
                  print(f"Warning: Missing date for event '{name}', skipping.")
                  continue
-             ts = dateutil_parser.isoparse(ts_str)
+             # Dates are already datetimes; ISO strings are still accepted.
+             if isinstance(ts, str):
+                 ts = datetime.fromisoformat(ts)
              # Ensure it's timezone-aware (Spanner prefers UTC)
              if ts.tzinfo is None or ts.tzinfo.utcoffset(ts) is None:
                  ts = ts.replace(tzinfo=timezone.utc) # Assume naive dates are UTC
@@ -296,22 +570,22 @@ def insert_relational_data(db_instance):
 
     # 3. Prepare Friendships Data
     friendship_data = [("Alice", "Bob"), ("Alice", "Charlie"), ("Alice", "Hannah"), ("Alice", "Fiona"), ("Bob", "Diana"), ("Bob", "Ian"), ("Charlie", "Diana"), ("Charlie", "Ethan"), ("Diana", "Fiona"), ("Ethan", "Fiona"), ("Ethan", "George"), ("Ethan", "Ian"), ("Fiona", "Hannah"), ("Fiona", "Julia"), ("Fiona", "Ian"), ("Fiona", "Kevin"), ("Fiona", "Laura"), ("Fiona", "Mike"), ("Fiona", "Nora"), ("Fiona", "Oscar"), ("George", "Hannah"), ("George", "Ian"), ("Hannah", "Julia"), ("Ian", "Kevin"), ("Julia", "Kevin"), ("Julia", "Laura"), ("Kevin", "Mike"), ("Laura", "Nora"), ("Mike", "Oscar"), ("Nora", "Oscar")] # Removed one ("Oscar", "Nora") from original list which was a duplicate pair after sorting
-    unique_friendship_pairs = set()
     print(f"Preparing friendships from {len(friendship_data)} potential pairs.")
     for p1_name, p2_name in friendship_data:
-        if p1_name in people_map and p2_name in people_map:
-             id1, id2 = people_map[p1_name], people_map[p2_name]
-             if id1 == id2: continue # Skip self-friendship
-             # Ensure person_id_a is lexicographically smaller than person_id_b for consistent PK
-             person_id_a, person_id_b = tuple(sorted((id1, id2)))
-             if (person_id_a, person_id_b) not in unique_friendship_pairs:
-                 friendship_rows.append({
-                    "person_id_a": person_id_a, "person_id_b": person_id_b,
-                    "friendship_time": spanner.COMMIT_TIMESTAMP
-                 })
-                 unique_friendship_pairs.add((person_id_a, person_id_b))
-        else:
+        if p1_name not in people_map or p2_name not in people_map:
             print(f"Warning: Skipping friendship due to missing person ('{p1_name}' or '{p2_name}').")
+    # Ensure person_id_a is lexicographically smaller than person_id_b for consistent PK;
+    # the set drops duplicate pairs and self-friendships are skipped.
+    unique_friendship_pairs = {
+        (id1, id2) if id1 < id2 else (id2, id1)
+        for p1_name, p2_name in friendship_data
+        if p1_name != p2_name and p1_name in people_map and p2_name in people_map
+        for id1, id2 in ((people_map[p1_name], people_map[p2_name]),)
+    }
+    friendship_rows = [{
+        "person_id_a": person_id_a, "person_id_b": person_id_b,
+        "friendship_time": spanner.COMMIT_TIMESTAMP
+    } for person_id_a, person_id_b in unique_friendship_pairs]
     print(f"Prepared {len(friendship_rows)} unique friendship rows.")
 
 
@@ -328,290 +602,31 @@ def insert_relational_data(db_instance):
             print(f"Warning: Skipping attendance record due to missing person ('{person_name}') or event ('{event_name}').")
 
     # 5. Prepare Posts and Mentions Data
-    # --- PASTE FULL posts_data list here ---
-    posts_data = [
-        {"person": "Alice", "text": "Great discussion at the AI meetup! Learned so much.", "sentiment": "positive", "mention": "Ethan", "days_ago": 5, "hours_ago": 8},
-        {"person": "Alice", "text": "Feeling the pressure for this project deadline. Need more coffee.", "sentiment": "negative", "mention": None, "days_ago": 1, "hours_ago": 2},
-        {"person": "Alice", "text": "The bake sale was fun! Happy to support a good cause.", "sentiment": "positive", "mention": "Hannah", "days_ago": 6, "hours_ago": 2},
-        {"person": "Alice", "text": "Trying out a new vegetarian chili recipe tonight.", "sentiment": "neutral", "mention": None, "days_ago": 0, "hours_ago": 3},
-        {"person": "Alice", "text": "Weekend coding session in progress. Making headway!", "sentiment": "positive", "mention": None, "days_ago": 2, "hours_ago": 10},
-        {"person": "Alice", "text": "Anyone read any good non-fiction lately? Looking for recommendations.", "sentiment": "neutral", "mention": "Bob", "days_ago": 8, "hours_ago": 5},
-        {"person": "Alice", "text": "Reflecting on the AI ethics panel from the meetup. Important stuff.", "sentiment": "neutral", "mention": None, "days_ago": 4, "hours_ago": 15},
-        {"person": "Alice", "text": "My basil plant is thriving! Small victories.", "sentiment": "positive", "mention": None, "days_ago": 3, "hours_ago": 9},
-        {"person": "Alice", "text": "Ugh, debugging this legacy code is painful.", "sentiment": "negative", "mention": None, "days_ago": 7, "hours_ago": 6},
-        {"person": "Alice", "text": "Planning a weekend hike if the weather holds up.", "sentiment": "positive", "mention": "Charlie", "days_ago": 1, "hours_ago": 18},
-        {"person": "Alice", "text": "Discovered a great new podcast about behavioral economics.", "sentiment": "positive", "mention": None, "days_ago": 10, "hours_ago": 11},
-        {"person": "Alice", "text": "Just finished 'Klara and the Sun'. Beautifully written.", "sentiment": "positive", "mention": "Fiona", "days_ago": 9, "hours_ago": 14},
-        {"person": "Alice", "text": "Why is finding a good plumber so difficult?", "sentiment": "negative", "mention": None, "days_ago": 12, "hours_ago": 7},
-        {"person": "Alice", "text": "Contemplating a career shift... maybe something more creative?", "sentiment": "neutral", "mention": None, "days_ago": 11, "hours_ago": 20},
-        {"person": "Alice", "text": "Made some progress on my Spanish lessons today!", "sentiment": "positive", "mention": None, "days_ago": 0, "hours_ago": 8},
-        {"person": "Bob", "text": "Lovely picnic today! Perfect weather and company.", "sentiment": "positive", "mention": "Diana", "days_ago": 4, "hours_ago": 2},
-        {"person": "Bob", "text": "Ugh, the traffic this morning was brutal.", "sentiment": "negative", "mention": None, "days_ago": 1, "hours_ago": 14},
-        {"person": "Bob", "text": "Just finished reading 'Project Hail Mary'. Absolutely fantastic!", "sentiment": "positive", "mention": None, "days_ago": 0, "hours_ago": 5},
-        {"person": "Bob", "text": "The bake sale goodies were delicious! Thanks @Alice!", "sentiment": "positive", "mention": "Alice", "days_ago": 6, "hours_ago": 1},
-        {"person": "Bob", "text": "Trying to get back into a regular workout routine.", "sentiment": "neutral", "mention": None, "days_ago": 2, "hours_ago": 12},
-        {"person": "Bob", "text": "Anyone have tips for dealing with noisy upstairs neighbors?", "sentiment": "negative", "mention": None, "days_ago": 9, "hours_ago": 6},
-        {"person": "Bob", "text": "Exploring the new exhibit at the art museum this weekend.", "sentiment": "positive", "mention": "Ian", "days_ago": 3, "hours_ago": 19},
-        {"person": "Bob", "text": "That feeling when your code compiles on the first try!", "sentiment": "positive", "mention": None, "days_ago": 7, "hours_ago": 11},
-        {"person": "Bob", "text": "Thinking about the philosophical implications of the simulation hypothesis.", "sentiment": "neutral", "mention": None, "days_ago": 11, "hours_ago": 8},
-        {"person": "Bob", "text": "Made homemade pizza tonight. Success!", "sentiment": "positive", "mention": None, "days_ago": 0, "hours_ago": 2},
-        {"person": "Bob", "text": "Why does laundry pile up so fast?", "sentiment": "negative", "mention": None, "days_ago": 5, "hours_ago": 16},
-        {"person": "Bob", "text": "Looking forward to the long weekend.", "sentiment": "positive", "mention": None, "days_ago": 10, "hours_ago": 9},
-        {"person": "Bob", "text": "Discovered a hidden gem of a bookstore downtown.", "sentiment": "positive", "mention": None, "days_ago": 13, "hours_ago": 13},
-        {"person": "Bob", "text": "Trying to learn basic Japanese. It's harder than it looks!", "sentiment": "neutral", "mention": None, "days_ago": 8, "hours_ago": 17},
-        {"person": "Bob", "text": "Sometimes a simple walk in the park is all you need.", "sentiment": "positive", "mention": None, "days_ago": 1, "hours_ago": 7},
-        {"person": "Charlie", "text": "Mind blown by the possibilities discussed at the AI meetup.", "sentiment": "positive", "mention": "Ethan", "days_ago": 5, "hours_ago": 7},
-        {"person": "Charlie", "text": "Trying out that new Italian place downtown tonight.", "sentiment": "neutral", "mention": "Diana", "days_ago": 0, "hours_ago": 4},
-        {"person": "Charlie", "text": "Finally finished the presentation deck. Relief!", "sentiment": "positive", "mention": None, "days_ago": 2, "hours_ago": 6},
-        {"person": "Charlie", "text": "Weekend project: building a birdhouse.", "sentiment": "positive", "mention": None, "days_ago": 3, "hours_ago": 11},
-        {"person": "Charlie", "text": "Is it just me, or are streaming service interfaces getting worse?", "sentiment": "negative", "mention": None, "days_ago": 8, "hours_ago": 9},
-        {"person": "Charlie", "text": "Enjoying a quiet morning with coffee and the newspaper.", "sentiment": "positive", "mention": None, "days_ago": 1, "hours_ago": 15},
-        {"person": "Charlie", "text": "Thinking about the future of remote work.", "sentiment": "neutral", "mention": None, "days_ago": 10, "hours_ago": 12},
-        {"person": "Charlie", "text": "That AI meetup really sparked some ideas for my own work.", "sentiment": "positive", "mention": "Alice", "days_ago": 4, "hours_ago": 14},
-        {"person": "Charlie", "text": "My attempt at sourdough bread was... interesting. Need practice.", "sentiment": "neutral", "mention": None, "days_ago": 6, "hours_ago": 10},
-        {"person": "Charlie", "text": "Looking for recommendations for a good tailor.", "sentiment": "neutral", "mention": None, "days_ago": 12, "hours_ago": 8},
-        {"person": "Charlie", "text": "The fall colors are starting to show. Beautiful time of year.", "sentiment": "positive", "mention": None, "days_ago": 7, "hours_ago": 13},
-        {"person": "Charlie", "text": "Frustrated with customer service hold times today.", "sentiment": "negative", "mention": None, "days_ago": 1, "hours_ago": 5},
-        {"person": "Charlie", "text": "Planning a visit to see family next month.", "sentiment": "positive", "mention": None, "days_ago": 9, "hours_ago": 16},
-        {"person": "Charlie", "text": "Re-watching 'The Office' for the nth time. Still hilarious.", "sentiment": "positive", "mention": None, "days_ago": 13, "hours_ago": 7},
-        {"person": "Charlie", "text": "Contemplating the ethics of data privacy in modern apps.", "sentiment": "neutral", "mention": None, "days_ago": 11, "hours_ago": 19},
-        {"person": "Diana", "text": "That indie film was so moving. Highly recommend 'The Lighthouse Keeper'.", "sentiment": "positive", "mention": "Hannah", "days_ago": 3, "hours_ago": 10},
-        {"person": "Diana", "text": "Can this rain stop already? My plants are drowning.", "sentiment": "negative", "mention": None, "days_ago": 1, "hours_ago": 10},
-        {"person": "Diana", "text": "The picnic @Bob organized was lovely! So relaxing.", "sentiment": "positive", "mention": "Bob", "days_ago": 4, "hours_ago": 1},
-        {"person": "Diana", "text": "Trying to declutter my apartment. It's a slow process.", "sentiment": "neutral", "mention": None, "days_ago": 2, "hours_ago": 8},
-        {"person": "Diana", "text": "Excited to try the Italian place @Charlie mentioned!", "sentiment": "positive", "mention": "Charlie", "days_ago": 0, "hours_ago": 2},
-        {"person": "Diana", "text": "Feeling creatively inspired after visiting the gallery.", "sentiment": "positive", "mention": None, "days_ago": 7, "hours_ago": 14},
-        {"person": "Diana", "text": "My favorite coffee shop changed their beans. Not sure how I feel.", "sentiment": "negative", "mention": None, "days_ago": 9, "hours_ago": 12},
-        {"person": "Diana", "text": "Working on my pottery skills. Made a slightly lopsided bowl!", "sentiment": "positive", "mention": "Fiona", "days_ago": 6, "hours_ago": 7},
-        {"person": "Diana", "text": "Does anyone else find online meetings exhausting?", "sentiment": "negative", "mention": None, "days_ago": 11, "hours_ago": 6},
-        {"person": "Diana", "text": "Planning a weekend trip to the coast soon.", "sentiment": "positive", "mention": None, "days_ago": 10, "hours_ago": 15},
-        {"person": "Diana", "text": "Just finished a challenging puzzle. So satisfying!", "sentiment": "positive", "mention": None, "days_ago": 5, "hours_ago": 9},
-        {"person": "Diana", "text": "Thinking about volunteering at the animal shelter.", "sentiment": "positive", "mention": None, "days_ago": 13, "hours_ago": 11},
-        {"person": "Diana", "text": "Why are Mondays always so... Monday-ish?", "sentiment": "negative", "mention": None, "days_ago": 8, "hours_ago": 13},
-        {"person": "Diana", "text": "Enjoying the simple pleasure of a good cup of tea.", "sentiment": "positive", "mention": None, "days_ago": 0, "hours_ago": 6},
-        {"person": "Diana", "text": "The film screening had such a great Q&A session afterwards.", "sentiment": "positive", "mention": "Kevin", "days_ago": 3, "hours_ago": 5},
-        {"person": "Ethan", "text": "The potluck was delicious! So many amazing dishes.", "sentiment": "positive", "mention": "George", "days_ago": 2, "hours_ago": 5},
-        {"person": "Ethan", "text": "Feeling stressed about my presentation tomorrow. Wish me luck!", "sentiment": "negative", "mention": None, "days_ago": 0, "hours_ago": 12},
-        {"person": "Ethan", "text": "Anyone else find prompt engineering fascinating? #AI", "sentiment": "neutral", "mention": "Alice", "days_ago": 4, "hours_ago": 10},
-        {"person": "Ethan", "text": "Great points at the AI meetup, @Charlie!", "sentiment": "positive", "mention": "Charlie", "days_ago": 5, "hours_ago": 6},
-        {"person": "Ethan", "text": "Weekend hike was invigorating! Much needed nature time.", "sentiment": "positive", "mention": None, "days_ago": 3, "hours_ago": 14},
-        {"person": "Ethan", "text": "My internet connection has been so unstable lately.", "sentiment": "negative", "mention": None, "days_ago": 1, "hours_ago": 9},
-        {"person": "Ethan", "text": "Trying to learn Python for data analysis. Steep learning curve!", "sentiment": "neutral", "mention": None, "days_ago": 8, "hours_ago": 11},
-        {"person": "Ethan", "text": "Nice catching up with @Ian at the potluck!", "sentiment": "positive", "mention": "Ian", "days_ago": 2, "hours_ago": 3},
-        {"person": "Ethan", "text": "Experimenting with sous vide cooking. Game changer!", "sentiment": "positive", "mention": None, "days_ago": 7, "hours_ago": 7},
-        {"person": "Ethan", "text": "Why do software updates always happen at the worst times?", "sentiment": "negative", "mention": None, "days_ago": 10, "hours_ago": 6},
-        {"person": "Ethan", "text": "Looking forward to the tech conference next month.", "sentiment": "positive", "mention": None, "days_ago": 9, "hours_ago": 18},
-        {"person": "Ethan", "text": "Discovered some amazing street art on my walk today.", "sentiment": "positive", "mention": "Fiona", "days_ago": 6, "hours_ago": 13},
-        {"person": "Ethan", "text": "Feeling a bit overwhelmed with work this week.", "sentiment": "negative", "mention": None, "days_ago": 4, "hours_ago": 7},
-        {"person": "Ethan", "text": "Reading 'Thinking, Fast and Slow'. Mind-bending stuff.", "sentiment": "positive", "mention": None, "days_ago": 12, "hours_ago": 15},
-        {"person": "Ethan", "text": "Just booked flights for a vacation! So excited.", "sentiment": "positive", "mention": None, "days_ago": 11, "hours_ago": 10},
-        {"person": "Fiona", "text": "We escaped! 'The Lost Temple' was challenging but super fun.", "sentiment": "positive", "mention": "Julia", "days_ago": 1, "hours_ago": 3},
-        {"person": "Fiona", "text": "Looking forward to a relaxing weekend. Maybe some hiking?", "sentiment": "positive", "mention": "Ethan", "days_ago": 0, "hours_ago": 6},
-        {"person": "Fiona", "text": "Loved the picnic vibes! Thanks for organizing, @Diana!", "sentiment": "positive", "mention": "Diana", "days_ago": 4, "hours_ago": 0},
-        {"person": "Fiona", "text": "Trying my hand at watercolor painting. It's harder than it looks!", "sentiment": "neutral", "mention": "Laura", "days_ago": 2, "hours_ago": 9},
-        {"person": "Fiona", "text": "Great catching up with @Hannah today!", "sentiment": "positive", "mention": "Hannah", "days_ago": 3, "hours_ago": 7},
-        {"person": "Fiona", "text": "Feeling inspired after browsing a local craft fair.", "sentiment": "positive", "mention": "Nora", "days_ago": 7, "hours_ago": 10},
-        {"person": "Fiona", "text": "My commute felt extra long today. Ugh.", "sentiment": "negative", "mention": None, "days_ago": 5, "hours_ago": 13},
-        {"person": "Fiona", "text": "Anyone have good recommendations for fantasy novels?", "sentiment": "neutral", "mention": "Ian", "days_ago": 9, "hours_ago": 11},
-        {"person": "Fiona", "text": "Made some killer guacamole for game night!", "sentiment": "positive", "mention": "Kevin", "days_ago": 6, "hours_ago": 5},
-        {"person": "Fiona", "text": "Thinking about the concept of 'ikigai'. Interesting.", "sentiment": "neutral", "mention": "Mike", "days_ago": 11, "hours_ago": 14},
-        {"person": "Fiona", "text": "So many emails to catch up on after the long weekend.", "sentiment": "negative", "mention": None, "days_ago": 8, "hours_ago": 15},
-        {"person": "Fiona", "text": "Planning a board game night soon! Who's in? @Oscar?", "sentiment": "positive", "mention": "Oscar", "days_ago": 10, "hours_ago": 8},
-        {"person": "Fiona", "text": "The escape room puzzles were clever! @George, we should try another.", "sentiment": "positive", "mention": "George", "days_ago": 1, "hours_ago": 1},
-        {"person": "Fiona", "text": "Enjoying the crisp autumn air on my walk.", "sentiment": "positive", "mention": "Alice", "days_ago": 12, "hours_ago": 16},
-        {"person": "Fiona", "text": "Trying to be more mindful throughout the day.", "sentiment": "neutral", "mention": None, "days_ago": 13, "hours_ago": 9},
-        {"person": "George", "text": "Great turnout at the potluck! Good food, good company.", "sentiment": "positive", "mention": "Ian", "days_ago": 2, "hours_ago": 4},
-        {
-            "person": "Fiona",
-            "text": "The 'Music in the Park' festival was amazing! The main stage had great sound, and the food truck area near the fountain was bustling. @Julia, you missed out!",
-            "sentiment": "positive",
-            "mention": "Julia",
-            "days_ago": 0, "hours_ago": 20
-        },
-        {"person": "George", "text": "Tried that new artisanal coffee shop. It was... okay. Overpriced?", "sentiment": "neutral", "mention": None, "days_ago": 4, "hours_ago": 16},
-        {"person": "George", "text": "The escape room was a blast! @Fiona, great suggestion!", "sentiment": "positive", "mention": "Fiona", "days_ago": 1, "hours_ago": 2},
-        {"person": "George", "text": "Working on some woodworking projects this weekend.", "sentiment": "positive", "mention": None, "days_ago": 3, "hours_ago": 12},
-        {"person": "George", "text": "My back is killing me after yard work yesterday.", "sentiment": "negative", "mention": None, "days_ago": 0, "hours_ago": 10},
-        {"person": "George", "text": "Reading a fascinating biography about Churchill.", "sentiment": "positive", "mention": None, "days_ago": 8, "hours_ago": 7},
-        {"person": "George", "text": "The potluck chili seemed to be a hit! Thanks @Ethan!", "sentiment": "positive", "mention": "Ethan", "days_ago": 2, "hours_ago": 1},
-        {"person": "George", "text": "Dealing with insurance paperwork is the worst.", "sentiment": "negative", "mention": None, "days_ago": 10, "hours_ago": 11},
-        {"person": "George", "text": "Looking forward to the football game tonight.", "sentiment": "positive", "mention": None, "days_ago": 6, "hours_ago": 6},
-        {"person": "George", "text": "Thinking about the changing landscape of the tech industry.", "sentiment": "neutral", "mention": None, "days_ago": 11, "hours_ago": 15},
-        {"person": "George", "text": "Enjoyed catching up with @Hannah at the potluck.", "sentiment": "positive", "mention": "Hannah", "days_ago": 2, "hours_ago": 2},
-        {"person": "George", "text": "Why is finding decent parking downtown such a nightmare?", "sentiment": "negative", "mention": None, "days_ago": 7, "hours_ago": 9},
-        {"person": "George", "text": "Planning a fishing trip for next month.", "sentiment": "positive", "mention": None, "days_ago": 13, "hours_ago": 14},
-        {"person": "George", "text": "Trying to cut back on screen time. It's a challenge.", "sentiment": "neutral", "mention": None, "days_ago": 5, "hours_ago": 18},
-        {"person": "George", "text": "Simple pleasures: a good cup of coffee and a quiet house.", "sentiment": "positive", "mention": None, "days_ago": 1, "hours_ago": 16},
-        {"person": "Hannah", "text": "The bake sale raised a good amount for the shelter! Thanks to everyone who came.", "sentiment": "positive", "mention": "Alice", "days_ago": 6, "hours_ago": 3},
-        {"person": "Hannah", "text": "My upstairs neighbors sound like they're bowling up there.", "sentiment": "negative", "mention": None, "days_ago": 1, "hours_ago": 13},
-        {"person": "Hannah", "text": "That indie film @Diana recommended was excellent!", "sentiment": "positive", "mention": "Diana", "days_ago": 3, "hours_ago": 8},
-        {"person": "Hannah", "text": "Spent the afternoon volunteering at the community garden.", "sentiment": "positive", "mention": None, "days_ago": 2, "hours_ago": 7},
-        {"person": "Hannah", "text": "Feeling grateful for good friends. @Fiona, always great chatting!", "sentiment": "positive", "mention": "Fiona", "days_ago": 4, "hours_ago": 6},
-        {"person": "Hannah", "text": "Trying to learn calligraphy. My hand hurts!", "sentiment": "neutral", "mention": None, "days_ago": 8, "hours_ago": 10},
-        {"person": "Hannah", "text": "This rainy weather makes me want to curl up with a book.", "sentiment": "neutral", "mention": None, "days_ago": 0, "hours_ago": 9},
-        {"person": "Hannah", "text": "Disappointed that my favorite local bakery closed down.", "sentiment": "negative", "mention": None, "days_ago": 10, "hours_ago": 7},
-        {"person": "Hannah", "text": "Made some progress on the quilt I'm working on.", "sentiment": "positive", "mention": "Julia", "days_ago": 7, "hours_ago": 15},
-        {"person": "Hannah", "text": "Looking forward to the farmers market this weekend.", "sentiment": "positive", "mention": None, "days_ago": 5, "hours_ago": 11},
-        {"person": "Hannah", "text": "Why are printer ink cartridges so expensive?", "sentiment": "negative", "mention": None, "days_ago": 12, "hours_ago": 9},
-        {"person": "Hannah", "text": "Enjoyed the thoughtful discussion after the film screening.", "sentiment": "positive", "mention": "Kevin", "days_ago": 3, "hours_ago": 4},
-        {"person": "Hannah", "text": "Thinking about the importance of local community initiatives.", "sentiment": "positive", "mention": "George", "days_ago": 9, "hours_ago": 14},
-        {"person": "Hannah", "text": "Just finished a great yoga session. Feeling centered.", "sentiment": "positive", "mention": None, "days_ago": 1, "hours_ago": 17},
-        {"person": "Hannah", "text": "Contemplating the beauty of imperfection in handmade crafts.", "sentiment": "neutral", "mention": None, "days_ago": 11, "hours_ago": 12},
-        {"person": "Ian", "text": "Still processing the AI ethics discussion from the meetup.", "sentiment": "neutral", "mention": "Alice", "days_ago": 5, "hours_ago": 5},
-        {"person": "Ian", "text": "Potluck food coma is real. So worth it though.", "sentiment": "positive", "mention": "Ethan", "days_ago": 2, "hours_ago": 2},
-        {"person": "Ian", "text": "Great catching up with @George at the potluck!", "sentiment": "positive", "mention": "George", "days_ago": 2, "hours_ago": 1},
-        {"person": "Ian", "text": "Trying to fix a bug in my code that's driving me crazy.", "sentiment": "negative", "mention": None, "days_ago": 0, "hours_ago": 7},
-        {"person": "Ian", "text": "Exploring the city's bike trails this weekend.", "sentiment": "positive", "mention": "Bob", "days_ago": 3, "hours_ago": 10},
-        {"person": "Ian", "text": "Anyone else obsessed with mechanical keyboards?", "sentiment": "positive", "mention": None, "days_ago": 7, "hours_ago": 12},
-        {"person": "Ian", "text": "My internet provider is having an outage. Fun.", "sentiment": "negative", "mention": None, "days_ago": 9, "hours_ago": 9},
-        {"person": "Ian", "text": "Listening to some classic rock while coding.", "sentiment": "positive", "mention": None, "days_ago": 1, "hours_ago": 11},
-        {"person": "Ian", "text": "Thinking about the future of open-source software.", "sentiment": "neutral", "mention": None, "days_ago": 11, "hours_ago": 13},
-        {"person": "Ian", "text": "Made some surprisingly good instant ramen hacks.", "sentiment": "positive", "mention": "Kevin", "days_ago": 6, "hours_ago": 8},
-        {"person": "Ian", "text": "Looking forward to the new sci-fi movie coming out.", "sentiment": "positive", "mention": None, "days_ago": 10, "hours_ago": 14},
-        {"person": "Ian", "text": "Why is finding parking near the office so impossible?", "sentiment": "negative", "mention": None, "days_ago": 4, "hours_ago": 11},
-        {"person": "Ian", "text": "Good chat about fantasy novels, @Fiona!", "sentiment": "positive", "mention": "Fiona", "days_ago": 8, "hours_ago": 16},
-        {"person": "Ian", "text": "Trying out a new Linux distribution on an old laptop.", "sentiment": "neutral", "mention": None, "days_ago": 13, "hours_ago": 6},
-        {"person": "Ian", "text": "Sometimes you just need a day to do absolutely nothing.", "sentiment": "positive", "mention": None, "days_ago": 5, "hours_ago": 15},
-        {"person": "Julia", "text": "That escape room was tough! Barely made it out.", "sentiment": "positive", "mention": "Fiona", "days_ago": 1, "hours_ago": 2},
-        {"person": "Julia", "text": "Making progress on learning guitar! Finally nailed the F chord.", "sentiment": "positive", "mention": None, "days_ago": 0, "hours_ago": 11},
-        {"person": "Julia", "text": "Enjoyed the picnic in the park. Such a lovely day.", "sentiment": "positive", "mention": "Bob", "days_ago": 4, "hours_ago": 3},
-        {"person": "Julia", "text": "Working on a complex knitting pattern. Wish me luck!", "sentiment": "neutral", "mention": "Hannah", "days_ago": 2, "hours_ago": 10},
-        {"person": "Julia", "text": "Feeling a bit under the weather today.", "sentiment": "negative", "mention": None, "days_ago": 5, "hours_ago": 7},
-        {"person": "Julia", "text": "Reading 'Circe' by Madeline Miller. So captivating!", "sentiment": "positive", "mention": "Laura", "days_ago": 8, "hours_ago": 14},
-        {"person": "Julia", "text": "Trying out a new Thai recipe tonight.", "sentiment": "positive", "mention": None, "days_ago": 3, "hours_ago": 6},
-        {"person": "Julia", "text": "Why is adulting mostly just figuring out what to eat for dinner?", "sentiment": "negative", "mention": None, "days_ago": 10, "hours_ago": 9},
-        {"person": "Julia", "text": "Looking forward to visiting the botanical gardens.", "sentiment": "positive", "mention": None, "days_ago": 7, "hours_ago": 16},
-        {"person": "Julia", "text": "Thinking about the balance between work and personal life.", "sentiment": "neutral", "mention": None, "days_ago": 12, "hours_ago": 11},
-        {"person": "Julia", "text": "Great teamwork in the escape room, @George!", "sentiment": "positive", "mention": "George", "days_ago": 1, "hours_ago": 0},
-        {"person": "Julia", "text": "My computer decided to update right before a meeting. Perfect timing.", "sentiment": "negative", "mention": None, "days_ago": 6, "hours_ago": 12},
-        {"person": "Julia", "text": "Planning a cozy weekend with books and tea.", "sentiment": "positive", "mention": "Kevin", "days_ago": 9, "hours_ago": 19},
-        {"person": "Julia", "text": "Discovered some beautiful yarn at the local craft store.", "sentiment": "positive", "mention": None, "days_ago": 13, "hours_ago": 8},
-        {"person": "Julia", "text": "Contemplating the beauty of a well-organized spreadsheet.", "sentiment": "neutral", "mention": None, "days_ago": 11, "hours_ago": 18},
-        {"person": "Kevin", "text": "The film screening was intense. 'The Lighthouse Keeper' will stick with me.", "sentiment": "neutral", "mention": "Diana", "days_ago": 3, "hours_ago": 9},
-        {"person": "Kevin", "text": "Trying a new vegetarian lasagna recipe tonight. Fingers crossed!", "sentiment": "neutral", "mention": None, "days_ago": 0, "hours_ago": 5},
-        {"person": "Kevin", "text": "Finally beat that challenging level in Elden Ring!", "sentiment": "positive", "mention": None, "days_ago": 2, "hours_ago": 4},
-        {"person": "Kevin", "text": "My ramen hack turned out pretty good! Thanks for the tip @Ian!", "sentiment": "positive", "mention": "Ian", "days_ago": 5, "hours_ago": 14},
-        {"person": "Kevin", "text": "Feeling overwhelmed by job applications.", "sentiment": "negative", "mention": None, "days_ago": 1, "hours_ago": 8},
-        {"person": "Kevin", "text": "Exploring some indie games on Steam.", "sentiment": "positive", "mention": None, "days_ago": 7, "hours_ago": 17},
-        {"person": "Kevin", "text": "Why does my phone battery drain so quickly?", "sentiment": "negative", "mention": None, "days_ago": 9, "hours_ago": 13},
-        {"person": "Kevin", "text": "Looking forward to game night! @Fiona, bring the snacks!", "sentiment": "positive", "mention": "Fiona", "days_ago": 4, "hours_ago": 19},
-        {"person": "Kevin", "text": "Thinking about learning how to DJ.", "sentiment": "neutral", "mention": None, "days_ago": 11, "hours_ago": 11},
-        {"person": "Kevin", "text": "Made some decent progress on my coding bootcamp assignments.", "sentiment": "positive", "mention": None, "days_ago": 6, "hours_ago": 14},
-        {"person": "Kevin", "text": "The cost of concert tickets is getting ridiculous.", "sentiment": "negative", "mention": None, "days_ago": 10, "hours_ago": 16},
-        {"person": "Kevin", "text": "Planning a movie marathon weekend.", "sentiment": "positive", "mention": "Mike", "days_ago": 8, "hours_ago": 18},
-        {"person": "Kevin", "text": "Discovered a cool retro arcade downtown.", "sentiment": "positive", "mention": None, "days_ago": 13, "hours_ago": 10},
-        {"person": "Kevin", "text": "Trying to understand blockchain technology. It's complex!", "sentiment": "neutral", "mention": None, "days_ago": 12, "hours_ago": 14},
-        {"person": "Kevin", "text": "Sometimes you just need pizza.", "sentiment": "positive", "mention": None, "days_ago": 0, "hours_ago": 1},
-        {"person": "Laura", "text": "Such a cozy vibe at the potluck. Nice to chat with everyone.", "sentiment": "positive", "mention": "Julia", "days_ago": 2, "hours_ago": 3},
-        {"person": "Laura", "text": "Finished 'Klara and the Sun'. What a beautiful, melancholic book.", "sentiment": "positive", "mention": "Alice", "days_ago": 3, "hours_ago": 16},
-        {"person": "Laura", "text": "Spent the morning gardening. Feeling peaceful.", "sentiment": "positive", "mention": None, "days_ago": 1, "hours_ago": 14},
-        {"person": "Laura", "text": "My favorite tea shop has a new seasonal blend!", "sentiment": "positive", "mention": "Nora", "days_ago": 4, "hours_ago": 9},
-        {"person": "Laura", "text": "Dealing with a mountain of emails after being off.", "sentiment": "negative", "mention": None, "days_ago": 7, "hours_ago": 8},
-        {"person": "Laura", "text": "Reading poetry by Mary Oliver. So insightful.", "sentiment": "positive", "mention": None, "days_ago": 9, "hours_ago": 15},
-        {"person": "Laura", "text": "Trying out watercolor painting. @Fiona, any tips?", "sentiment": "neutral", "mention": "Fiona", "days_ago": 5, "hours_ago": 10},
-        {"person": "Laura", "text": "Why is finding comfortable *and* stylish shoes so hard?", "sentiment": "negative", "mention": None, "days_ago": 11, "hours_ago": 7},
-        {"person": "Laura", "text": "Looking forward to a quiet weekend of reading.", "sentiment": "positive", "mention": None, "days_ago": 6, "hours_ago": 18},
-        {"person": "Laura", "text": "Thinking about the passage of time and changing seasons.", "sentiment": "neutral", "mention": None, "days_ago": 13, "hours_ago": 12},
-        {"person": "Laura", "text": "Enjoyed the conversation at the potluck, @Ethan!", "sentiment": "positive", "mention": "Ethan", "days_ago": 2, "hours_ago": 0},
-        {"person": "Laura", "text": "My attempts at baking macarons were a disaster.", "sentiment": "negative", "mention": None, "days_ago": 8, "hours_ago": 12},
-        {"person": "Laura", "text": "Planning a visit to the library soon.", "sentiment": "positive", "mention": None, "days_ago": 10, "hours_ago": 18},
-        {"person": "Laura", "text": "Discovered a charming little antique shop.", "sentiment": "positive", "mention": None, "days_ago": 12, "hours_ago": 13},
-        {"person": "Laura", "text": "Contemplating the simple beauty of a well-brewed cup of tea.", "sentiment": "positive", "mention": None, "days_ago": 0, "hours_ago": 16},
-        {"person": "Mike", "text": "Thinking about taking up pottery. Seems like a relaxing hobby.", "sentiment": "positive", "mention": "Oscar", "days_ago": 3, "hours_ago": 18},
-        {"person": "Mike", "text": "Weekend vibes starting now!", "sentiment": "positive", "mention": None, "days_ago": 0, "hours_ago": 2},
-        {"person": "Mike", "text": "Just finished a tough workout at the gym.", "sentiment": "positive", "mention": None, "days_ago": 1, "hours_ago": 12},
-        {"person": "Mike", "text": "My fantasy football team is doing terribly.", "sentiment": "negative", "mention": None, "days_ago": 4, "hours_ago": 8},
-        {"person": "Mike", "text": "Trying out a new barbecue rub recipe this weekend.", "sentiment": "positive", "mention": None, "days_ago": 2, "hours_ago": 14},
-        {"person": "Mike", "text": "Anyone have recommendations for good action movies?", "sentiment": "neutral", "mention": "Kevin", "days_ago": 8, "hours_ago": 16},
-        {"person": "Mike", "text": "Dealing with car repairs. Always expensive.", "sentiment": "negative", "mention": None, "days_ago": 6, "hours_ago": 9},
-        {"person": "Mike", "text": "Looking forward to watching the game tonight.", "sentiment": "positive", "mention": None, "days_ago": 5, "hours_ago": 5},
-        {"person": "Mike", "text": "Thinking about the strategy behind successful team management.", "sentiment": "neutral", "mention": None, "days_ago": 11, "hours_ago": 16},
-        {"person": "Mike", "text": "Made some killer burgers on the grill.", "sentiment": "positive", "mention": None, "days_ago": 7, "hours_ago": 6},
-        {"person": "Mike", "text": "Why are meetings scheduled right before lunch?", "sentiment": "negative", "mention": None, "days_ago": 10, "hours_ago": 13},
-        {"person": "Mike", "text": "Planning a camping trip for next month.", "sentiment": "positive", "mention": "Fiona", "days_ago": 9, "hours_ago": 10},
-        {"person": "Mike", "text": "Discovered a great local brewery.", "sentiment": "positive", "mention": None, "days_ago": 13, "hours_ago": 5},
-        {"person": "Mike", "text": "Trying to get better at time management.", "sentiment": "neutral", "mention": None, "days_ago": 12, "hours_ago": 18},
-        {"person": "Mike", "text": "Sometimes a cold beer after work is just perfect.", "sentiment": "positive", "mention": None, "days_ago": 0, "hours_ago": 4},
-        {"person": "Nora", "text": "Enjoying a quiet evening with a cup of tea and a good book.", "sentiment": "neutral", "mention": "Laura", "days_ago": 1, "hours_ago": 6},
-        {"person": "Nora", "text": "Thinking of you @Laura! Hope you're having a good week.", "sentiment": "positive", "mention": "Laura", "days_ago": 3, "hours_ago": 15},
-        {"person": "Nora", "text": "Spent the afternoon bird watching in the park.", "sentiment": "positive", "mention": None, "days_ago": 2, "hours_ago": 11},
-        {"person": "Nora", "text": "My favorite podcast released a new episode!", "sentiment": "positive", "mention": None, "days_ago": 0, "hours_ago": 8},
-        {"person": "Nora", "text": "Feeling frustrated with a bureaucratic process.", "sentiment": "negative", "mention": None, "days_ago": 5, "hours_ago": 9},
-        {"person": "Nora", "text": "Reading about sustainable living practices.", "sentiment": "positive", "mention": None, "days_ago": 8, "hours_ago": 13},
-        {"person": "Nora", "text": "Trying out a new herbal tea blend.", "sentiment": "neutral", "mention": None, "days_ago": 4, "hours_ago": 12},
-        {"person": "Nora", "text": "Why is junk mail still a thing?", "sentiment": "negative", "mention": None, "days_ago": 10, "hours_ago": 10},
-        {"person": "Nora", "text": "Looking forward to the craft fair next weekend. @Fiona, are you going?", "sentiment": "positive", "mention": "Fiona", "days_ago": 7, "hours_ago": 18},
-        {"person": "Nora", "text": "Thinking about the importance of quiet contemplation.", "sentiment": "neutral", "mention": None, "days_ago": 12, "hours_ago": 10},
-        {"person": "Nora", "text": "Enjoyed the peaceful atmosphere at the library today.", "sentiment": "positive", "mention": None, "days_ago": 6, "hours_ago": 15},
-        {"person": "Nora", "text": "My allergies are acting up today.", "sentiment": "negative", "mention": None, "days_ago": 1, "hours_ago": 15},
-        {"person": "Nora", "text": "Planning a visit to a national park.", "sentiment": "positive", "mention": "Oscar", "days_ago": 9, "hours_ago": 17},
-        {"person": "Nora", "text": "Discovered a lovely little shop selling handmade soaps.", "sentiment": "positive", "mention": None, "days_ago": 13, "hours_ago": 15},
-        {"person": "Nora", "text": "Contemplating the changing colors of the leaves.", "sentiment": "neutral", "mention": None, "days_ago": 11, "hours_ago": 9},
-        {"person": "Oscar", "text": "Planning a weekend getaway to the mountains. Need some fresh air!", "sentiment": "positive", "mention": "Nora", "days_ago": 1, "hours_ago": 19},
-        {"person": "Oscar", "text": "Just saw @Mike's post about pottery - maybe I should join him?", "sentiment": "neutral", "mention": "Mike", "days_ago": 3, "hours_ago": 17},
-        {"person": "Oscar", "text": "Finished assembling the new bookshelf. Success!", "sentiment": "positive", "mention": None, "days_ago": 0, "hours_ago": 10},
-        {"person": "Oscar", "text": "My favorite sports team lost again. Disappointing.", "sentiment": "negative", "mention": None, "days_ago": 4, "hours_ago": 5},
-        {"person": "Oscar", "text": "Trying out stargazing with a new telescope.", "sentiment": "positive", "mention": None, "days_ago": 2, "hours_ago": 1},
-        {"person": "Oscar", "text": "Anyone have recommendations for good historical fiction?", "sentiment": "neutral", "mention": "Laura", "days_ago": 8, "hours_ago": 19},
-        {"person": "Oscar", "text": "Dealing with a leaky faucet. Plumbing is not my strong suit.", "sentiment": "negative", "mention": None, "days_ago": 6, "hours_ago": 11},
-        {"person": "Oscar", "text": "Looking forward to board game night! @Fiona, what are we playing?", "sentiment": "positive", "mention": "Fiona", "days_ago": 5, "hours_ago": 12},
-        {"person": "Oscar", "text": "Thinking about the impact of automation on the job market.", "sentiment": "neutral", "mention": None, "days_ago": 11, "hours_ago": 8},
-        {"person": "Oscar", "text": "Made some excellent French press coffee this morning.", "sentiment": "positive", "mention": None, "days_ago": 7, "hours_ago": 19},
-        {"person": "Oscar", "text": "Why are online forms always so poorly designed?", "sentiment": "negative", "mention": None, "days_ago": 10, "hours_ago": 14},
-        {"person": "Oscar", "text": "Planning a hiking trip for the fall.", "sentiment": "positive", "mention": None, "days_ago": 9, "hours_ago": 13},
-        {"person": "Oscar", "text": "Discovered a great podcast about unsolved mysteries.", "sentiment": "positive", "mention": None, "days_ago": 13, "hours_ago": 4},
-        {"person": "Oscar", "text": "Trying to learn chess strategy. It's fascinating!", "sentiment": "neutral", "mention": None, "days_ago": 12, "hours_ago": 17},
-        {"person": "Oscar", "text": "Sometimes a quiet evening at home is the best.", "sentiment": "positive", "mention": None, "days_ago": 0, "hours_ago": 3},
-    ] # <-- Make sure this contains the full list
-    #---------------------------------------------
-
-    print(f"Preparing {len(posts_data)} posts and associated mentions.")
-    post_counter = 0
-    for post_info in posts_data:
-        person_name = post_info.get("person") # Assume this is correct
-        if not person_name or person_name not in people_map:
-            print(f"Warning: Skipping post from unknown or missing person '{person_name}': {post_info.get('text', 'N/A')[:50]}...")
-            continue
-
-        post_id = generate_uuid()
-        post_counter += 1
-        author_id = people_map[person_name]
-
 
-        try:
-            days_ago = post_info.get("days_ago", 0)
-            hours_ago = post_info.get("hours_ago", 0)
-            # Ensure timestamp is timezone-aware UTC
-            post_timestamp = (now - timedelta(days=days_ago, hours=hours_ago))
-            # No need to check tzinfo here as 'now' is already UTC
-            # if post_timestamp.tzinfo is None:
-            #      post_timestamp = post_timestamp.replace(tzinfo=timezone.utc)
-            # else:
-            #      post_timestamp = post_timestamp.astimezone(timezone.utc)
-
-            posts_rows.append({
-                "post_id": post_id,
-                "author_id": author_id,
-                "text": post_info.get("text"),
-                "sentiment": post_info.get("sentiment"), # Use .get for safety
-                "post_timestamp": post_timestamp,
-                "create_time": spanner.COMMIT_TIMESTAMP
-            })
-        except (TypeError, ValueError, KeyError, OverflowError) as e:
-            print(f"Warning: Skipping post due to data/time calculation issue ({e}): {post_info.get('text', 'N/A')[:50]}...")
-            continue # Skip this post entirely if data is bad
-
-        # Process mention only if post was successfully prepared
-        mentioned_person_name = post_info.get("mention")
-        if mentioned_person_name:
-            if mentioned_person_name in people_map:
-                mention_rows.append({
-                    "post_id": post_id, # Use the generated post_id
-                    "mentioned_person_id": people_map[mentioned_person_name],
-                    "mention_time": spanner.COMMIT_TIMESTAMP # Use commit timestamp for simplicity
-                })
-            else:
-                 print(f"Warning: Skipping mention for unknown person '{mentioned_person_name}' in post by '{person_name}'.")
+    print(f"Preparing {len(POSTS_DATA)} posts and associated mentions.")
+    # Check the fixture's names against people_map once instead of per row.
+    unknown_authors = {post[0] for post in POSTS_DATA} - people_map.keys()
+    if unknown_authors:
+        print(f"Warning: Skipping posts from unknown person(s): {sorted(unknown_authors)}")
+    posts_data = [post for post in POSTS_DATA if post[0] not in unknown_authors] if unknown_authors else POSTS_DATA
+    unknown_mentions = {post[3] for post in posts_data if post[3]} - people_map.keys()
+    if unknown_mentions:
+        print(f"Warning: Skipping mentions of unknown person(s): {sorted(unknown_mentions)}")
+    # 'now' is already UTC, so every post_timestamp is timezone-aware.
+    posts = list(zip(generate_uuids(len(posts_data)), posts_data))
+    posts_rows = [{
+        "post_id": post_id,
+        "author_id": people_map[person_name],
+        "text": text,
+        "sentiment": sentiment,
+        "post_timestamp": now - timedelta(days=days_ago, hours=hours_ago),
+        "create_time": spanner.COMMIT_TIMESTAMP
+    } for post_id, (person_name, text, sentiment, _, days_ago, hours_ago) in posts]
+    mention_rows = [{
+        "post_id": post_id,
+        "mentioned_person_id": people_map[mentioned_person_name],
+        "mention_time": spanner.COMMIT_TIMESTAMP # Use commit timestamp for simplicity
+    } for post_id, (_, _, _, mentioned_person_name, _, _) in posts if mentioned_person_name in people_map]
 
     print(f"Prepared {len(posts_rows)} post rows, {len(mention_rows)} mention rows, {len(locations_rows)} location rows, and {len(event_locations_rows)} event-location link rows.")
 
@@ -621,62 +636,58 @@ def insert_relational_data(db_instance):
     print("\n--- Inserting Data into Relational Tables ---")
     inserted_counts = {}
 
-    # Define the function to be run in the transaction
-    def insert_data_txn(transaction):
-        total_rows_attempted = 0
-        # Define structure: Table Name -> (Columns List, Rows Data List of Dicts)
-        table_map = {
-            "Person": (["person_id", "name", "age", "create_time"], people_rows),
-            "Event": (["event_id", "name", "description", "event_date", "create_time"], events_rows),
-            "Location": (["location_id", "name", "description", "latitude", "longitude", "address", "create_time"], locations_rows),
-            "Post": (["post_id", "author_id", "text", "sentiment", "post_timestamp", "create_time"], posts_rows),
-            "Friendship": (["person_id_a", "person_id_b", "friendship_time"], friendship_rows),
-            "Attendance": (["person_id", "event_id", "attendance_time"], attendance_rows),
-            "Mention": (["post_id", "mentioned_person_id", "mention_time"], mention_rows),
-            "EventLocation": (["event_id", "location_id", "create_time"], event_locations_rows)
-        }
-
-        for table_name, (cols, rows_dict_list) in table_map.items():
-            if rows_dict_list:
-                print(f"Inserting {len(rows_dict_list)} rows into {table_name}...")
-                # Convert list of dicts into list of tuples matching column order
-                values_list = []
-                for row_dict in rows_dict_list:
-                    try:
-                        # Ensure all columns exist in the dict (or handle None)
-                        # and are in the correct order
-                        values_tuple = tuple(row_dict.get(c) for c in cols)
-                        values_list.append(values_tuple)
-                    except Exception as e:
-                        print(f"Error preparing row for {table_name}: {e} - Row: {row_dict}")
-                        # Decide if you want to skip this row or fail the transaction
-                        # For now, let it potentially fail the transaction later if types mismatch etc.
-
-                if values_list: # Only insert if we have valid rows prepared
-                    transaction.insert(
-                        table=table_name,
-                        columns=cols,
-                        values=values_list # Pass the list of tuples
-                    )
-                    inserted_counts[table_name] = len(values_list)
-                    total_rows_attempted += len(values_list)
-                else:
-                    inserted_counts[table_name] = 0
-            else:
-                inserted_counts[table_name] = 0
-        print(f"Transaction attempting to insert {total_rows_attempted} rows across all tables.")
-
-    # Execute the transaction
+    # Structure: Table Name -> (Columns List, Rows Data List of Dicts)
+    table_map = {
+        "Person": (["person_id", "name", "age", "create_time"], people_rows),
+        "Event": (["event_id", "name", "description", "event_date", "create_time"], events_rows),
+        "Location": (["location_id", "name", "description", "latitude", "longitude", "address", "create_time"], locations_rows),
+        "Post": (["post_id", "author_id", "text", "sentiment", "post_timestamp", "create_time"], posts_rows),
+        "Friendship": (["person_id_a", "person_id_b", "friendship_time"], friendship_rows),
+        "Attendance": (["person_id", "event_id", "attendance_time"], attendance_rows),
+        "Mention": (["post_id", "mentioned_person_id", "mention_time"], mention_rows),
+        "EventLocation": (["event_id", "location_id", "create_time"], event_locations_rows)
+    }
+    # Convert each table's dicts into column-ordered tuples once, up front, so a
+    # retried (aborted) transaction only re-sends the mutations. Everything goes
+    # in one atomic transaction unless it exceeds MAX_COMMIT_MUTATIONS; only then
+    # are rows split across commits, in table_map order so parent rows commit
+    # before the rows that reference them. A split load is NOT atomic: if a later
+    # commit fails, the earlier tables stay partially seeded.
+    insert_batches = [[]] # one list of (table, cols, values) per commit
+    room = MAX_COMMIT_MUTATIONS
+    for table_name, (cols, rows_dict_list) in table_map.items():
+        values_list = [tuple(row_dict.get(c) for c in cols) for row_dict in rows_dict_list]
+        inserted_counts[table_name] = len(values_list)
+        cost = len(cols) # mutations per row
+        start = 0
+        while start < len(values_list):
+            fit = room // cost
+            if fit == 0:
+                insert_batches.append([])
+                room = MAX_COMMIT_MUTATIONS
+                fit = max(1, room // cost)
+            chunk = values_list[start:start + fit]
+            insert_batches[-1].append((table_name, cols, chunk))
+            start += len(chunk)
+            room -= len(chunk) * cost
+    if not insert_batches[-1]: insert_batches.pop()
+    total_rows_attempted = sum(inserted_counts.values())
+
+    def insert_data_txn(transaction, batch):
+        for table_name, cols, values_list in batch:
+            print(f"Inserting {len(values_list)} rows into {table_name}...")
+            transaction.insert(table=table_name, columns=cols, values=values_list)
+
+    # Execute the transaction(s)
     try:
-        print("Executing data insertion transaction...")
+        print(f"Executing data insertion ({total_rows_attempted} rows in {len(insert_batches)} transaction(s))...")
         # Only run if there's actually data to insert
-        all_data_lists = [
-            people_rows, events_rows, locations_rows, posts_rows,
-            friendship_rows, attendance_rows, mention_rows, event_locations_rows
-        ]
-        if any(len(data_list) > 0 for data_list in all_data_lists):
-            db_instance.run_in_transaction(insert_data_txn)
-            print("Transaction committed successfully.")
+        if insert_batches:
+            if len(insert_batches) > 1:
+                print(f"Warning: data exceeds {MAX_COMMIT_MUTATIONS} mutations per commit; loading it in {len(insert_batches)} separate (non-atomic) transactions.")
+            for batch in insert_batches:
+                db_instance.run_in_transaction(insert_data_txn, batch)
+            print("Data insertion committed successfully.")
             for table, count in inserted_counts.items():
                 if count > 0: print(f"  -> Inserted {count} rows into {table}.")
             return True
@@ -705,23 +716,22 @@ if __name__ == "__main__":
         print("\nCritical Error: Spanner database connection not established. Aborting.")
         exit(1)
 
-    # --- Step 1: Create schema (No Drops) ---
-    # Added IF NOT EXISTS to CREATE INDEX statements for robustness
-    if not setup_base_schema_and_indexes(database):
-        print("\nAborting script due to errors during base schema/index creation.")
-        exit(1)
-
-    # --- Step 2: Create graph definition ---
-    # Run this in a separate DDL operation
-    if not setup_graph_definition(database):
-        print("\nAborting script due to errors during graph definition creation.")
+    # --- Step 1: Create base tables and graph definition (No Drops) ---
+    if not setup_base_schema(database):
+        print("\nAborting script due to errors during base schema creation.")
         exit(1)
 
-    # --- Step 3: Insert data into the base tables ---
+    # --- Step 2: Insert data into the base tables ---
     if not insert_relational_data(database):
         print("\nScript finished with errors during data insertion.")
         exit(1)
 
+    # --- Step 3: Create secondary indexes over the loaded data ---
+    # IF NOT EXISTS keeps reruns against an existing schema safe.
+    if not setup_indexes(database):
+        print("\nScript finished with errors during index creation.")
+        exit(1)
+
     end_time = time.time()
     print("\n-----------------------------------------")
     print("Script finished successfully!")
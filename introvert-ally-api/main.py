@@ -1,154 +1,97 @@
 # main.py
 
 import os
-import json
+import concurrent.futures
+import functools
+import string
+import orjson
 import functions_framework
-from flask import request, jsonify
-from vertexai import agent_engines
+from flask import Response, stream_with_context
 from dotenv import load_dotenv
-import pprint
+import logging
+
+from plan_json import JsonObjectScanner, strip_json_fence
 
 # Load environment variables (useful for local testing)
 load_dotenv()
 
-# --- INITIAL AGENT CONFIGURATION ---
-try:
-    ORCHESTRATE_AGENT_ID = os.environ.get('ORCHESTRATE_AGENT_ID')
-    if not ORCHESTRATE_AGENT_ID:
-        raise ValueError("The ORCHESTRATE_AGENT_ID environment variable is not set.")
-    agent_engine = agent_engines.get(ORCHESTRATE_AGENT_ID)
-except Exception as e:
-    print(f"CRITICAL ERROR initializing agent: {e}")
-    agent_engine = None
+# Per-event dumps are expensive on the streaming path; only build them when
+# LOG_LEVEL=DEBUG.
+_DEBUG = os.environ.get("LOG_LEVEL", "INFO").upper() == "DEBUG"
+logging.basicConfig(level=logging.DEBUG if _DEBUG else logging.INFO)
+logger = logging.getLogger("introvert_ally")
 
-# ===============================================================
-# AGENT-CALLING LOGIC FUNCTIONS
-# ===============================================================
+# --- INITIAL AGENT CONFIGURATION ---
+ORCHESTRATE_AGENT_ID = os.environ.get('ORCHESTRATE_AGENT_ID')
 
-def call_agent_for_plan(user_name, planned_date, location_n_perference, selected_friend_names_list):
+def _load_agent_engine():
     """
-    Builds a prompt and calls the agent to generate an event plan.
-    This is a generator function that yields progress events.
+    Connects to the orchestrate agent. The Vertex AI SDK is imported here
+    rather than at module level to keep cold starts short.
+    Returns None if the agent cannot be initialized.
     """
-    user_id = str(user_name)
-    
-    yield {"type": "thought", "data": f"--- IntrovertAlly Agent Call Initiated ---"}
-    yield {"type": "thought", "data": f"Session ID for this run: {user_id}"}
-    yield {"type": "thought", "data": f"User: {user_name}"}
-    yield {"type": "thought", "data": f"Planned Date: {planned_date}"}
-    yield {"type": "thought", "data": f"Location/Preference: {location_n_perference}"}
-    yield {"type": "thought", "data": f"Selected Friends: {', '.join(selected_friend_names_list)}"}
-    yield {"type": "thought", "data": f"Initiating plan for {user_name} on {planned_date} regarding '{location_n_perference}' with friends: {', '.join(selected_friend_names_list)}."}
+    try:
+        from vertexai import agent_engines
+        if not ORCHESTRATE_AGENT_ID:
+            raise ValueError("The ORCHESTRATE_AGENT_ID environment variable is not set.")
+        return agent_engines.get(ORCHESTRATE_AGENT_ID)
+    except Exception as e:
+        print(f"CRITICAL ERROR initializing agent: {e}")
+        return None
+
+# The SDK import and agent lookup start in the background as soon as the
+# module loads, so they overlap with the rest of the cold start and the first
+# request usually finds the agent ready instead of paying for it inline.
+_agent_loader = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="agent-engine")
+_agent_engine_future = _agent_loader.submit(_load_agent_engine)
+_agent_loader.shutdown(wait=False)
+
+def _get_agent_engine():
+    """Returns the orchestrate agent (or None), waiting for the lookup if it is still running."""
+    return _agent_engine_future.result()
 
-    selected_friend_names_str = ', '.join(selected_friend_names_list)
-    friends_list_example_for_prompt = json.dumps(selected_friend_names_list)
+# ===============================================================
+# PROMPT TEMPLATES
+# ===============================================================
 
-    prompt_message = f"""
-    Plan a personalized night out for {user_name} with friends {selected_friend_names_str} on {planned_date}, with the location or preference being "{location_n_perference}".
+_PLAN_PROMPT = string.Template("""
+    Plan a personalized night out for ${user_name} with friends ${selected_friend_names_str} on ${planned_date}, with the location or preference being "${location_n_perference}".
 
-    Analyze friend interests (if possible, use Instavibe profiles or summarized interests) to create a tailored plan. Ensure the plan includes the date {planned_date}.
+    Analyze friend interests (if possible, use Instavibe profiles or summarized interests) to create a tailored plan. Ensure the plan includes the date ${planned_date}.
 
     Output the entire plan in a SINGLE, COMPLETE JSON object with the following structure. **CRITICAL: THE FINAL RESPONSE MUST BE ONLY THIS JSON. If any fields are missing or unavailable, INVENT them appropriately to complete the JSON structure. Do not return any conversational text or explanations. Just the raw, valid JSON.**
 
-    {{
-      "friends_name_list": {friends_list_example_for_prompt},
+    {
+      "friends_name_list": ${friends_list_example_for_prompt},
       "event_name": "string",
-      "event_date": "{planned_date}",
+      "event_date": "${planned_date}",
       "event_description": "string",
       "locations_and_activities": [
-        {{
+        {
           "name": "string",
           "latitude": 12.345,
           "longitude": -67.890,
           "address": "string or null",
           "description": "string"
-        }}
+        }
       ],
       "post_to_go_out": "string"
-    }}
-    """
-
-    print(f"--- Sending Prompt to Agent ---") 
-    print(prompt_message) 
-    yield {"type": "thought", "data": f"Sending detailed planning prompt to agent for {user_name}'s event."}
-
-    accumulated_json_str = ""
-
-    yield {"type": "thought", "data": f"--- Agent Response Stream Starting ---"}
-    try:
-        for event_idx, event in enumerate(agent_engine.stream_query(user_id=user_id, message=prompt_message)):
-            print(f"\n--- Event {event_idx} Received ---")
-            pprint.pprint(event)
-            try:
-                content = event.get('content', {})
-                parts = content.get('parts', [])
-                
-                for part_idx, part in enumerate(parts):
-                    if isinstance(part, dict):
-                        text = part.get('text')
-                        if text:
-                            yield {"type": "thought", "data": f"Agent: \"{text}\""}
-                            accumulated_json_str += text
-                        else:
-                            tool_code = part.get('tool_code')
-                            if tool_code:
-                                yield {"type": "thought", "data": f"Agent is considering using a tool: {tool_code.get('name', 'Unnamed tool')}."}
-            except Exception as e_inner:
-                yield {"type": "thought", "data": f"Error processing agent event part {event_idx}: {str(e_inner)}"}
-
-    except Exception as e_outer:
-        yield {"type": "thought", "data": f"Critical error during agent stream query: {str(e_outer)}"}
-        yield {"type": "error", "data": {"message": f"Error during agent interaction: {str(e_outer)}", "raw_output": accumulated_json_str}}
-        return
-
-    yield {"type": "thought", "data": f"--- End of Agent Response Stream ---"}
-
-    if "```json" in accumulated_json_str:
-        print("Detected JSON in markdown code block. Extracting...")
-        try:
-            json_block = accumulated_json_str.split("```json", 1)[1].rsplit("```", 1)[0].strip()
-            accumulated_json_str = json_block
-            print(f"Extracted JSON block: {accumulated_json_str}") 
-        except IndexError:
-            yield {"type": "thought", "data": "Could not extract JSON from markdown block, will attempt to parse the full response."}
-
-    if accumulated_json_str:
-        try:
-            final_result_json = json.loads(accumulated_json_str)
-            yield {"type": "plan_complete", "data": final_result_json}
-        except json.JSONDecodeError as e:
-            yield {"type": "thought", "data": f"Failed to parse the agent's output as a valid plan. Error: {e}"}
-            yield {"type": "thought", "data": f"Raw output received: {accumulated_json_str}"}
-            yield {"type": "error", "data": {"message": f"JSON parsing error: {e}", "raw_output": accumulated_json_str}}
-    else:
-        yield {"type": "thought", "data": "Agent did not provide any text content in its response."}
-        yield {"type": "error", "data": {"message": "Agent returned no content.", "raw_output": ""}}
+    }
+    """)
 
-def post_plan_event(user_name, confirmed_plan, edited_invite_message, agent_session_user_id):
-    """
-    Builds a prompt and calls the agent to orchestrate posting an event.
-    This is a generator function that yields progress events.
-    """
-    yield {"type": "thought", "data": f"--- Post Plan Event Agent Call Initiated ---"}
-    yield {"type": "thought", "data": f"Agent Session ID for this run: {agent_session_user_id}"}
-    yield {"type": "thought", "data": f"User performing action: {user_name}"}
-    yield {"type": "thought", "data": f"Received Confirmed Plan (event_name): {confirmed_plan.get('event_name', 'N/A')}"}
-    yield {"type": "thought", "data": f"Received Invite Message: {edited_invite_message[:100]}..."}
-    yield {"type": "thought", "data": f"Initiating process to post event and invite for {user_name}."}
-
-    prompt_message = f"""
-    You are an Orchestrator assistant for the Instavibe platform. User '{user_name}' has finalized an event plan and wants to:
+_POST_PROMPT = string.Template("""
+    You are an Orchestrator assistant for the Instavibe platform. User '${user_name}' has finalized an event plan and wants to:
     1. Create the event on Instavibe.
     2. Create an invite post for this event on Instavibe.
     Your primary role is to understand the user's goal, identify steps, select appropriate remote agent(s), and send them clear instructions using your tools.
 
     Confirmed Plan:
     ```json
-    {json.dumps(confirmed_plan, indent=2)}
+    ${confirmed_plan_json}
     ```
 
     Invite Message (this is the exact text for the post content):
-    "{edited_invite_message}"
+    "${edited_invite_message}"
 
     Your explicit tasks are, in this exact order:
 
@@ -160,7 +103,7 @@ def post_plan_event(user_name, confirmed_plan, edited_invite_message, agent_sess
 
     TASK 2: Create the Invite Post on Instavibe.
     - Only after TASK 1 is confirmed successful, use your tool again.
-    - The `message` you send to the agent must be a clear instruction to create a post, including the author ('{user_name}'), the content ("{edited_invite_message}"), and an instruction to associate it with the new event.
+    - The `message` you send to the agent must be a clear instruction to create a post, including the author ('${user_name}'), the content ("${edited_invite_message}"), and an instruction to associate it with the new event.
     - Narrate the message you are formulating for the tool.
 
     IMPORTANT INSTRUCTIONS:
@@ -168,35 +111,191 @@ def post_plan_event(user_name, confirmed_plan, edited_invite_message, agent_sess
     - Your responses should be a stream of consciousness, narrating your actions.
     - Do NOT output any JSON yourself. Your output must be plain text only.
     - Conclude with a single, friendly success message confirming the tasks are done.
+    """)
+
+@functools.lru_cache(maxsize=256)
+def _friends_json(friend_names):
+    """
+    JSON-encodes a friends list for the plan prompt. Keyed on a tuple so
+    repeat requests for the same group reuse the encoded string.
+    """
+    return orjson.dumps(friend_names).decode()
+
+def _iter_parts(event):
+    """
+    Yields (kind, value) pairs for the text, tool_code and tool_code_output
+    entries of an agent event's content parts. Content may be a dict with
+    'parts', a bare list of parts, or missing.
+    """
+    content = event.get('content')
+    if content.__class__ is dict:
+        parts = content.get('parts') or ()
+    elif content.__class__ is list:
+        parts = content
+    else:
+        return
+    for part in parts:
+        if part.__class__ is not dict:
+            continue
+        text = part.get('text')
+        if text:
+            yield 'text', text
+            continue
+        tool_code = part.get('tool_code')
+        if tool_code:
+            yield 'tool_code', tool_code
+        tool_code_output = part.get('tool_code_output')
+        if tool_code_output:
+            yield 'tool_code_output', tool_code_output
+
+# ===============================================================
+# AGENT-CALLING LOGIC FUNCTIONS
+# ===============================================================
+
+def call_agent_for_plan(user_name, planned_date, location_n_perference, selected_friend_names_list, emit_thoughts=True):
+    """
+    Builds a prompt and calls the agent to generate an event plan.
+    This is a generator function that yields progress events. With
+    emit_thoughts=False only the terminal plan_complete/error event is yielded.
     """
+    user_id = str(user_name)
+    selected_friend_names_str = ', '.join(selected_friend_names_list)
+    
+    if emit_thoughts:
+        yield {"type": "thought", "data": f"--- IntrovertAlly Agent Call Initiated ---"}
+        yield {"type": "thought", "data": f"Initiating plan for {user_name} (session {user_id}) on {planned_date} regarding '{location_n_perference}' with friends: {selected_friend_names_str}."}
+
+    friends_list_example_for_prompt = _friends_json(tuple(selected_friend_names_list))
+
+    prompt_message = _PLAN_PROMPT.substitute(
+        user_name=user_name,
+        selected_friend_names_str=selected_friend_names_str,
+        planned_date=planned_date,
+        location_n_perference=location_n_perference,
+        friends_list_example_for_prompt=friends_list_example_for_prompt,
+    )
+
+    if _DEBUG:
+        logger.debug("Sending prompt to agent:\n%s", prompt_message)
+    if emit_thoughts:
+        yield {"type": "thought", "data": f"Sending detailed planning prompt to agent for {user_name}'s event."}
+
+    text_chunks = []
+    scanner = JsonObjectScanner()
+    final_result_json = None
+
+    if emit_thoughts:
+        yield {"type": "thought", "data": f"--- Agent Response Stream Starting ---"}
+    try:
+        for event_idx, event in enumerate(_get_agent_engine().stream_query(user_id=user_id, message=prompt_message)):
+            if _DEBUG:
+                logger.debug("Event %d received: %r", event_idx, event)
+            try:
+                for kind, value in _iter_parts(event):
+                    if kind == 'text':
+                        if emit_thoughts:
+                            yield {"type": "thought", "data": f"Agent: \"{value}\""}
+                        text_chunks.append(value)
+                        if scanner is not None:
+                            candidate = scanner.feed(value)
+                            if candidate is not None:
+                                try:
+                                    final_result_json = orjson.loads(candidate)
+                                except orjson.JSONDecodeError:
+                                    # Not the plan after all; fall back to parsing the full response.
+                                    scanner = None
+                                if final_result_json is not None:
+                                    break
+                    elif kind == 'tool_code':
+                        if emit_thoughts:
+                            yield {"type": "thought", "data": f"Agent is considering using a tool: {value.get('name', 'Unnamed tool')}."}
+            except Exception as e_inner:
+                if emit_thoughts:
+                    yield {"type": "thought", "data": f"Error processing agent event part {event_idx}: {str(e_inner)}"}
+            if final_result_json is not None:
+                # The plan object is closed; stop reading the agent stream early.
+                break
+
+    except Exception as e_outer:
+        if emit_thoughts:
+            yield {"type": "thought", "data": f"Critical error during agent stream query: {str(e_outer)}"}
+        yield {"type": "error", "data": {"message": f"Error during agent interaction: {str(e_outer)}", "raw_output": "".join(text_chunks)}}
+        return
+
+    if emit_thoughts:
+        yield {"type": "thought", "data": f"--- End of Agent Response Stream ---"}
+
+    if final_result_json is not None:
+        yield {"type": "plan_complete", "data": final_result_json}
+        return
+
+    accumulated_json_str = "".join(text_chunks)
+
+    accumulated_json_str = strip_json_fence(accumulated_json_str)
+
+    if accumulated_json_str:
+        try:
+            final_result_json = orjson.loads(accumulated_json_str)
+            yield {"type": "plan_complete", "data": final_result_json}
+        except orjson.JSONDecodeError as e:
+            if emit_thoughts:
+                yield {"type": "thought", "data": f"Failed to parse the agent's output as a valid plan. Error: {e}"}
+                yield {"type": "thought", "data": f"Raw output received: {accumulated_json_str}"}
+            yield {"type": "error", "data": {"message": f"JSON parsing error: {e}", "raw_output": accumulated_json_str}}
+    else:
+        if emit_thoughts:
+            yield {"type": "thought", "data": "Agent did not provide any text content in its response."}
+        yield {"type": "error", "data": {"message": "Agent returned no content.", "raw_output": ""}}
 
-    yield {"type": "thought", "data": f"Sending posting instructions to agent for {user_name}'s event."}
-    print(f"prompt_message: {prompt_message}")
+def post_plan_event(user_name, confirmed_plan, edited_invite_message, agent_session_user_id, emit_thoughts=True):
+    """
+    Builds a prompt and calls the agent to orchestrate posting an event.
+    This is a generator function that yields progress events. With
+    emit_thoughts=False only the terminal posting_finished/error event is yielded.
+    """
+    if emit_thoughts:
+        yield {"type": "thought", "data": f"--- Post Plan Event Agent Call Initiated ---"}
+        yield {"type": "thought", "data": f"Agent Session ID for this run: {agent_session_user_id}"}
+        yield {"type": "thought", "data": f"User performing action: {user_name}"}
+        yield {"type": "thought", "data": f"Received Confirmed Plan (event_name): {confirmed_plan.get('event_name', 'N/A')}"}
+        yield {"type": "thought", "data": f"Received Invite Message: {edited_invite_message[:100]}..."}
+        yield {"type": "thought", "data": f"Initiating process to post event and invite for {user_name}."}
+
+    prompt_message = _POST_PROMPT.substitute(
+        user_name=user_name,
+        confirmed_plan_json=orjson.dumps(confirmed_plan, option=orjson.OPT_INDENT_2).decode(),
+        edited_invite_message=edited_invite_message,
+    )
+
+    if emit_thoughts:
+        yield {"type": "thought", "data": f"Sending posting instructions to agent for {user_name}'s event."}
+    if _DEBUG:
+        logger.debug("prompt_message: %s", prompt_message)
     
-    accumulated_response_text = ""
+    response_chunks = []
 
     try:
-        for event_idx, event in enumerate(agent_engine.stream_query(user_id=agent_session_user_id, message=prompt_message)):
-            print(f"\n--- Post Event - Agent Event {event_idx} Received ---")
-            pprint.pprint(event)
+        for event_idx, event in enumerate(_get_agent_engine().stream_query(user_id=agent_session_user_id, message=prompt_message)):
+            if _DEBUG:
+                logger.debug("Post event - agent event %d received: %r", event_idx, event)
             try:
-                content = event.get('content', {})
-                parts = content.get('parts', [])
-                for part_idx, part in enumerate(parts):
-                    if isinstance(part, dict):
-                        text = part.get('text')
-                        if text:
-                            yield {"type": "thought", "data": f"Agent: \"{text}\""}
-                            accumulated_response_text += text
+                for kind, value in _iter_parts(event):
+                    if kind == 'text':
+                        if emit_thoughts:
+                            yield {"type": "thought", "data": f"Agent: \"{value}\""}
+                        response_chunks.append(value)
             except Exception as e_inner:
-                yield {"type": "thought", "data": f"Error processing agent event part {event_idx} during posting: {str(e_inner)}"}
+                if emit_thoughts:
+                    yield {"type": "thought", "data": f"Error processing agent event part {event_idx} during posting: {str(e_inner)}"}
 
     except Exception as e_outer:
-        yield {"type": "thought", "data": f"Critical error during agent stream query for posting: {str(e_outer)}"}
-        yield {"type": "error", "data": {"message": f"Error during agent interaction for posting: {str(e_outer)}", "raw_output": accumulated_response_text}}
+        if emit_thoughts:
+            yield {"type": "thought", "data": f"Critical error during agent stream query for posting: {str(e_outer)}"}
+        yield {"type": "error", "data": {"message": f"Error during agent interaction for posting: {str(e_outer)}", "raw_output": "".join(response_chunks)}}
         return
 
-    yield {"type": "thought", "data": f"--- End of Agent Response Stream for Posting ---"}
+    if emit_thoughts:
+        yield {"type": "thought", "data": f"--- End of Agent Response Stream for Posting ---"}
     yield {"type": "posting_finished", "data": {"success": True, "message": "Agent has finished processing the event and post creation."}}
 
 # ===============================================================
@@ -207,7 +306,8 @@ def post_plan_event(user_name, confirmed_plan, edited_invite_message, agent_sess
 def api_handler(req):
     """
     Main function that routes requests to the /plan or /post endpoints.
-    Returns a single JSON response at the end.
+    Returns a single JSON response at the end, or an NDJSON event stream
+    when the client sends Accept: application/x-ndjson.
     """
     # CORS configuration to allow your frontend to connect
     headers = {
@@ -219,11 +319,8 @@ def api_handler(req):
     if req.method == 'OPTIONS':
         return ('', 204, headers)
 
-    if agent_engine is None:
-        response = jsonify({"error": "The server could not initialize the AI agent."})
-        response.status_code = 500
-        response.headers.extend(headers)
-        return response
+    if _get_agent_engine() is None:
+        return _json_response({"error": "The server could not initialize the AI agent."}, status=500, headers=headers)
 
     # --- API ROUTER ---
     path = req.path
@@ -232,31 +329,72 @@ def api_handler(req):
     elif path == '/post':
         response = handle_post_request(req)
     else:
-        response = jsonify({"error": "Endpoint not found. Use /plan or /post."})
-        response.status_code = 404
+        response = _json_response({"error": "Endpoint not found. Use /plan or /post."}, status=404)
     
     response.headers.extend(headers)
     return response
 
+def _json_response(obj, status=200, headers=None):
+    """
+    Builds a JSON response encoded with orjson instead of Flask's jsonify.
+    """
+    return Response(orjson.dumps(obj), status=status, mimetype='application/json', headers=headers)
+
+def _read_json(req):
+    """
+    Parses the request body with orjson. Returns None if it is not valid JSON.
+    """
+    try:
+        return orjson.loads(req.get_data(cache=False))
+    except orjson.JSONDecodeError:
+        return None
+
+def _wants_ndjson(req):
+    """
+    Returns True when the client asked for the event stream instead of
+    the single final JSON (Accept: application/x-ndjson or ?stream).
+    """
+    return ('application/x-ndjson' in req.headers.get('Accept', '')
+            or 'stream' in req.args)
+
+def _ndjson_stream(events):
+    """
+    Encodes each progress event as one JSON line. Clients should stop
+    reading on a terminal event (plan_complete, posting_finished or error).
+    """
+    for event in events:
+        yield orjson.dumps(event) + b"\n"
+
+def _ndjson_response(events):
+    return Response(stream_with_context(_ndjson_stream(events)), mimetype='application/x-ndjson')
+
 def handle_plan_request(req):
     """
-    Handles /plan, waits for the final result, and returns a single JSON.
+    Handles /plan. Streams every event as NDJSON when requested, otherwise
+    waits for the final result and returns a single JSON.
     """
     if req.method != 'POST':
-        return jsonify({"error": "POST method is required."}), 405
+        return _json_response({"error": "POST method is required."}, status=405)
     
-    data = request.get_json()
+    data = _read_json(req)
+    if not isinstance(data, dict):
+        return _json_response({"error": "Request body must be a JSON object."}, status=400)
     user_name = data.get('user_name')
     planned_date = data.get('planned_date')
     location_n_perference = data.get('location_n_perference')
     selected_friend_names_list = data.get('selected_friend_names_list', [])
 
     if not all([user_name, planned_date, location_n_perference]):
-        return jsonify({"error": "Missing required parameters."}), 400
+        return _json_response({"error": "Missing required parameters."}, status=400)
+    if not isinstance(selected_friend_names_list, list) or not all(isinstance(name, str) for name in selected_friend_names_list):
+        return _json_response({"error": "selected_friend_names_list must be a list of strings."}, status=400)
+
+    if _wants_ndjson(req):
+        return _ndjson_response(call_agent_for_plan(user_name, planned_date, location_n_perference, selected_friend_names_list))
 
     final_result = None
     error_result = None
-    for event in call_agent_for_plan(user_name, planned_date, location_n_perference, selected_friend_names_list):
+    for event in call_agent_for_plan(user_name, planned_date, location_n_perference, selected_friend_names_list, emit_thoughts=False):
         if event.get('type') == 'plan_complete':
             final_result = event.get('data')
             break
@@ -265,31 +403,37 @@ def handle_plan_request(req):
             break
             
     if final_result:
-        return jsonify(final_result)
+        return _json_response(final_result)
     elif error_result:
-        return jsonify({"error": "The agent encountered an error", "details": error_result}), 500
+        return _json_response({"error": "The agent encountered an error", "details": error_result}, status=500)
     else:
-        return jsonify({"error": "The agent did not return a complete plan."}), 500
+        return _json_response({"error": "The agent did not return a complete plan."}, status=500)
 
 def handle_post_request(req):
     """
-    Handles /post, waits for the final result, and returns a single JSON.
+    Handles /post. Streams every event as NDJSON when requested, otherwise
+    waits for the final result and returns a single JSON.
     """
     if req.method != 'POST':
-        return jsonify({"error": "POST method is required."}), 405
+        return _json_response({"error": "POST method is required."}, status=405)
         
-    data = request.get_json()
+    data = _read_json(req)
+    if not isinstance(data, dict):
+        return _json_response({"error": "Request body must be a JSON object."}, status=400)
     user_name = data.get('user_name')
     confirmed_plan = data.get('confirmed_plan')
     edited_invite_message = data.get('edited_invite_message')
     agent_session_user_id = data.get('agent_session_user_id')
 
     if not all([user_name, confirmed_plan, edited_invite_message, agent_session_user_id]):
-        return jsonify({"error": "Missing required parameters."}), 400
+        return _json_response({"error": "Missing required parameters."}, status=400)
+
+    if _wants_ndjson(req):
+        return _ndjson_response(post_plan_event(user_name, confirmed_plan, edited_invite_message, agent_session_user_id))
 
     final_result = None
     error_result = None
-    for event in post_plan_event(user_name, confirmed_plan, edited_invite_message, agent_session_user_id):
+    for event in post_plan_event(user_name, confirmed_plan, edited_invite_message, agent_session_user_id, emit_thoughts=False):
         if event.get('type') == 'posting_finished':
             final_result = event.get('data')
             break
@@ -298,8 +442,8 @@ def handle_post_request(req):
             break
             
     if final_result:
-        return jsonify(final_result)
+        return _json_response(final_result)
     elif error_result:
-        return jsonify({"error": "The agent encountered an error while posting", "details": error_result}), 500
+        return _json_response({"error": "The agent encountered an error while posting", "details": error_result}, status=500)
     else:
-        return jsonify({"error": "The agent did not confirm the posting was finished."}), 500
\ No newline at end of file
+        return _json_response({"error": "The agent did not confirm the posting was finished."}, status=500)
\ No newline at end of file
@@ -0,0 +1 @@
+../instavibe/plan_json.py
\ No newline at end of file
@@ -1,12 +1,27 @@
-import requests
-import json
+import httpx
+import orjson
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 BASE_URL = os.environ.get("INSTAVIBE_BASE_URL")
 
-def create_post(author_name: str, text: str, sentiment: str, base_url: str = BASE_URL):
+# One pooled async client for every tool call, so consecutive posts/events reuse
+# the same keep-alive connection and the MCP server's event loop is never
+# blocked waiting on the API. Over https the client negotiates HTTP/2, so
+# concurrent calls multiplex on that one connection. Transport retries only
+# cover connection failures, where the request never reached the API.
+_client = httpx.AsyncClient(
+    headers={"Content-Type": "application/json"},
+    transport=httpx.AsyncHTTPTransport(
+        http2=True,
+        retries=2,
+        limits=httpx.Limits(max_connections=16, max_keepalive_connections=8, keepalive_expiry=30),
+    ),
+    timeout=30,
+)
+
+async def create_post(author_name: str, text: str, sentiment: str, base_url: str = BASE_URL):
     """
     Sends a POST request to the /posts endpoint to create a new post.
 
@@ -21,10 +36,9 @@ def create_post(author_name: str, text: str, sentiment: str, base_url: str = BAS
               Returns None if an error occurs.
 
     Raises:
-        requests.exceptions.RequestException: If there's an issue with the network request (e.g., connection error, timeout).
+        httpx.HTTPError: If there's an issue with the network request (e.g., connection error, timeout).
     """
     url = f"{base_url}/posts"
-    headers = {"Content-Type": "application/json"}
     payload = {
         "author_name": author_name,
         "text": text,
@@ -32,20 +46,20 @@ def create_post(author_name: str, text: str, sentiment: str, base_url: str = BAS
     }
 
     try:
-        response = requests.post(url, headers=headers, json=payload)
+        response = await _client.post(url, content=orjson.dumps(payload))
         response.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
         print(f"Successfully created post. Status Code: {response.status_code}")
-        return response.json()
-    except requests.exceptions.RequestException as e:
+        return orjson.loads(response.content)
+    except httpx.HTTPError as e:
         print(f"Error creating post: {e}")
         # Optionally re-raise the exception if the caller needs to handle it
         # raise e
         return None
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         print(f"Error decoding JSON response from {url}. Response text: {response.text}")
         return None
 
-def create_event(event_name: str, description: str, event_date: str, locations: list, attendee_names: list[str], base_url: str = BASE_URL):
+async def create_event(event_name: str, description: str, event_date: str, locations: list, attendee_names: list[str], base_url: str = BASE_URL):
     """
     Sends a POST request to the /events endpoint to create a new event registration.
 
@@ -65,10 +79,9 @@ def create_event(event_name: str, description: str, event_date: str, locations:
               Returns None if an error occurs.
 
     Raises:
-        requests.exceptions.RequestException: If there's an issue with the network request (e.g., connection error, timeout).
+        httpx.HTTPError: If there's an issue with the network request (e.g., connection error, timeout).
     """
     url = f"{base_url}/events"
-    headers = {"Content-Type": "application/json"}
     payload = {
         "event_name": event_name,
         "description": description,
@@ -78,16 +91,16 @@ def create_event(event_name: str, description: str, event_date: str, locations:
     }
 
     try:
-        response = requests.post(url, headers=headers, json=payload)
+        response = await _client.post(url, content=orjson.dumps(payload))
         response.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
         print(f"Successfully created event registration. Status Code: {response.status_code}")
-        return response.json()
-    except requests.exceptions.RequestException as e:
+        return orjson.loads(response.content)
+    except httpx.HTTPError as e:
         print(f"Error creating event registration: {e}")
         # Optionally re-raise the exception if the caller needs to handle it
         # raise e
         return None
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         print(f"Error decoding JSON response from {url}. Response text: {response.text}")
         return None
 
@@ -1,6 +1,6 @@
 # adk_mcp_server.py
 import asyncio
-import json
+import orjson
 import uvicorn
 import os
 from dotenv import load_dotenv
@@ -63,18 +63,18 @@ async def call_tool(
       )
       print(f"MCP Server: ADK tool '{name}' executed successfully.")
 
-      response_text = json.dumps(adk_response, indent=2)
+      response_text = orjson.dumps(adk_response, option=orjson.OPT_INDENT_2).decode()
       return [mcp_types.TextContent(type="text", text=response_text)]
 
     except Exception as e:
       print(f"MCP Server: Error executing ADK tool '{name}': {e}")
       # Creating a proper MCP error response might be more robust
-      error_text = json.dumps({"error": f"Failed to execute tool '{name}': {str(e)}"})
+      error_text = orjson.dumps({"error": f"Failed to execute tool '{name}': {str(e)}"}).decode()
       return [mcp_types.TextContent(type="text", text=error_text)]
   else:
       # Handle calls to unknown tools
       print(f"MCP Server: Tool '{name}' not found.")
-      error_text = json.dumps({"error": f"Tool '{name}' not implemented."})
+      error_text = orjson.dumps({"error": f"Tool '{name}' not implemented."}).decode()
       return [mcp_types.TextContent(type="text", text=error_text)]
 
 # --- MCP Remote Server ---